@@ -9,6 +9,7 @@ from google.adk.events import Event, EventActions
 from typing_extensions import override
 
 from .. import schemas
+from ..artifact_store import by_reference
 from ..llm_gateway_client import get_llm_client, LLMGatewayClient
 
 
@@ -32,21 +33,23 @@ class DocumentWorkerAgent(BaseAgent):
     async def _run_async_impl(
         self, ctx: InvocationContext
     ) -> AsyncGenerator[Event, None]:
-        payload_dict = ctx.session.state.get("worker_request", {})
-        worker_request = schemas.WorkerRequest.model_validate(payload_dict)
+        delta = await self.compute_state_delta(ctx.session.state)
+        ctx.session.state.update(delta)
+        yield Event(author=self.name, actions=EventActions(state_delta=delta))
+
+    async def compute_state_delta(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize the request in ``state``; shared by the runner and the fast path."""
+
+        payload_dict = state.get("worker_request", {})
+        worker_request = by_reference(schemas.WorkerRequest.model_validate(payload_dict))
         document_result = await self.llm_client.generate_document_summary(
-            {
-                "session_id": worker_request.session_id,
-                "preprocessed": worker_request.preprocessed,
-                "raw_input": worker_request.raw_input,
-            }
+            worker_request.model_dump(
+                include={"session_id", "preprocessed", "preprocessed_ref", "raw_input"},
+                exclude_none=True,
+            )
         )
         normalized = _normalize_document_result(document_result, worker_request.session_id)
-        ctx.session.state["document_result"] = normalized
-        yield Event(
-            author=self.name,
-            actions=EventActions(state_delta={"document_result": normalized}),
-        )
+        return {"document_result": normalized}
 
 
 def _normalize_document_result(result: Dict[str, Any], session_id: str) -> Dict[str, Any]:
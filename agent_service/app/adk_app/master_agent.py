@@ -1,7 +1,7 @@
 """ADK Master Agent implementation."""
 from __future__ import annotations
 
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
 
 from google.adk.agents import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
@@ -28,12 +28,14 @@ class MasterAgent(BaseAgent):
     async def _run_async_impl(
         self, ctx: InvocationContext
     ) -> AsyncGenerator[Event, None]:
-        request_dict = ctx.session.state.get("master_request", {})
+        delta = await self.compute_state_delta(ctx.session.state)
+        ctx.session.state.update(delta)
+        yield Event(author=self.name, actions=EventActions(state_delta=delta))
+
+    async def compute_state_delta(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Route the request in ``state``; shared by the runner and the fast path."""
+
+        request_dict = state.get("master_request", {})
         master_request = schemas.MasterRouteRequest.model_validate(request_dict)
         response = logic.build_master_response(master_request)
-        response_dict = response.model_dump()
-        ctx.session.state["master_response"] = response_dict
-        yield Event(
-            author=self.name,
-            actions=EventActions(state_delta={"master_response": response_dict}),
-        )
+        return {"master_response": response.model_dump()}
@@ -1,14 +1,35 @@
 """Utilities for executing ADK agents per HTTP request."""
 from __future__ import annotations
 
-from typing import Any, Dict
+import uuid
+from typing import TYPE_CHECKING, Any, Dict, Tuple
 
-from google.adk.agents import BaseAgent
-from google.adk.runners import InMemoryRunner
-from google.genai import types
+from ..config import get_settings
+from ..tracing import span
+
+if TYPE_CHECKING:
+    from google.adk.agents import BaseAgent
+    from google.adk.runners import InMemoryRunner
 
 DEFAULT_USER_ID = "amdlingo_user"
 
+# One long-lived runner (and in-memory session service) per agent/app pair.
+_RUNNERS: Dict[Tuple[int, str], "InMemoryRunner"] = {}
+
+
+def get_runner(agent: BaseAgent, app_name: str) -> InMemoryRunner:
+    """Return the shared runner for ``agent``, creating it on first use."""
+
+    key = (id(agent), app_name)
+    runner = _RUNNERS.get(key)
+    if runner is None:
+        # The runner stack is only needed off the fast path; import it on first use.
+        from google.adk.runners import InMemoryRunner
+
+        runner = InMemoryRunner(agent=agent, app_name=app_name)
+        _RUNNERS[key] = runner
+    return runner
+
 
 async def run_adk_agent(
     agent: BaseAgent,
@@ -17,43 +38,62 @@ async def run_adk_agent(
     app_name: str,
     state: Dict[str, Any],
     user_message: str,
+    direct: bool | None = None,
 ) -> Dict[str, Any]:
-    """Execute an ADK agent once and return the final session state."""
+    """Execute an ADK agent once and return the final session state.
+
+    Agents that expose ``compute_state_delta`` are single-step and keep no
+    session history, so by default they are called directly and the ADK
+    session round-trip is skipped. Pass ``direct=False`` to force the full
+    runner path.
+
+    On the runner path every invocation gets its own ADK session derived from
+    ``session_id``, so concurrent requests for one user session never share
+    or delete each other's state.
+    """
 
-    runner = InMemoryRunner(agent=agent, app_name=app_name)
+    if direct is None:
+        direct = get_settings().adk_fast_path
+    direct = direct and hasattr(agent, "compute_state_delta")
+    with span("adk.run", agent=agent.name, direct=direct):
+        if direct:
+            delta = await agent.compute_state_delta(state)
+            return {**state, **delta}
+        return await _run_with_runner(agent, session_id, app_name, state, user_message)
+
+
+async def _run_with_runner(
+    agent: BaseAgent, session_id: str, app_name: str, state: Dict[str, Any], user_message: str
+) -> Dict[str, Any]:
+    from google.genai import types
+
+    runner = get_runner(agent, app_name)
     session_service = runner.session_service
+    invocation_session_id = f"{session_id}:{uuid.uuid4().hex}"
 
-    # Clean up any existing session with same ID (best-effort)
+    with span("adk.session_setup"):
+        await session_service.create_session(
+            app_name=app_name,
+            user_id=DEFAULT_USER_ID,
+            session_id=invocation_session_id,
+            state=state,
+        )
     try:
+        content = types.Content(role="user", parts=[types.Part(text=user_message or "")])
+        async for _ in runner.run_async(
+            user_id=DEFAULT_USER_ID,
+            session_id=invocation_session_id,
+            new_message=content,
+        ):
+            # Drain events; state updates are persisted in the session service.
+            pass
+
+        session = await session_service.get_session(
+            app_name=app_name, user_id=DEFAULT_USER_ID, session_id=invocation_session_id
+        )
+        return session.state if session else {}
+    finally:
+        # Cleanup to keep the in-memory store small.
         await session_service.delete_session(
-            app_name=app_name, user_id=DEFAULT_USER_ID, session_id=session_id
+            app_name=app_name, user_id=DEFAULT_USER_ID, session_id=invocation_session_id
         )
-    except Exception:
-        pass
-
-    await session_service.create_session(
-        app_name=app_name,
-        user_id=DEFAULT_USER_ID,
-        session_id=session_id,
-        state=state,
-    )
-
-    content = types.Content(role="user", parts=[types.Part(text=user_message or "")])
-    async for _ in runner.run_async(
-        user_id=DEFAULT_USER_ID,
-        session_id=session_id,
-        new_message=content,
-    ):
-        # Drain events; state updates are persisted in the session service.
-        pass
-
-    session = await session_service.get_session(
-        app_name=app_name, user_id=DEFAULT_USER_ID, session_id=session_id
-    )
-    final_state = session.state if session else {}
-
-    # Cleanup to keep the in-memory store small.
-    await session_service.delete_session(
-        app_name=app_name, user_id=DEFAULT_USER_ID, session_id=session_id
-    )
-    return final_state
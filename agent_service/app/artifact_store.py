@@ -0,0 +1,213 @@
+"""Content-addressed store for preprocessed payloads.
+
+Large ``preprocessed`` dicts (fetched documents, digests, static HIPify
+output) are stored once under ``sha256:<hex>`` and passed between services
+by that reference. Only the service that actually reads the payload resolves it.
+
+There are two tiers. The in-process tier keeps parsed dicts in an LRU
+bounded by total encoded bytes. The optional disk tier (``ARTIFACT_DIR``) is
+a directory shared with other processes or containers, bounded by its own
+byte cap. Both tiers expire entries after ``ARTIFACT_TTL_SECONDS``.
+Stored payloads are treated as immutable.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+from .config import get_settings
+
+REF_PREFIX = "sha256:"
+_DISK_PRUNE_RATIO = 0.9
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class ArtifactStore:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        max_bytes: int,
+        disk_dir: str = "",
+        disk_max_bytes: int = 0,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_bytes = max_bytes
+        self._disk_dir = disk_dir
+        self._disk_max_bytes = disk_max_bytes
+        self._disk_bytes: Optional[int] = None
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def put(self, payload: Dict[str, Any]) -> str:
+        body = encode(payload)
+        ref = REF_PREFIX + hashlib.sha256(body).hexdigest()
+        self._remember(ref, payload, len(body))
+        if self._disk_dir:
+            self._write_disk(ref, body)
+        return ref
+
+    def get(self, ref: str) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(ref)
+            if entry is not None:
+                payload, size, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(ref)
+                    return payload
+                self._drop(ref)
+        body = self._read_disk(ref)
+        if body is None:
+            return None
+        payload = json.loads(body)
+        self._remember(ref, payload, len(body))
+        return payload
+
+    def get_bytes(self, ref: str) -> Optional[bytes]:
+        """Return the encoded payload, for serving it to another service."""
+
+        body = self._read_disk(ref)
+        if body is not None:
+            return body
+        payload = self.get(ref)
+        return encode(payload) if payload is not None else None
+
+    def _read_disk(self, ref: str) -> Optional[bytes]:
+        path = self._disk_path(ref)
+        if path is None:
+            return None
+        try:
+            if time.time() - os.path.getmtime(path) > self._ttl:
+                os.remove(path)
+                return None
+            with open(path, "rb") as handle:
+                return handle.read()
+        except OSError:
+            return None
+
+    def _remember(self, ref: str, payload: Dict[str, Any], size: int) -> None:
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            if ref in self._entries:
+                self._drop(ref)
+            self._entries[ref] = (payload, size, time.monotonic() + self._ttl)
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+
+    def _drop(self, ref: str) -> None:
+        _, size, _ = self._entries.pop(ref)
+        self._bytes -= size
+
+    def _disk_path(self, ref: str) -> Optional[str]:
+        if not self._disk_dir or not ref.startswith(REF_PREFIX):
+            return None
+        digest = ref[len(REF_PREFIX):]
+        if len(digest) != 64 or not all(char in "0123456789abcdef" for char in digest):
+            return None
+        return os.path.join(self._disk_dir, f"{digest}.json")
+
+    def _write_disk(self, ref: str, body: bytes) -> None:
+        path = self._disk_path(ref)
+        if path is None:
+            return
+        try:
+            if os.path.exists(path):
+                # Same content already stored; refresh its age.
+                os.utime(path)
+                return
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as handle:
+                handle.write(body)
+            os.replace(temp_path, path)
+        except OSError:
+            return
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(body)
+            over_cap = self._disk_bytes is None or self._disk_bytes > self._disk_max_bytes
+        if over_cap:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Drop expired files, then the oldest ones until under the byte cap."""
+
+        now = time.time()
+        files = []
+        total = 0
+        try:
+            names = os.listdir(self._disk_dir)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self._disk_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if now - stat.st_mtime > self._ttl:
+                _remove_quietly(path)
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if self._disk_max_bytes and total > self._disk_max_bytes:
+            target = self._disk_max_bytes * _DISK_PRUNE_RATIO
+            for _, size, path in sorted(files):
+                if total <= target:
+                    break
+                _remove_quietly(path)
+                total -= size
+        with self._lock:
+            self._disk_bytes = total
+
+
+def encode(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=1)
+def get_artifact_store() -> ArtifactStore:
+    settings = get_settings()
+    return ArtifactStore(
+        ttl_seconds=settings.artifact_ttl_seconds,
+        max_bytes=settings.artifact_max_bytes,
+        disk_dir=settings.artifact_dir,
+        disk_max_bytes=settings.artifact_disk_max_bytes,
+    )
+
+
+def by_reference(model: ModelT) -> ModelT:
+    """Swap ``model.preprocessed`` for an artifact reference when enabled."""
+
+    if not get_settings().artifact_refs or model.preprocessed_ref or not model.preprocessed:
+        return model
+    ref = get_artifact_store().put(model.preprocessed)
+    return model.model_copy(update={"preprocessed": {}, "preprocessed_ref": ref})
+
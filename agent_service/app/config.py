@@ -9,6 +9,106 @@ class Settings(BaseModel):
         description="LLM gateway base URL",
     )
     llm_gateway_timeout: float = Field(default=10.0)
+    hipify_workers: int = Field(
+        default=0,
+        description="Process pool size for batch HIPify (0 = CPU count)",
+    )
+    hipify_cache_entries: int = Field(
+        default=4096,
+        description="Per-file HIPify results kept by content hash",
+    )
+    hipify_cache_max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        description="Size cap of each HIPify result cache (encoded bytes)",
+    )
+    hipify_review_concurrency: int = Field(
+        default=4,
+        description="Concurrent LLM reviews of files with unconverted segments",
+    )
+    adk_fast_path: bool = Field(
+        default=True,
+        description="Call single-step agents directly instead of through an ADK runner",
+    )
+    artifact_refs: bool = Field(
+        default=True,
+        description="Pass preprocessed payloads between services by artifact reference",
+    )
+    artifact_ttl_seconds: float = Field(
+        default=900.0,
+        description="Lifetime of stored preprocessed artifacts",
+    )
+    artifact_max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        description="In-process artifact tier size cap (encoded bytes)",
+    )
+    artifact_dir: str = Field(
+        default="",
+        description="Shared directory for the on-disk artifact tier (empty = disabled)",
+    )
+    artifact_disk_max_bytes: int = Field(
+        default=1024 * 1024 * 1024,
+        description="On-disk artifact tier size cap",
+    )
+    speculative_top_k: int = Field(
+        default=2,
+        description="Modes run concurrently for speculative requests",
+    )
+    speculative_margin: int = Field(
+        default=15,
+        description="Routing-score distance from the best mode that still qualifies",
+    )
+    speculative_concurrency: int = Field(
+        default=8,
+        description="Process-wide budget of in-flight speculative alternatives",
+    )
+    speculative_grace_seconds: float = Field(
+        default=0.5,
+        description="How long alternatives may keep running after the primary is accepted",
+    )
+    log_digest_threshold: int = Field(
+        default=16384,
+        description="Error-mode inputs longer than this (chars) are sent as a digest",
+    )
+    log_digest_top_errors: int = Field(
+        default=10,
+        description="Distinct errors kept in a log digest",
+    )
+    log_upload_max_bytes: int = Field(
+        default=512 * 1024 * 1024,
+        description="Upper bound for a streamed log upload",
+    )
+    worker_concurrency: int = Field(
+        default=16,
+        description="Concurrent calls per worker mode",
+    )
+    worker_cache_entries: int = Field(
+        default=1024,
+        description="Worker responses cached by input hash (0 = off)",
+    )
+    worker_cache_ttl_seconds: float = Field(
+        default=300.0,
+        description="Lifetime of cached worker responses",
+    )
+    route_batch_max_items: int = Field(
+        default=1000,
+        description="Upper bound on inputs per /master/route_batch call",
+    )
+    trace_export_path: str = Field(
+        default="",
+        description="JSONL file receiving OTLP/JSON trace spans (empty = tracing off)",
+    )
+    trace_sample_rate: float = Field(
+        default=1.0,
+        description="Fraction of new traces recorded; requests with a traceparent follow it",
+    )
+    admin_token: str = Field(
+        default="",
+        description="Token for /debug profiling endpoints (empty = profiling disabled)",
+    )
+    profile_max_seconds: float = Field(
+        default=60.0,
+        description="Longest sampling window accepted by /debug/profile",
+    )
 
     class Config:
         frozen = True
@@ -22,4 +122,57 @@ def get_settings() -> Settings:
         llm_gateway_timeout=float(
             os.getenv("LLM_GATEWAY_TIMEOUT", defaults.llm_gateway_timeout)
         ),
+        hipify_workers=int(os.getenv("HIPIFY_WORKERS", defaults.hipify_workers)),
+        hipify_cache_entries=int(
+            os.getenv("HIPIFY_CACHE_ENTRIES", defaults.hipify_cache_entries)
+        ),
+        hipify_cache_max_bytes=int(
+            os.getenv("HIPIFY_CACHE_MAX_BYTES", defaults.hipify_cache_max_bytes)
+        ),
+        hipify_review_concurrency=int(
+            os.getenv("HIPIFY_REVIEW_CONCURRENCY", defaults.hipify_review_concurrency)
+        ),
+        adk_fast_path=os.getenv("ADK_FAST_PATH", "true").lower() in ("1", "true", "yes"),
+        artifact_refs=os.getenv("ARTIFACT_REFS", "true").lower() in ("1", "true", "yes"),
+        artifact_ttl_seconds=float(
+            os.getenv("ARTIFACT_TTL_SECONDS", defaults.artifact_ttl_seconds)
+        ),
+        artifact_max_bytes=int(os.getenv("ARTIFACT_MAX_BYTES", defaults.artifact_max_bytes)),
+        artifact_dir=os.getenv("ARTIFACT_DIR", defaults.artifact_dir),
+        artifact_disk_max_bytes=int(
+            os.getenv("ARTIFACT_DISK_MAX_BYTES", defaults.artifact_disk_max_bytes)
+        ),
+        speculative_top_k=int(os.getenv("SPECULATIVE_TOP_K", defaults.speculative_top_k)),
+        speculative_margin=int(os.getenv("SPECULATIVE_MARGIN", defaults.speculative_margin)),
+        speculative_concurrency=int(
+            os.getenv("SPECULATIVE_CONCURRENCY", defaults.speculative_concurrency)
+        ),
+        speculative_grace_seconds=float(
+            os.getenv("SPECULATIVE_GRACE_SECONDS", defaults.speculative_grace_seconds)
+        ),
+        log_digest_threshold=int(
+            os.getenv("LOG_DIGEST_THRESHOLD", defaults.log_digest_threshold)
+        ),
+        log_digest_top_errors=int(
+            os.getenv("LOG_DIGEST_TOP_ERRORS", defaults.log_digest_top_errors)
+        ),
+        log_upload_max_bytes=int(
+            os.getenv("LOG_UPLOAD_MAX_BYTES", defaults.log_upload_max_bytes)
+        ),
+        worker_concurrency=int(os.getenv("WORKER_CONCURRENCY", defaults.worker_concurrency)),
+        worker_cache_entries=int(
+            os.getenv("WORKER_CACHE_ENTRIES", defaults.worker_cache_entries)
+        ),
+        worker_cache_ttl_seconds=float(
+            os.getenv("WORKER_CACHE_TTL_SECONDS", defaults.worker_cache_ttl_seconds)
+        ),
+        route_batch_max_items=int(
+            os.getenv("ROUTE_BATCH_MAX_ITEMS", defaults.route_batch_max_items)
+        ),
+        trace_export_path=os.getenv("TRACE_EXPORT_PATH", defaults.trace_export_path),
+        trace_sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", defaults.trace_sample_rate)),
+        admin_token=os.getenv("ADMIN_TOKEN", defaults.admin_token),
+        profile_max_seconds=float(
+            os.getenv("PROFILE_MAX_SECONDS", defaults.profile_max_seconds)
+        ),
     )
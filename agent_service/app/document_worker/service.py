@@ -1,21 +1,34 @@
 """ADK-based Document Worker service."""
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
 from .. import schemas
-from ..adk_app.document_agent import DocumentWorkerAgent
 from ..adk_app.runner import run_adk_agent
 from ..llm_gateway_client import get_llm_client
 
-_DOCUMENT_AGENT = DocumentWorkerAgent(llm_client=get_llm_client())
-_APP_NAME = "amdlingo-document"
+if TYPE_CHECKING:
+    from ..adk_app.document_agent import DocumentWorkerAgent
+
+APP_NAME = "amdlingo-document"
+
+
+@lru_cache(maxsize=1)
+def get_document_agent() -> DocumentWorkerAgent:
+    """Build the Document Worker agent on first use; importing it loads ``google.adk``."""
+
+    from ..adk_app.document_agent import DocumentWorkerAgent
+
+    return DocumentWorkerAgent(llm_client=get_llm_client())
 
 
 async def generate_document_response(payload: schemas.WorkerRequest) -> schemas.WorkerResponse:
     state = {"worker_request": payload.model_dump()}
     final_state = await run_adk_agent(
-        _DOCUMENT_AGENT,
+        get_document_agent(),
         session_id=f"{payload.session_id}-document",
-        app_name=_APP_NAME,
+        app_name=APP_NAME,
         state=state,
         user_message=payload.raw_input,
     )
@@ -0,0 +1,4 @@
+"""Batch HIPify of source trees."""
+from .service import stream_batch
+
+__all__ = ["stream_batch"]
@@ -0,0 +1,314 @@
+"""Batch HIPify of whole source trees with a process pool and a content-hash cache."""
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import io
+import json
+import os
+import tarfile
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from .. import schemas
+from ..config import get_settings
+from ..llm_gateway_client import get_llm_client
+from ..master_agent import hipify
+
+SOURCE_EXTENSIONS = (".cu", ".cuh", ".cpp", ".cc", ".cxx", ".c", ".h", ".hpp", ".hxx", ".inl")
+MAX_ARCHIVE_BYTES = 64 * 1024 * 1024
+MAX_FILE_BYTES = 4 * 1024 * 1024
+MAX_BATCH_FILES = 5000
+MAX_TOTAL_BYTES = 128 * 1024 * 1024
+
+
+class _LRUCache:
+    """Small LRU keyed by file content hash, bounded by entries and encoded bytes."""
+
+    def __init__(self, capacity: int, max_bytes: int) -> None:
+        self._capacity = max(capacity, 0)
+        self._max_bytes = max(max_bytes, 0)
+        self._bytes = 0
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], int]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        size = len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        if not self._capacity or size > self._max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while len(self._entries) > self._capacity or self._bytes > self._max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+
+_settings = get_settings()
+_STATIC_CACHE = _LRUCache(_settings.hipify_cache_entries, _settings.hipify_cache_max_bytes)
+_REVIEW_CACHE = _LRUCache(_settings.hipify_cache_entries, _settings.hipify_cache_max_bytes)
+_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _POOL
+    if _POOL is None:
+        _POOL = ProcessPoolExecutor(max_workers=_settings.hipify_workers or os.cpu_count())
+    return _POOL
+
+
+async def stream_batch(payload: schemas.HipifyBatchRequest) -> AsyncIterator[bytes]:
+    """Validate the batch and return its NDJSON result stream.
+
+    Input errors are raised here, before the streaming response starts. The
+    archive is decoded and extracted in a worker thread.
+    """
+
+    files = await asyncio.to_thread(_collect_files, payload)
+    return _stream_results(files, payload)
+
+
+async def _stream_results(
+    files: List[Tuple[str, str]], payload: schemas.HipifyBatchRequest
+) -> AsyncIterator[bytes]:
+    """Yield one NDJSON line per file as it finishes, then an aggregate summary."""
+
+    review_slots = asyncio.Semaphore(max(_settings.hipify_review_concurrency, 1))
+    tasks = [
+        asyncio.ensure_future(_process_file(path, content, payload, review_slots))
+        for path, content in files
+    ]
+
+    aggregate: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    summary: Dict[str, Any] = {
+        "type": "summary",
+        "files": len(tasks),
+        "cached": 0,
+        "needs_review": 0,
+        "reviewed": 0,
+        "errors": 0,
+    }
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            summary["cached"] += int(result.get("cached", False))
+            summary["needs_review"] += int(result.get("needs_review", False))
+            summary["reviewed"] += int(result.get("review") is not None)
+            summary["errors"] += int("error" in result)
+            _merge_report(aggregate, result.get("mapping_report", []))
+            yield _encode(result)
+    finally:
+        # Stop outstanding work if the client disconnects mid-stream.
+        for task in tasks:
+            task.cancel()
+
+    summary["mapping_report"] = sorted(aggregate.values(), key=lambda item: -item["count"])
+    yield _encode(summary)
+
+
+async def _process_file(
+    path: str,
+    content: str,
+    payload: schemas.HipifyBatchRequest,
+    review_slots: asyncio.Semaphore,
+) -> Dict[str, Any]:
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    converted = _STATIC_CACHE.get(digest)
+    cached = converted is not None
+    if converted is None:
+        try:
+            loop = asyncio.get_running_loop()
+            converted = await loop.run_in_executor(_get_pool(), hipify.hipify_source, content)
+        except Exception as exc:
+            return {"type": "file", "path": path, "sha256": digest, "error": str(exc)}
+        _STATIC_CACHE.put(digest, converted)
+
+    result: Dict[str, Any] = {
+        "type": "file",
+        "path": path,
+        "sha256": digest,
+        "cached": cached,
+        "hipified_code": converted["hipified_code"],
+        "mapping_report": converted["mapping_report"],
+        "unconverted_segments": converted["unconverted_segments"],
+        "needs_review": bool(converted["unconverted_segments"]),
+        "review": None,
+    }
+    if not (payload.review and result["needs_review"]):
+        return result
+
+    review = _REVIEW_CACHE.get(digest)
+    if review is None:
+        async with review_slots:
+            try:
+                response = await get_llm_client().call_worker(
+                    "hipify",
+                    schemas.WorkerRequest(
+                        mode="hipify",
+                        preprocessed={
+                            "original_code": content,
+                            "hipified_code_static": converted["hipified_code"],
+                            "mapping_report": converted["mapping_report"],
+                            "unconverted_segments": converted["unconverted_segments"],
+                            "needs_review": True,
+                        },
+                        raw_input=content,
+                        session_id=payload.session_id,
+                    ).model_dump(),
+                )
+            except HTTPException as exc:
+                result["error"] = f"review failed: {exc.detail}"
+                return result
+        review = response.get("result", {})
+        _REVIEW_CACHE.put(digest, review)
+    result["review"] = {**review, "context_sync_key": payload.session_id}
+    return result
+
+
+def _collect_files(payload: schemas.HipifyBatchRequest) -> List[Tuple[str, str]]:
+    """Inline and archived source files; both count towards the batch limits."""
+
+    files = [(item.path, item.content) for item in payload.files]
+    inline_bytes = sum(len(content.encode("utf-8")) for _, content in files)
+    _check_declared(len(files), inline_bytes)
+    if payload.archive_base64:
+        try:
+            archive = base64.b64decode(payload.archive_base64, validate=True)
+        except (binascii.Error, ValueError) as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="archive_base64 is not valid base64") from exc
+        if len(archive) > MAX_ARCHIVE_BYTES:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="archive too large")
+        files.extend(_extract_archive(archive, len(files), inline_bytes))
+    if not files:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="no source files provided")
+    return files
+
+
+def _extract_archive(
+    archive: bytes, inline_files: int = 0, inline_bytes: int = 0
+) -> List[Tuple[str, str]]:
+    """Source files of a zip or tar archive, within the entry and size limits.
+
+    Limits are checked against the sizes the archive declares before anything
+    is decompressed, and again against the bytes actually read. Inline files
+    already in the batch use up part of both limits.
+    """
+
+    buffer = io.BytesIO(archive)
+    extracted: List[Tuple[str, str]] = []
+    if zipfile.is_zipfile(buffer):
+        try:
+            with zipfile.ZipFile(buffer) as bundle:
+                infos = bundle.infolist()
+                wanted = [info for info in infos if _wanted(info.filename, info.file_size, info.is_dir())]
+                _check_declared(
+                    inline_files + len(infos),
+                    inline_bytes + sum(info.file_size for info in wanted),
+                )
+                budget = MAX_TOTAL_BYTES - inline_bytes
+                for info in wanted:
+                    with bundle.open(info) as handle:
+                        data = _read_capped(handle, info.file_size, budget)
+                    budget -= len(data)
+                    extracted.append((info.filename, _decode(data)))
+        except zipfile.BadZipFile as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="corrupt zip archive") from exc
+        return extracted
+
+    buffer.seek(0)
+    try:
+        with tarfile.open(fileobj=buffer, mode="r:*") as bundle:
+            # Iterated, not getmembers(), so an oversized member table stops early.
+            entries = 0
+            members: List[tarfile.TarInfo] = []
+            for member in bundle:
+                entries += 1
+                _check_declared(inline_files + entries, 0)
+                if _wanted(member.name, member.size, not member.isfile()):
+                    members.append(member)
+            _check_declared(
+                inline_files + entries,
+                inline_bytes + sum(member.size for member in members),
+            )
+            budget = MAX_TOTAL_BYTES - inline_bytes
+            for member in members:
+                handle = bundle.extractfile(member)
+                if handle is not None:
+                    data = _read_capped(handle, member.size, budget)
+                    budget -= len(data)
+                    extracted.append((member.name, _decode(data)))
+    except tarfile.TarError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="unsupported archive format") from exc
+    return extracted
+
+
+def _check_declared(entries: int, declared_bytes: int) -> None:
+    if entries > MAX_BATCH_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"batch has more than {MAX_BATCH_FILES} files or archive entries",
+        )
+    if declared_bytes > MAX_TOTAL_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"batch source files exceed {MAX_TOTAL_BYTES} bytes",
+        )
+
+
+def _read_capped(handle: Any, declared: int, budget: int) -> bytes:
+    """Read one member, refusing more than it declared or than the total budget allows."""
+
+    data = handle.read(min(declared, budget) + 1)
+    if len(data) > declared:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="archive member larger than declared")
+    if len(data) > budget:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"batch source files exceed {MAX_TOTAL_BYTES} bytes",
+        )
+    return data
+
+
+def _wanted(name: str, size: int, is_dir: bool) -> bool:
+    return not is_dir and size <= MAX_FILE_BYTES and name.lower().endswith(SOURCE_EXTENSIONS)
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace")
+
+
+def _merge_report(
+    aggregate: Dict[Tuple[str, str], Dict[str, Any]], report: List[Dict[str, Any]]
+) -> None:
+    for entry in report:
+        key = (entry["from"], entry["to"])
+        merged = aggregate.get(key)
+        if merged is None:
+            merged = {
+                "from": entry["from"],
+                "to": entry["to"],
+                "category": entry.get("category", ""),
+                "count": 0,
+                "files": 0,
+            }
+            aggregate[key] = merged
+        merged["count"] += entry.get("count", 1)
+        merged["files"] += 1
+
+
+def _encode(item: Dict[str, Any]) -> bytes:
+    return (json.dumps(item, ensure_ascii=False) + "\n").encode("utf-8")
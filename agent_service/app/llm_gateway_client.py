@@ -1,12 +1,14 @@
 """Client for calling llm_gateway from agent service."""
 from __future__ import annotations
 
-from typing import Any
+import json
+from typing import Any, AsyncIterator
 
 import httpx
 from fastapi import HTTPException, status
 
 from .config import get_settings
+from .tracing import inject, span
 
 
 class LLMGatewayClient:
@@ -18,6 +20,43 @@ class LLMGatewayClient:
     async def call_worker(self, mode: str, payload: dict[str, Any]) -> dict[str, Any]:
         return await self._post(f"/worker/{mode}", payload)
 
+    async def stream_worker(
+        self, mode: str, payload: dict[str, Any]
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """Relay ``/worker/{mode}/stream`` as ``(event, data)`` pairs as they arrive.
+
+        An ``error`` event from the gateway is raised as ``HTTPException``.
+        """
+
+        url = f"{self._base_url}/worker/{mode}/stream"
+        try:
+            async with httpx.AsyncClient(timeout=self._timeout) as client:
+                async with client.stream(
+                    "POST", url, json=payload, headers=inject()
+                ) as response:
+                    if response.is_error:
+                        await response.aread()
+                        raise HTTPException(
+                            status_code=response.status_code, detail=response.text
+                        )
+                    event, data = "message", []
+                    async for line in response.aiter_lines():
+                        if line.startswith("event:"):
+                            event = line[6:].strip()
+                        elif line.startswith("data:"):
+                            data.append(line[5:].strip())
+                        elif not line and data:
+                            body = json.loads("\n".join(data))
+                            if event == "error":
+                                raise HTTPException(
+                                    status_code=body.get("status_code", status.HTTP_502_BAD_GATEWAY),
+                                    detail=body.get("detail"),
+                                )
+                            yield event, body
+                            event, data = "message", []
+        except httpx.RequestError as exc:
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+
     async def generate_document_summary(
         self, payload: dict[str, Any]
     ) -> dict[str, Any]:
@@ -27,7 +66,8 @@ class LLMGatewayClient:
         url = f"{self._base_url}{path}"
         try:
             async with httpx.AsyncClient(timeout=self._timeout) as client:
-                response = await client.post(url, json=payload)
+                with span(f"llm_gateway POST {path}", kind="client"):
+                    response = await client.post(url, json=payload, headers=inject())
                 response.raise_for_status()
                 return response.json()
         except httpx.RequestError as exc:
@@ -1,14 +1,37 @@
 from __future__ import annotations
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 
-from .routers import master, document
+from .readiness import get_readiness, warmup_steps
+from .routers import artifacts, master, hipify, pipeline, worker
+from .profiling import ProfilingMiddleware, router as debug_router
+from .tracing import TracingMiddleware
 
 app = FastAPI(title="AMDlingo Agent Service")
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(TracingMiddleware)
 app.include_router(master.router)
-app.include_router(document.router)
+app.include_router(worker.router)
+app.include_router(hipify.router)
+app.include_router(pipeline.router)
+app.include_router(artifacts.router)
+app.include_router(debug_router)
+
+
+@app.on_event("startup")
+async def start_warmup() -> None:
+    get_readiness().start(warmup_steps())
 
 
 @app.get("/healthz")
 async def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readiness() -> JSONResponse:
+    """200 once warmup has finished; 503 with per-step progress until then."""
+
+    state = get_readiness()
+    return JSONResponse(state.status(), status_code=200 if state.ready else 503)
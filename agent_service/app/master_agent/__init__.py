@@ -1,4 +1,4 @@
 """Deterministic Master Agent implementation."""
-from .service import execute_master
+from .service import execute_master, execute_master_log
 
-__all__ = ["execute_master"]
+__all__ = ["execute_master", "execute_master_log"]
@@ -0,0 +1,411 @@
+"""Deterministic code structure extraction for code mode (Tools Layer #4-#6).
+
+The source is tokenized once, left to right, with the same kind of master
+regex as ``hipify``. While scanning, the extractor tracks brace depth to know
+which kernel body it is in and collects:
+
+* kernel declarations (``__global__``) with their parameters,
+* launch configurations (``<<<...>>>`` and ``hipLaunchKernelGGL``),
+* host/device pointer provenance (``hipMalloc`` vs ``malloc``/``new``),
+* thread index expressions and the variables guarded by a condition.
+
+Declarations are matched only inside a window that ends at the next
+``;``, ``{`` or ``}`` and never spans more than ``MAX_DECL_SPAN``
+characters. Their patterns split whitespace and ``::``-qualified names in
+exactly one way, so a failed match backtracks linearly, not exponentially.
+Findings that can be decided without a model end up in ``issues_found``.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional, Set
+
+from .hipify import describe_launch, find_closing_paren, split_top_level
+
+MAX_STATEMENT_SPAN = 400
+MAX_DECL_SPAN = 256
+MAX_BLOCK_THREADS = 1024
+MAX_INDEX_PATTERNS = 50
+
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+    |(?P<string>"(?:\\.|[^"\\\n])*"|(?:\b(?:u8|[uUL])|(?<!\w))'(?:\\.|[^'\\\n])*')
+    |(?P<include>\#[ \t]*include[^\n]*)
+    |(?P<launch>\b[A-Za-z_][\w:]*(?:<[^<>;()\n]*>)?\s*<<<)
+    |(?P<ident>\b[A-Za-z_]\w*)
+    |(?P<punct>[{};\[])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+IDENTIFIER_PATTERN = re.compile(r"\b[A-Za-z_]\w*")
+# One way only to split ``a::b::c``: every segment ends at a word boundary and
+# the chain takes all its ``::`` parts, so declaration patterns cannot
+# re-split a name between repetitions.
+_QUALIFIED_NAME = r"(?:::)?[A-Za-z_]\w*\b(?:::[A-Za-z_]\w*\b)*(?!::)"
+KERNEL_DECL_PATTERN = re.compile(
+    rf"\s*(?:(?:__launch_bounds__\s*\([^()]*\)|{_QUALIFIED_NAME}(?:<[^<>;(){{}}]*>)?)[\s*]*)*?"
+    r"(?!__launch_bounds__)(?:(?:::)?[A-Za-z_]\w*::)*([A-Za-z_]\w*)\s*\("
+)
+ADDRESS_OF_PATTERN = re.compile(r"\s*\(\s*(?:\(\s*[\w\s*]+\)\s*)?&\s*([A-Za-z_]\w*)")
+ASSIGNED_TO_PATTERN = re.compile(r"([A-Za-z_]\w*)\s*=\s*(?:\([\w\s*:<>]+\)\s*|static_cast<[^>]*>\s*\(\s*)?(?:std::)?$")
+SHARED_DECL_PATTERN = re.compile(rf"\s*(?:{_QUALIFIED_NAME}(?:<[^<>;]*>)?[\s*]*)*?([A-Za-z_]\w*)\s*[\[;=]")
+CONTAINER_DECL_PATTERN = re.compile(r"\s*<[^<>;]*(?:<[^<>;]*>[^<>;]*)*>\s*([A-Za-z_]\w*)")
+INDEX_ASSIGN_PATTERN = re.compile(
+    r"^\s*(?:for\s*\(\s*)?(?:(?:const|unsigned|signed|int|long|size_t|auto|uint32_t|uint64_t|int64_t)\s+)*"
+    r"([A-Za-z_]\w*)\s*=(?!=)\s*(.+)$",
+    re.DOTALL,
+)
+STATEMENT_END_PATTERN = re.compile(r"[;{}]")
+API_PATTERN = re.compile(r"(?:hip|cuda)[A-Z]")
+POINTER_ARG_PATTERN = re.compile(r"^(?:\(\s*[\w\s*]+\)\s*)*&?\s*([A-Za-z_]\w*)")
+INTEGER_PATTERN = re.compile(r"^\d+[uUlL]*$")
+PYTHON_HINT_PATTERN = re.compile(r"^\s*(?:def|import|from)\s+\w+", re.MULTILINE)
+
+THREAD_BUILTINS = {
+    "threadIdx", "blockIdx", "blockDim", "gridDim",
+    "hipThreadIdx_x", "hipThreadIdx_y", "hipThreadIdx_z",
+    "hipBlockIdx_x", "hipBlockIdx_y", "hipBlockIdx_z",
+    "hipBlockDim_x", "hipBlockDim_y", "hipBlockDim_z",
+}
+CONDITION_KEYWORDS = {"if", "while", "for"}
+
+DEVICE_ALLOCATORS = {
+    "hipMalloc": "device",
+    "hipMallocAsync": "device",
+    "hipMallocPitch": "device",
+    "hipExtMallocWithFlags": "device",
+    "cudaMalloc": "device",
+    "cudaMallocAsync": "device",
+    "cudaMallocPitch": "device",
+    "hipMallocManaged": "managed",
+    "cudaMallocManaged": "managed",
+    "hipHostMalloc": "host_pinned",
+    "hipMallocHost": "host_pinned",
+    "cudaMallocHost": "host_pinned",
+    "cudaHostAlloc": "host_pinned",
+}
+HOST_ALLOCATORS = {"malloc", "calloc", "realloc", "aligned_alloc", "new"}
+HOST_CONTAINERS = {"vector", "array", "unique_ptr", "shared_ptr"}
+MEMCPY_CALLS = {"hipMemcpy", "hipMemcpyAsync", "cudaMemcpy", "cudaMemcpyAsync"}
+
+_HOST_SIDES = {"host", "host_pinned"}
+_DIRECTIONS = {
+    "HostToDevice": ("device", "host"),
+    "DeviceToHost": ("host", "device"),
+    "DeviceToDevice": ("device", "device"),
+    "HostToHost": ("host", "host"),
+}
+
+
+def extract_code_structure(code: str) -> Dict[str, object]:
+    """Scan ``code`` once and return kernels, launches, pointers and issues."""
+
+    kernels: List[Dict[str, object]] = []
+    launches: List[Dict[str, object]] = []
+    pointers: Dict[str, str] = {}
+    index_patterns: List[str] = []
+    memcpy_calls: List[Dict[str, object]] = []
+    apis: Dict[str, None] = {}
+
+    saw_hip = saw_cuda = saw_qualifier = saw_braces = False
+    depth = 0
+    statement_start = 0
+    last_index_statement = -1
+    pending_kernel: Optional[Dict[str, object]] = None
+    current: Optional[_KernelScope] = None
+
+    counted = 0
+    line = 1
+    line_start = 0
+    for match in TOKEN_PATTERN.finditer(code):
+        start, end = match.span()
+        newlines = code.count("\n", counted, start)
+        if newlines:
+            line += newlines
+            line_start = code.rfind("\n", counted, start) + 1
+        counted = start
+        kind = match.lastgroup
+
+        if kind == "punct":
+            char = match.group()
+            if char == "[":
+                if current is not None:
+                    close = code.find("]", end, end + MAX_STATEMENT_SPAN)
+                    if close != -1:
+                        current.subscripted.update(IDENTIFIER_PATTERN.findall(code, end, close))
+                continue
+            saw_braces = True
+            statement_start = end
+            if char == "{":
+                depth += 1
+                if pending_kernel is not None:
+                    current = _KernelScope(pending_kernel, depth)
+                    pending_kernel = None
+            elif char == "}":
+                if current is not None and depth == current.depth:
+                    current.close()
+                    current = None
+                depth -= 1
+            elif pending_kernel is not None:
+                # A prototype without a body.
+                pending_kernel = None
+            continue
+
+        if kind == "launch":
+            saw_cuda = True
+            kernel = match.group("launch")[:-3].strip()
+            launch = describe_launch(code, kernel, start, end, line, start - line_start + 1)
+            launches.append(_launch_entry(kernel, launch.get("launch_config"), line, "triple_chevron"))
+            continue
+
+        if kind != "ident":
+            continue
+
+        name = match.group()
+        if API_PATTERN.match(name):
+            if name[0] == "h":
+                saw_hip = True
+            else:
+                saw_cuda = True
+            apis.setdefault(name)
+
+        if name == "__global__":
+            saw_qualifier = True
+            declared = _parse_kernel_declaration(code, end, line)
+            if declared is not None:
+                kernels.append(declared)
+                pending_kernel = declared
+        elif name == "__device__":
+            saw_qualifier = True
+        elif name == "__shared__":
+            decl = SHARED_DECL_PATTERN.match(code, end, _declaration_end(code, end, inclusive=True))
+            if decl:
+                pointers[decl.group(1)] = "shared"
+        elif name in THREAD_BUILTINS:
+            if current is not None and statement_start != last_index_statement:
+                last_index_statement = statement_start
+                _record_index(code, statement_start, current, index_patterns)
+        elif name in CONDITION_KEYWORDS:
+            if current is not None:
+                _record_guard(code, end, current)
+        elif name in DEVICE_ALLOCATORS:
+            target = ADDRESS_OF_PATTERN.match(code, end)
+            if target:
+                pointers[target.group(1)] = DEVICE_ALLOCATORS[name]
+        elif name in HOST_ALLOCATORS:
+            target = ASSIGNED_TO_PATTERN.search(code, max(statement_start, start - MAX_STATEMENT_SPAN), start)
+            if target:
+                pointers.setdefault(target.group(1), "host")
+        elif name in HOST_CONTAINERS:
+            decl = CONTAINER_DECL_PATTERN.match(code, end)
+            if decl:
+                pointers.setdefault(decl.group(1), "host")
+        elif name == "hipLaunchKernelGGL":
+            launch = _parse_ggl_launch(code, end, line)
+            if launch is not None:
+                launches.append(launch)
+        elif name in MEMCPY_CALLS:
+            call = _parse_call_args(code, end)
+            if call is not None and len(call) >= 4:
+                memcpy_calls.append({"api": name, "args": call, "line": line})
+
+    language = _language(saw_hip, saw_cuda, saw_qualifier)
+    if language == "c++" and not saw_braces and PYTHON_HINT_PATTERN.search(code):
+        language = "python"
+
+    issues: List[str] = []
+    for kernel in kernels:
+        for variable in kernel["unguarded_indices"]:
+            issues.append(
+                f"kernel '{kernel['name']}' (line {kernel['line']}) indexes memory with "
+                f"'{variable}' without a bounds check"
+            )
+    for launch in launches:
+        threads = _block_threads(launch["block"])
+        if threads is not None and threads > MAX_BLOCK_THREADS:
+            issues.append(
+                f"launch of '{launch['kernel']}' (line {launch['line']}) uses {threads} threads "
+                f"per block; the limit is {MAX_BLOCK_THREADS}"
+            )
+    for call in memcpy_calls:
+        mismatch = _memcpy_mismatch(call, pointers)
+        if mismatch:
+            issues.append(mismatch)
+
+    return {
+        "language": language,
+        "api_list": list(apis),
+        "kernels": kernels,
+        "launch_config": launches,
+        "pointer_metadata": pointers,
+        "index_patterns": index_patterns,
+        "issues_found": issues,
+    }
+
+
+class _KernelScope:
+    """Per-kernel state collected while the scanner is inside its body."""
+
+    def __init__(self, kernel: Dict[str, object], depth: int) -> None:
+        self.kernel = kernel
+        self.depth = depth
+        self.index_vars: Dict[str, None] = {}
+        self.guarded: Set[str] = set()
+        self.subscripted: Set[str] = set()
+
+    def close(self) -> None:
+        self.kernel["index_vars"] = list(self.index_vars)
+        self.kernel["unguarded_indices"] = [
+            name for name in self.index_vars
+            if name in self.subscripted and name not in self.guarded
+        ]
+
+
+def _declaration_end(code: str, offset: int, inclusive: bool = False) -> int:
+    """End of the window a declaration starting at ``offset`` is matched in."""
+
+    limit = min(len(code), offset + MAX_DECL_SPAN)
+    found = STATEMENT_END_PATTERN.search(code, offset, limit)
+    if found is None:
+        return limit
+    return found.end() if inclusive else found.start()
+
+
+def _parse_kernel_declaration(code: str, offset: int, line: int) -> Optional[Dict[str, object]]:
+    decl = KERNEL_DECL_PATTERN.match(code, offset, _declaration_end(code, offset))
+    if decl is None:
+        return None
+    open_paren = decl.end() - 1
+    close = find_closing_paren(code, open_paren)
+    params_text = code[open_paren + 1 : close] if close != -1 else ""
+    params = [param for param in split_top_level(params_text) if param]
+    pointer_params = []
+    for param in params:
+        if "*" in param:
+            names = IDENTIFIER_PATTERN.findall(param)
+            if names:
+                pointer_params.append(names[-1])
+    return {
+        "name": decl.group(1),
+        "line": line + code.count("\n", offset, decl.start(1)),
+        "params": params,
+        "pointer_params": pointer_params,
+        "index_vars": [],
+        "unguarded_indices": [],
+    }
+
+
+def _record_index(code: str, statement_start: int, scope: _KernelScope, patterns: List[str]) -> None:
+    statement_end = STATEMENT_END_PATTERN.search(code, statement_start, statement_start + MAX_STATEMENT_SPAN)
+    if statement_end is None:
+        return
+    statement = " ".join(code[statement_start : statement_end.start()].split())
+    assignment = INDEX_ASSIGN_PATTERN.match(statement)
+    if assignment is None:
+        return
+    variable = assignment.group(1)
+    scope.index_vars.setdefault(variable)
+    if len(patterns) < MAX_INDEX_PATTERNS:
+        patterns.append(f"{variable} = {assignment.group(2)}")
+
+
+def _record_guard(code: str, offset: int, scope: _KernelScope) -> None:
+    cursor = offset
+    while cursor < len(code) and code[cursor].isspace():
+        cursor += 1
+    if cursor >= len(code) or code[cursor] != "(":
+        return
+    close = find_closing_paren(code, cursor)
+    if close == -1:
+        return
+    condition = code[cursor + 1 : close]
+    if "<" in condition or ">" in condition:
+        scope.guarded.update(IDENTIFIER_PATTERN.findall(condition))
+
+
+def _parse_call_args(code: str, offset: int) -> Optional[List[str]]:
+    cursor = offset
+    while cursor < len(code) and code[cursor].isspace():
+        cursor += 1
+    if cursor >= len(code) or code[cursor] != "(":
+        return None
+    close = find_closing_paren(code, cursor)
+    if close == -1:
+        return None
+    return split_top_level(code[cursor + 1 : close])
+
+
+def _parse_ggl_launch(code: str, offset: int, line: int) -> Optional[Dict[str, object]]:
+    args = _parse_call_args(code, offset)
+    if args is None or len(args) < 3:
+        return None
+    kernel = args[0]
+    if kernel.startswith("HIP_KERNEL_NAME(") and kernel.endswith(")"):
+        kernel = kernel[len("HIP_KERNEL_NAME(") : -1].strip()
+    config = {
+        "grid": args[1],
+        "block": args[2],
+        "shared_mem": args[3] if len(args) > 3 else "0",
+        "stream": args[4] if len(args) > 4 else "0",
+    }
+    return _launch_entry(kernel, config, line, "hipLaunchKernelGGL")
+
+
+def _launch_entry(
+    kernel: str, config: Optional[Dict[str, str]], line: int, syntax: str
+) -> Dict[str, object]:
+    config = config or {}
+    return {
+        "kernel": kernel,
+        "grid": config.get("grid", ""),
+        "block": config.get("block", ""),
+        "shared_mem": config.get("shared_mem", "0"),
+        "stream": config.get("stream", "0"),
+        "line": line,
+        "syntax": syntax,
+    }
+
+
+def _block_threads(block: str) -> Optional[int]:
+    expression = block.strip()
+    if expression.startswith("dim3(") and expression.endswith(")"):
+        parts = split_top_level(expression[5:-1])
+    else:
+        parts = [expression]
+    threads = 1
+    for part in parts:
+        if not INTEGER_PATTERN.match(part):
+            return None
+        threads *= int(part.rstrip("uUlL"))
+    return threads
+
+
+def _memcpy_mismatch(call: Dict[str, object], pointers: Dict[str, str]) -> str:
+    args: List[str] = call["args"]  # type: ignore[assignment]
+    direction = args[3].rsplit("Memcpy", 1)[-1]
+    expected = _DIRECTIONS.get(direction)
+    if expected is None:
+        return ""
+    for role, argument, side in (("dst", args[0], expected[0]), ("src", args[1], expected[1])):
+        name = POINTER_ARG_PATTERN.match(argument)
+        actual = pointers.get(name.group(1)) if name else None
+        if actual is None or actual == "managed":
+            continue
+        actual_side = "host" if actual in _HOST_SIDES else "device" if actual == "device" else None
+        if actual_side is not None and actual_side != side:
+            return (
+                f"{call['api']} (line {call['line']}) copies {direction} but {role} "
+                f"'{name.group(1)}' is a {actual} pointer"
+            )
+    return ""
+
+
+def _language(saw_hip: bool, saw_cuda: bool, saw_qualifier: bool) -> str:
+    if saw_hip:
+        return "hip"
+    if saw_cuda:
+        return "cuda"
+    if saw_qualifier:
+        return "hip"
+    return "c++"
@@ -2,10 +2,14 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
 
 import httpx
-from bs4 import BeautifulSoup
+
+from ..tracing import span
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
 HTTP_TIMEOUT = 5.0
 MAX_TEXT_LENGTH = 12000
@@ -16,23 +20,31 @@ def fetch_document(url: str) -> Dict[str, object]:
     """Fetch the document at the given URL and extract metadata."""
 
     try:
-        response = httpx.get(url, timeout=HTTP_TIMEOUT)
-        response.raise_for_status()
+        with span("document.fetch", url=url):
+            response = httpx.get(url, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
     except httpx.HTTPError:
         return {}
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    title = _extract_title(soup)
+    with span("document.parse", html_bytes=len(response.content)):
+        return parse_document(response.text, url)
+
+
+def parse_document(html: str, url: str) -> Dict[str, object]:
+    """Extract title, sections, text and API names from an HTML page."""
+
+    # bs4 is only needed for document mode; keep it off the import path.
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
     sections = _extract_sections(soup)
     raw_text = _extract_text(soup)
-    api_list = _extract_api_names(raw_text)
-
     return {
-        "title": title,
+        "title": _extract_title(soup),
         "section_headers": sections,
         "raw_text": raw_text,
         "document_category": _guess_category(url, sections),
-        "api_list": api_list,
+        "api_list": _extract_api_names(raw_text),
         "section_contents": _extract_section_contents(soup),
     }
 
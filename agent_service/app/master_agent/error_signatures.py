@@ -0,0 +1,660 @@
+"""Error Signature DB for HIP, HSA, ROCm libraries and PyTorch-ROCm logs.
+
+Every signature is compiled into one trie-shaped regex (see ``literal_trie``)
+so a log is classified with a single pass regardless of the table size.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Tuple
+
+from .literal_trie import LiteralTrie
+
+# Priority of a signature source when choosing the primary error type.
+# Exact status codes outrank runtime messages, which outrank generic symptoms.
+PRIORITY_CODE = 3
+PRIORITY_MESSAGE = 2
+PRIORITY_SYMPTOM = 1
+
+TYPICAL_CAUSES: Dict[str, List[str]] = {
+    "illegal_address": [
+        "out-of-bounds global memory access",
+        "host pointer dereferenced inside a kernel",
+        "use of freed or uninitialized device pointer",
+        "missing boundary check (i < N) in kernel",
+    ],
+    "invalid_value": [
+        "invalid argument passed to HIP API",
+        "size or count is zero or exceeds allocation",
+        "null or mismatched pointer argument",
+    ],
+    "out_of_memory": [
+        "allocation larger than free device memory",
+        "memory leak from missing hipFree",
+        "batch size or workspace too large",
+        "fragmentation from many small allocations",
+    ],
+    "launch_failure": [
+        "kernel crashed during execution",
+        "invalid memory access inside kernel",
+        "device-side assert or trap",
+    ],
+    "launch_resources": [
+        "block size exceeds device limit",
+        "too many registers or too much shared memory per block",
+        "grid dimensions exceed device limits",
+    ],
+    "launch_timeout": [
+        "kernel runs longer than watchdog allows",
+        "infinite loop or deadlock in kernel",
+    ],
+    "invalid_configuration": [
+        "grid or block dimension is zero or too large",
+        "dynamic shared memory exceeds device limit",
+    ],
+    "no_binary": [
+        "code object not built for current GPU architecture",
+        "missing --offload-arch for target gfx",
+        "HSA_OVERRIDE_GFX_VERSION mismatch",
+    ],
+    "invalid_device_function": [
+        "kernel not compiled for current GPU architecture",
+        "mismatch between host and device code objects",
+    ],
+    "no_device": [
+        "no AMD GPU visible to the process",
+        "ROCm driver (amdgpu/kfd) not loaded",
+        "HIP_VISIBLE_DEVICES or ROCR_VISIBLE_DEVICES hides devices",
+        "user lacks access to /dev/kfd or /dev/dri",
+    ],
+    "invalid_device": [
+        "device ordinal out of range",
+        "HIP_VISIBLE_DEVICES changes device numbering",
+    ],
+    "not_initialized": [
+        "HIP runtime used before initialization",
+        "runtime initialization failed (driver or permissions)",
+    ],
+    "driver": [
+        "ROCm user-space and kernel driver versions incompatible",
+        "amdgpu kernel module missing or outdated",
+    ],
+    "invalid_pointer": [
+        "host pointer passed where device pointer expected",
+        "pointer freed or from another context",
+    ],
+    "memcpy_direction": [
+        "hipMemcpyKind does not match pointer locations",
+        "src and dst swapped",
+    ],
+    "invalid_handle": [
+        "stream, event or handle already destroyed",
+        "handle created on a different device",
+    ],
+    "not_ready": [
+        "asynchronous work still pending when queried",
+    ],
+    "peer_access": [
+        "peer access not supported between the GPUs",
+        "hipDeviceEnablePeerAccess called twice or not called",
+    ],
+    "mapping": [
+        "resource mapped or unmapped twice",
+        "invalid graphics interop mapping",
+    ],
+    "module": [
+        "code object file missing or corrupt",
+        "kernel or symbol name not found in module",
+        "module compiled for different architecture",
+    ],
+    "context": [
+        "context destroyed or not current on this thread",
+        "mixing primary and explicit contexts",
+    ],
+    "stream_capture": [
+        "illegal API call during stream capture",
+        "capture started and ended on different streams or threads",
+    ],
+    "graph": [
+        "graph topology changed since instantiation",
+        "unsupported node type for update",
+    ],
+    "host_register": [
+        "host memory registered or unregistered twice",
+    ],
+    "texture": [
+        "invalid texture or channel descriptor",
+    ],
+    "profiler": [
+        "profiler API used in wrong state",
+    ],
+    "not_supported": [
+        "feature not supported on this GPU or ROCm version",
+    ],
+    "assert": [
+        "device-side assert triggered by invalid index or data",
+    ],
+    "unknown": [
+        "unspecified runtime failure, enable AMD_SERIALIZE_KERNEL=3 to localize",
+    ],
+    "hsa_memory": [
+        "GPU page fault from out-of-bounds or freed pointer",
+        "access outside aperture (host pointer on device)",
+    ],
+    "hsa_resources": [
+        "queue, signal or memory resources exhausted",
+        "too many concurrent processes or streams",
+    ],
+    "hsa_code_object": [
+        "code object incompatible with agent ISA",
+        "corrupt or mismatched executable",
+    ],
+    "hsa_generic": [
+        "ROCr runtime failure, check dmesg for amdgpu errors",
+    ],
+    "hsa_illegal_instruction": [
+        "kernel built for wrong gfx target",
+        "compiler bug or corrupt code object",
+    ],
+    "gpu_reset": [
+        "GPU hang triggered driver reset",
+        "kernel timeout or page fault escalated to reset",
+    ],
+    "blas": [
+        "invalid matrix dimensions, leading dimension or stride",
+        "handle not created or used on wrong stream",
+        "library built without support for this architecture",
+    ],
+    "fft": [
+        "invalid plan dimensions, strides or type",
+        "work buffer missing or too small",
+    ],
+    "rand": [
+        "generator not created or destroyed twice",
+        "output length not multiple of required dimension",
+    ],
+    "miopen": [
+        "unsupported tensor layout or data type",
+        "missing or stale MIOpen kernel database",
+        "workspace allocation failure",
+    ],
+    "rccl": [
+        "inconsistent collective calls across ranks",
+        "network or peer-to-peer transport failure",
+        "underlying HIP call failed inside RCCL",
+    ],
+    "torch_oom": [
+        "tensor allocation exceeds free VRAM",
+        "caching allocator fragmentation (tune PYTORCH_HIP_ALLOC_CONF)",
+        "batch size too large",
+    ],
+    "torch_device": [
+        "PyTorch wheel built for CUDA instead of ROCm",
+        "no visible AMD GPU or unsupported gfx target",
+    ],
+    "torch_mixed_device": [
+        "tensors on different devices in one operation",
+        "model moved to GPU but inputs left on CPU",
+    ],
+    "segfault": [
+        "host-side null or dangling pointer",
+        "device pointer dereferenced on the host",
+        "ABI mismatch between ROCm libraries",
+    ],
+}
+
+# (signature, error_type, cause key, related APIs)
+_Signature = Tuple[str, str, str, List[str]]
+
+_MEMCPY_APIS = ["hipMemcpy", "hipMemcpyAsync"]
+_MALLOC_APIS = ["hipMalloc", "hipFree", "hipMemGetInfo"]
+_LAUNCH_APIS = ["hipLaunchKernelGGL", "hipGetLastError", "hipDeviceSynchronize"]
+_DEVICE_APIS = ["hipGetDeviceCount", "hipSetDevice", "hipGetDeviceProperties"]
+_MODULE_APIS = ["hipModuleLoad", "hipModuleGetFunction", "hipModuleLaunchKernel"]
+_STREAM_APIS = ["hipStreamCreate", "hipStreamSynchronize", "hipStreamQuery"]
+_EVENT_APIS = ["hipEventCreate", "hipEventRecord", "hipEventQuery"]
+_PEER_APIS = ["hipDeviceCanAccessPeer", "hipDeviceEnablePeerAccess"]
+_CAPTURE_APIS = ["hipStreamBeginCapture", "hipStreamEndCapture"]
+_GRAPH_APIS = ["hipGraphInstantiate", "hipGraphExecUpdate", "hipGraphLaunch"]
+
+_HIP_ERROR_CODES: List[_Signature] = [
+    ("hipErrorInvalidValue", "hipErrorInvalidValue", "invalid_value", _MEMCPY_APIS),
+    ("hipErrorOutOfMemory", "hipErrorOutOfMemory", "out_of_memory", _MALLOC_APIS),
+    ("hipErrorMemoryAllocation", "hipErrorOutOfMemory", "out_of_memory", _MALLOC_APIS),
+    ("hipErrorNotInitialized", "hipErrorNotInitialized", "not_initialized", ["hipInit"]),
+    ("hipErrorInitializationError", "hipErrorNotInitialized", "not_initialized", ["hipInit"]),
+    ("hipErrorDeinitialized", "hipErrorDeinitialized", "not_initialized", ["hipInit"]),
+    ("hipErrorProfilerDisabled", "hipErrorProfilerDisabled", "profiler", ["hipProfilerStart"]),
+    ("hipErrorProfilerNotInitialized", "hipErrorProfilerNotInitialized", "profiler", ["hipProfilerStart"]),
+    ("hipErrorProfilerAlreadyStarted", "hipErrorProfilerAlreadyStarted", "profiler", ["hipProfilerStart"]),
+    ("hipErrorProfilerAlreadyStopped", "hipErrorProfilerAlreadyStopped", "profiler", ["hipProfilerStop"]),
+    ("hipErrorInvalidConfiguration", "hipErrorInvalidConfiguration", "invalid_configuration", _LAUNCH_APIS),
+    ("hipErrorInvalidPitchValue", "hipErrorInvalidPitchValue", "invalid_value", ["hipMallocPitch", "hipMemcpy2D"]),
+    ("hipErrorInvalidSymbol", "hipErrorInvalidSymbol", "module", ["hipMemcpyToSymbol", "hipGetSymbolAddress"]),
+    ("hipErrorInvalidDevicePointer", "hipErrorInvalidDevicePointer", "invalid_pointer", _MEMCPY_APIS),
+    ("hipErrorInvalidMemcpyDirection", "hipErrorInvalidMemcpyDirection", "memcpy_direction", _MEMCPY_APIS),
+    ("hipErrorInsufficientDriver", "hipErrorInsufficientDriver", "driver", ["hipDriverGetVersion"]),
+    ("hipErrorMissingConfiguration", "hipErrorMissingConfiguration", "invalid_configuration", _LAUNCH_APIS),
+    ("hipErrorPriorLaunchFailure", "hipErrorPriorLaunchFailure", "launch_failure", _LAUNCH_APIS),
+    ("hipErrorInvalidDeviceFunction", "hipErrorInvalidDeviceFunction", "invalid_device_function", _LAUNCH_APIS),
+    ("hipErrorNoDevice", "hipErrorNoDevice", "no_device", _DEVICE_APIS),
+    ("hipErrorInvalidDevice", "hipErrorInvalidDevice", "invalid_device", _DEVICE_APIS),
+    ("hipErrorInvalidImage", "hipErrorInvalidImage", "module", _MODULE_APIS),
+    ("hipErrorInvalidContext", "hipErrorInvalidContext", "context", ["hipCtxGetCurrent", "hipCtxSetCurrent"]),
+    ("hipErrorContextAlreadyCurrent", "hipErrorContextAlreadyCurrent", "context", ["hipCtxSetCurrent"]),
+    ("hipErrorMapFailed", "hipErrorMapFailed", "mapping", ["hipGraphicsMapResources"]),
+    ("hipErrorMapBufferObjectFailed", "hipErrorMapFailed", "mapping", ["hipGraphicsMapResources"]),
+    ("hipErrorUnmapFailed", "hipErrorUnmapFailed", "mapping", ["hipGraphicsUnmapResources"]),
+    ("hipErrorArrayIsMapped", "hipErrorArrayIsMapped", "mapping", ["hipGraphicsUnmapResources"]),
+    ("hipErrorAlreadyMapped", "hipErrorAlreadyMapped", "mapping", ["hipGraphicsMapResources"]),
+    ("hipErrorNoBinaryForGpu", "hipErrorNoBinaryForGpu", "no_binary", _LAUNCH_APIS),
+    ("hipErrorAlreadyAcquired", "hipErrorAlreadyAcquired", "mapping", ["hipGraphicsMapResources"]),
+    ("hipErrorNotMapped", "hipErrorNotMapped", "mapping", ["hipGraphicsResourceGetMappedPointer"]),
+    ("hipErrorNotMappedAsArray", "hipErrorNotMappedAsArray", "mapping", ["hipGraphicsSubResourceGetMappedArray"]),
+    ("hipErrorNotMappedAsPointer", "hipErrorNotMappedAsPointer", "mapping", ["hipGraphicsResourceGetMappedPointer"]),
+    ("hipErrorECCNotCorrectable", "hipErrorECCNotCorrectable", "hsa_generic", ["hipDeviceReset"]),
+    ("hipErrorUnsupportedLimit", "hipErrorUnsupportedLimit", "not_supported", ["hipDeviceSetLimit"]),
+    ("hipErrorContextAlreadyInUse", "hipErrorContextAlreadyInUse", "context", ["hipCtxSetCurrent"]),
+    ("hipErrorPeerAccessUnsupported", "hipErrorPeerAccessUnsupported", "peer_access", _PEER_APIS),
+    ("hipErrorInvalidKernelFile", "hipErrorInvalidKernelFile", "module", _MODULE_APIS),
+    ("hipErrorInvalidGraphicsContext", "hipErrorInvalidGraphicsContext", "mapping", ["hipGraphicsMapResources"]),
+    ("hipErrorInvalidSource", "hipErrorInvalidSource", "module", ["hiprtcCompileProgram"]),
+    ("hipErrorFileNotFound", "hipErrorFileNotFound", "module", _MODULE_APIS),
+    ("hipErrorSharedObjectSymbolNotFound", "hipErrorSharedObjectSymbolNotFound", "module", _MODULE_APIS),
+    ("hipErrorSharedObjectInitFailed", "hipErrorSharedObjectInitFailed", "module", _MODULE_APIS),
+    ("hipErrorOperatingSystem", "hipErrorOperatingSystem", "driver", ["hipInit"]),
+    ("hipErrorInvalidHandle", "hipErrorInvalidHandle", "invalid_handle", _STREAM_APIS),
+    ("hipErrorInvalidResourceHandle", "hipErrorInvalidHandle", "invalid_handle", _STREAM_APIS),
+    ("hipErrorIllegalState", "hipErrorIllegalState", "stream_capture", _CAPTURE_APIS),
+    ("hipErrorNotFound", "hipErrorNotFound", "module", ["hipModuleGetFunction", "hipGetSymbolAddress"]),
+    ("hipErrorNotReady", "hipErrorNotReady", "not_ready", _STREAM_APIS + _EVENT_APIS),
+    ("hipErrorIllegalAddress", "hipErrorIllegalAddress", "illegal_address", _MEMCPY_APIS + _LAUNCH_APIS),
+    ("hipErrorLaunchOutOfResources", "hipErrorLaunchOutOfResources", "launch_resources", _LAUNCH_APIS),
+    ("hipErrorLaunchTimeOut", "hipErrorLaunchTimeOut", "launch_timeout", _LAUNCH_APIS),
+    ("hipErrorPeerAccessAlreadyEnabled", "hipErrorPeerAccessAlreadyEnabled", "peer_access", _PEER_APIS),
+    ("hipErrorPeerAccessNotEnabled", "hipErrorPeerAccessNotEnabled", "peer_access", _PEER_APIS),
+    ("hipErrorSetOnActiveProcess", "hipErrorSetOnActiveProcess", "context", ["hipSetDeviceFlags"]),
+    ("hipErrorContextIsDestroyed", "hipErrorContextIsDestroyed", "context", ["hipCtxDestroy"]),
+    ("hipErrorAssert", "hipErrorAssert", "assert", _LAUNCH_APIS),
+    ("hipErrorHostMemoryAlreadyRegistered", "hipErrorHostMemoryAlreadyRegistered", "host_register", ["hipHostRegister"]),
+    ("hipErrorHostMemoryNotRegistered", "hipErrorHostMemoryNotRegistered", "host_register", ["hipHostUnregister"]),
+    ("hipErrorLaunchFailure", "hipErrorLaunchFailure", "launch_failure", _LAUNCH_APIS),
+    ("hipErrorCooperativeLaunchTooLarge", "hipErrorCooperativeLaunchTooLarge", "launch_resources", ["hipLaunchCooperativeKernel"]),
+    ("hipErrorNotSupported", "hipErrorNotSupported", "not_supported", ["hipDeviceGetAttribute"]),
+    ("hipErrorStreamCaptureUnsupported", "hipErrorStreamCaptureUnsupported", "stream_capture", _CAPTURE_APIS),
+    ("hipErrorStreamCaptureInvalidated", "hipErrorStreamCaptureInvalidated", "stream_capture", _CAPTURE_APIS),
+    ("hipErrorStreamCaptureMerge", "hipErrorStreamCaptureMerge", "stream_capture", _CAPTURE_APIS),
+    ("hipErrorStreamCaptureUnmatched", "hipErrorStreamCaptureUnmatched", "stream_capture", _CAPTURE_APIS),
+    ("hipErrorStreamCaptureUnjoined", "hipErrorStreamCaptureUnjoined", "stream_capture", _CAPTURE_APIS),
+    ("hipErrorStreamCaptureIsolation", "hipErrorStreamCaptureIsolation", "stream_capture", _CAPTURE_APIS),
+    ("hipErrorStreamCaptureImplicit", "hipErrorStreamCaptureImplicit", "stream_capture", _CAPTURE_APIS),
+    ("hipErrorCapturedEvent", "hipErrorCapturedEvent", "stream_capture", _CAPTURE_APIS + _EVENT_APIS),
+    ("hipErrorStreamCaptureWrongThread", "hipErrorStreamCaptureWrongThread", "stream_capture", _CAPTURE_APIS),
+    ("hipErrorGraphExecUpdateFailure", "hipErrorGraphExecUpdateFailure", "graph", _GRAPH_APIS),
+    ("hipErrorInvalidChannelDescriptor", "hipErrorInvalidChannelDescriptor", "texture", ["hipCreateChannelDesc"]),
+    ("hipErrorInvalidTexture", "hipErrorInvalidTexture", "texture", ["hipCreateTextureObject"]),
+    ("hipErrorUnknown", "hipErrorUnknown", "unknown", _LAUNCH_APIS),
+    ("hipErrorRuntimeMemory", "hipErrorRuntimeMemory", "hsa_generic", _MALLOC_APIS),
+    ("hipErrorRuntimeOther", "hipErrorRuntimeOther", "hsa_generic", ["hipDeviceSynchronize"]),
+    ("hipErrorTbd", "hipErrorUnknown", "unknown", []),
+]
+
+# hipGetErrorString() texts and other HIP runtime messages.
+_HIP_MESSAGES: List[_Signature] = [
+    ("an illegal memory access was encountered", "hipErrorIllegalAddress", "illegal_address", _MEMCPY_APIS + _LAUNCH_APIS),
+    ("illegal memory access", "hipErrorIllegalAddress", "illegal_address", _MEMCPY_APIS + _LAUNCH_APIS),
+    ("illegal address", "hipErrorIllegalAddress", "illegal_address", _MEMCPY_APIS + _LAUNCH_APIS),
+    ("invalid argument", "hipErrorInvalidValue", "invalid_value", _MEMCPY_APIS),
+    ("unspecified launch failure", "hipErrorLaunchFailure", "launch_failure", _LAUNCH_APIS),
+    ("too many resources requested for launch", "hipErrorLaunchOutOfResources", "launch_resources", _LAUNCH_APIS),
+    ("the launch timed out and was terminated", "hipErrorLaunchTimeOut", "launch_timeout", _LAUNCH_APIS),
+    ("invalid configuration argument", "hipErrorInvalidConfiguration", "invalid_configuration", _LAUNCH_APIS),
+    ("invalid device function", "hipErrorInvalidDeviceFunction", "invalid_device_function", _LAUNCH_APIS),
+    ("invalid device ordinal", "hipErrorInvalidDevice", "invalid_device", _DEVICE_APIS),
+    ("invalid device pointer", "hipErrorInvalidDevicePointer", "invalid_pointer", _MEMCPY_APIS),
+    ("invalid memcpy direction", "hipErrorInvalidMemcpyDirection", "memcpy_direction", _MEMCPY_APIS),
+    ("invalid resource handle", "hipErrorInvalidHandle", "invalid_handle", _STREAM_APIS),
+    ("no ROCm-capable device is detected", "hipErrorNoDevice", "no_device", _DEVICE_APIS),
+    ("no HIP-capable device is detected", "hipErrorNoDevice", "no_device", _DEVICE_APIS),
+    ("no kernel image is available for execution on the device", "hipErrorNoBinaryForGpu", "no_binary", _LAUNCH_APIS),
+    ("Unable to find code object for all current devices", "hipErrorNoBinaryForGpu", "no_binary", _LAUNCH_APIS),
+    ("device kernel image is invalid", "hipErrorInvalidImage", "module", _MODULE_APIS),
+    ("named symbol not found", "hipErrorNotFound", "module", _MODULE_APIS),
+    ("device not ready", "hipErrorNotReady", "not_ready", _STREAM_APIS),
+    ("initialization error", "hipErrorNotInitialized", "not_initialized", ["hipInit"]),
+    ("driver version is insufficient for runtime version", "hipErrorInsufficientDriver", "driver", ["hipDriverGetVersion"]),
+    ("peer access is not supported between these two devices", "hipErrorPeerAccessUnsupported", "peer_access", _PEER_APIS),
+    ("operation not permitted when stream is capturing", "hipErrorStreamCaptureUnsupported", "stream_capture", _CAPTURE_APIS),
+    ("device-side assert triggered", "hipErrorAssert", "assert", _LAUNCH_APIS),
+    ("device side assert triggered", "hipErrorAssert", "assert", _LAUNCH_APIS),
+    ("operation not supported", "hipErrorNotSupported", "not_supported", ["hipDeviceGetAttribute"]),
+    ("hipMalloc failed", "hipErrorOutOfMemory", "out_of_memory", _MALLOC_APIS),
+    ("hipMemcpy failed", "hipErrorInvalidValue", "invalid_value", _MEMCPY_APIS),
+    ("kernel launch failed", "hipErrorLaunchFailure", "launch_failure", _LAUNCH_APIS),
+]
+
+_HSA_STATUS_CODES: List[_Signature] = [
+    ("HSA_STATUS_ERROR", "HSA_STATUS_ERROR", "hsa_generic", ["hipDeviceSynchronize"]),
+    ("HSA_STATUS_ERROR_INVALID_ARGUMENT", "HSA_STATUS_ERROR_INVALID_ARGUMENT", "invalid_value", _LAUNCH_APIS),
+    ("HSA_STATUS_ERROR_INVALID_QUEUE_CREATION", "HSA_STATUS_ERROR_INVALID_QUEUE_CREATION", "hsa_resources", _STREAM_APIS),
+    ("HSA_STATUS_ERROR_INVALID_ALLOCATION", "HSA_STATUS_ERROR_INVALID_ALLOCATION", "out_of_memory", _MALLOC_APIS),
+    ("HSA_STATUS_ERROR_INVALID_AGENT", "HSA_STATUS_ERROR_INVALID_AGENT", "invalid_device", _DEVICE_APIS),
+    ("HSA_STATUS_ERROR_INVALID_REGION", "HSA_STATUS_ERROR_INVALID_REGION", "out_of_memory", _MALLOC_APIS),
+    ("HSA_STATUS_ERROR_INVALID_SIGNAL", "HSA_STATUS_ERROR_INVALID_SIGNAL", "invalid_handle", _EVENT_APIS),
+    ("HSA_STATUS_ERROR_INVALID_QUEUE", "HSA_STATUS_ERROR_INVALID_QUEUE", "invalid_handle", _STREAM_APIS),
+    ("HSA_STATUS_ERROR_OUT_OF_RESOURCES", "HSA_STATUS_ERROR_OUT_OF_RESOURCES", "hsa_resources", _MALLOC_APIS + _STREAM_APIS),
+    ("HSA_STATUS_ERROR_INVALID_PACKET_FORMAT", "HSA_STATUS_ERROR_INVALID_PACKET_FORMAT", "hsa_generic", _LAUNCH_APIS),
+    ("HSA_STATUS_ERROR_RESOURCE_FREE", "HSA_STATUS_ERROR_RESOURCE_FREE", "invalid_handle", ["hipFree"]),
+    ("HSA_STATUS_ERROR_NOT_INITIALIZED", "HSA_STATUS_ERROR_NOT_INITIALIZED", "not_initialized", ["hipInit"]),
+    ("HSA_STATUS_ERROR_REFCOUNT_OVERFLOW", "HSA_STATUS_ERROR_REFCOUNT_OVERFLOW", "hsa_generic", ["hipInit"]),
+    ("HSA_STATUS_ERROR_INCOMPATIBLE_ARGUMENTS", "HSA_STATUS_ERROR_INCOMPATIBLE_ARGUMENTS", "invalid_value", _LAUNCH_APIS),
+    ("HSA_STATUS_ERROR_INVALID_INDEX", "HSA_STATUS_ERROR_INVALID_INDEX", "invalid_value", _DEVICE_APIS),
+    ("HSA_STATUS_ERROR_INVALID_ISA", "HSA_STATUS_ERROR_INVALID_ISA", "hsa_code_object", _MODULE_APIS),
+    ("HSA_STATUS_ERROR_INVALID_ISA_NAME", "HSA_STATUS_ERROR_INVALID_ISA_NAME", "hsa_code_object", _MODULE_APIS),
+    ("HSA_STATUS_ERROR_INVALID_CODE_OBJECT", "HSA_STATUS_ERROR_INVALID_CODE_OBJECT", "hsa_code_object", _MODULE_APIS),
+    ("HSA_STATUS_ERROR_INVALID_EXECUTABLE", "HSA_STATUS_ERROR_INVALID_EXECUTABLE", "hsa_code_object", _MODULE_APIS),
+    ("HSA_STATUS_ERROR_FROZEN_EXECUTABLE", "HSA_STATUS_ERROR_FROZEN_EXECUTABLE", "hsa_code_object", _MODULE_APIS),
+    ("HSA_STATUS_ERROR_INVALID_SYMBOL_NAME", "HSA_STATUS_ERROR_INVALID_SYMBOL_NAME", "module", _MODULE_APIS),
+    ("HSA_STATUS_ERROR_VARIABLE_ALREADY_DEFINED", "HSA_STATUS_ERROR_VARIABLE_ALREADY_DEFINED", "module", _MODULE_APIS),
+    ("HSA_STATUS_ERROR_VARIABLE_UNDEFINED", "HSA_STATUS_ERROR_VARIABLE_UNDEFINED", "module", _MODULE_APIS),
+    ("HSA_STATUS_ERROR_EXCEPTION", "HSA_STATUS_ERROR_EXCEPTION", "launch_failure", _LAUNCH_APIS),
+    ("HSA_STATUS_ERROR_INVALID_CODE_SYMBOL", "HSA_STATUS_ERROR_INVALID_CODE_SYMBOL", "module", _MODULE_APIS),
+    ("HSA_STATUS_ERROR_INVALID_EXECUTABLE_SYMBOL", "HSA_STATUS_ERROR_INVALID_EXECUTABLE_SYMBOL", "module", _MODULE_APIS),
+    ("HSA_STATUS_ERROR_INVALID_FILE", "HSA_STATUS_ERROR_INVALID_FILE", "hsa_code_object", _MODULE_APIS),
+    ("HSA_STATUS_ERROR_INVALID_CODE_OBJECT_READER", "HSA_STATUS_ERROR_INVALID_CODE_OBJECT_READER", "hsa_code_object", _MODULE_APIS),
+    ("HSA_STATUS_ERROR_INVALID_CACHE", "HSA_STATUS_ERROR_INVALID_CACHE", "hsa_generic", _DEVICE_APIS),
+    ("HSA_STATUS_ERROR_INVALID_WAVEFRONT", "HSA_STATUS_ERROR_INVALID_WAVEFRONT", "hsa_generic", _LAUNCH_APIS),
+    ("HSA_STATUS_ERROR_INVALID_SIGNAL_GROUP", "HSA_STATUS_ERROR_INVALID_SIGNAL_GROUP", "invalid_handle", _EVENT_APIS),
+    ("HSA_STATUS_ERROR_INVALID_RUNTIME_STATE", "HSA_STATUS_ERROR_INVALID_RUNTIME_STATE", "not_initialized", ["hipInit"]),
+    ("HSA_STATUS_ERROR_FATAL", "HSA_STATUS_ERROR_FATAL", "hsa_generic", ["hipDeviceSynchronize"]),
+    ("HSA_STATUS_ERROR_MEMORY_APERTURE_VIOLATION", "HSA_STATUS_ERROR_MEMORY_APERTURE_VIOLATION", "hsa_memory", _MEMCPY_APIS + _LAUNCH_APIS),
+    ("HSA_STATUS_ERROR_MEMORY_FAULT", "HSA_STATUS_ERROR_MEMORY_FAULT", "hsa_memory", _MEMCPY_APIS + _LAUNCH_APIS),
+    ("HSA_STATUS_ERROR_ILLEGAL_INSTRUCTION", "HSA_STATUS_ERROR_ILLEGAL_INSTRUCTION", "hsa_illegal_instruction", _LAUNCH_APIS),
+    ("HSA_STATUS_ERROR_OUT_OF_REGISTERS", "HSA_STATUS_ERROR_OUT_OF_REGISTERS", "launch_resources", _LAUNCH_APIS),
+    ("HSA_STATUS_ERROR_INVALID_MEMORY_POOL", "HSA_STATUS_ERROR_INVALID_MEMORY_POOL", "out_of_memory", ["hipMallocFromPoolAsync"]),
+]
+
+# ROCr / amdgpu driver and kernel messages.
+_ROCM_RUNTIME_MESSAGES: List[_Signature] = [
+    ("Memory access fault by GPU node", "HSA_STATUS_ERROR_MEMORY_APERTURE_VIOLATION", "hsa_memory", _MEMCPY_APIS + _LAUNCH_APIS),
+    ("Page not present or supervisor privilege", "HSA_STATUS_ERROR_MEMORY_APERTURE_VIOLATION", "hsa_memory", _MEMCPY_APIS + _LAUNCH_APIS),
+    ("Write access to a read-only page", "HSA_STATUS_ERROR_MEMORY_APERTURE_VIOLATION", "hsa_memory", _MEMCPY_APIS + _LAUNCH_APIS),
+    ("Queue aborting with error", "HSA_STATUS_ERROR_EXCEPTION", "launch_failure", _LAUNCH_APIS),
+    ("hsa api call failure", "HSA_STATUS_ERROR", "hsa_generic", ["hipDeviceSynchronize"]),
+    ("Unable to open /dev/kfd", "hipErrorNoDevice", "no_device", _DEVICE_APIS),
+    ("Failed to open /dev/kfd", "hipErrorNoDevice", "no_device", _DEVICE_APIS),
+    ("hsa_init failed", "hipErrorNotInitialized", "not_initialized", ["hipInit"]),
+    ("GPU reset begin", "amdgpu_gpu_reset", "gpu_reset", ["hipDeviceSynchronize"]),
+    ("GPU reset succeeded", "amdgpu_gpu_reset", "gpu_reset", ["hipDeviceSynchronize"]),
+    ("GPU reset failed", "amdgpu_gpu_reset", "gpu_reset", ["hipDeviceSynchronize"]),
+    ("ring gfx timeout", "amdgpu_gpu_reset", "gpu_reset", ["hipDeviceSynchronize"]),
+    ("ring comp timeout", "amdgpu_gpu_reset", "gpu_reset", ["hipDeviceSynchronize"]),
+    ("amdgpu VM fault", "HSA_STATUS_ERROR_MEMORY_APERTURE_VIOLATION", "hsa_memory", _LAUNCH_APIS),
+    ("GPU fault detected", "HSA_STATUS_ERROR_MEMORY_APERTURE_VIOLATION", "hsa_memory", _LAUNCH_APIS),
+    ("retry page fault", "HSA_STATUS_ERROR_MEMORY_APERTURE_VIOLATION", "hsa_memory", _LAUNCH_APIS),
+    ("GPU core dump created", "HSA_STATUS_ERROR_EXCEPTION", "launch_failure", _LAUNCH_APIS),
+    ("Unsupported GPU architecture", "hipErrorNoBinaryForGpu", "no_binary", _LAUNCH_APIS),
+    ("No compatible code objects found", "hipErrorNoBinaryForGpu", "no_binary", _LAUNCH_APIS),
+    ("amdgpu: unsupported ASIC", "hipErrorInsufficientDriver", "driver", ["hipDriverGetVersion"]),
+]
+
+_ROCBLAS_STATUS = [
+    "rocblas_status_invalid_handle",
+    "rocblas_status_not_implemented",
+    "rocblas_status_invalid_pointer",
+    "rocblas_status_invalid_size",
+    "rocblas_status_memory_error",
+    "rocblas_status_internal_error",
+    "rocblas_status_perf_degraded",
+    "rocblas_status_size_query_mismatch",
+    "rocblas_status_size_increased",
+    "rocblas_status_size_unchanged",
+    "rocblas_status_invalid_value",
+    "rocblas_status_continue",
+    "rocblas_status_check_numerics_fail",
+    "rocblas_status_excluded_from_build",
+    "rocblas_status_arch_mismatch",
+]
+_HIPBLAS_STATUS = [
+    "HIPBLAS_STATUS_NOT_INITIALIZED",
+    "HIPBLAS_STATUS_ALLOC_FAILED",
+    "HIPBLAS_STATUS_INVALID_VALUE",
+    "HIPBLAS_STATUS_MAPPING_ERROR",
+    "HIPBLAS_STATUS_EXECUTION_FAILED",
+    "HIPBLAS_STATUS_INTERNAL_ERROR",
+    "HIPBLAS_STATUS_NOT_SUPPORTED",
+    "HIPBLAS_STATUS_ARCH_MISMATCH",
+    "HIPBLAS_STATUS_HANDLE_IS_NULLPTR",
+    "HIPBLAS_STATUS_INVALID_ENUM",
+    "HIPBLAS_STATUS_UNKNOWN",
+    "HIPBLASLT_STATUS_NOT_INITIALIZED",
+    "HIPBLASLT_STATUS_ALLOC_FAILED",
+    "HIPBLASLT_STATUS_INVALID_VALUE",
+    "HIPBLASLT_STATUS_EXECUTION_FAILED",
+    "HIPBLASLT_STATUS_INTERNAL_ERROR",
+    "HIPBLASLT_STATUS_NOT_SUPPORTED",
+]
+_ROCFFT_STATUS = [
+    "rocfft_status_failure",
+    "rocfft_status_invalid_arg_value",
+    "rocfft_status_invalid_dimensions",
+    "rocfft_status_invalid_array_type",
+    "rocfft_status_invalid_strides",
+    "rocfft_status_invalid_distance",
+    "rocfft_status_invalid_offset",
+    "rocfft_status_invalid_work_buffer",
+    "HIPFFT_INVALID_PLAN",
+    "HIPFFT_ALLOC_FAILED",
+    "HIPFFT_INVALID_TYPE",
+    "HIPFFT_INVALID_VALUE",
+    "HIPFFT_INTERNAL_ERROR",
+    "HIPFFT_EXEC_FAILED",
+    "HIPFFT_SETUP_FAILED",
+    "HIPFFT_INVALID_SIZE",
+    "HIPFFT_UNALIGNED_DATA",
+    "HIPFFT_INCOMPLETE_PARAMETER_LIST",
+    "HIPFFT_INVALID_DEVICE",
+    "HIPFFT_PARSE_ERROR",
+    "HIPFFT_NO_WORKSPACE",
+    "HIPFFT_NOT_IMPLEMENTED",
+    "HIPFFT_NOT_SUPPORTED",
+]
+_ROCRAND_STATUS = [
+    "ROCRAND_STATUS_VERSION_MISMATCH",
+    "ROCRAND_STATUS_NOT_CREATED",
+    "ROCRAND_STATUS_ALLOCATION_FAILED",
+    "ROCRAND_STATUS_TYPE_ERROR",
+    "ROCRAND_STATUS_OUT_OF_RANGE",
+    "ROCRAND_STATUS_LENGTH_NOT_MULTIPLE",
+    "ROCRAND_STATUS_DOUBLE_PRECISION_REQUIRED",
+    "ROCRAND_STATUS_LAUNCH_FAILURE",
+    "ROCRAND_STATUS_INTERNAL_ERROR",
+    "HIPRAND_STATUS_VERSION_MISMATCH",
+    "HIPRAND_STATUS_NOT_INITIALIZED",
+    "HIPRAND_STATUS_ALLOCATION_FAILED",
+    "HIPRAND_STATUS_TYPE_ERROR",
+    "HIPRAND_STATUS_OUT_OF_RANGE",
+    "HIPRAND_STATUS_LENGTH_NOT_MULTIPLE",
+    "HIPRAND_STATUS_DOUBLE_PRECISION_REQUIRED",
+    "HIPRAND_STATUS_LAUNCH_FAILURE",
+    "HIPRAND_STATUS_PREEXISTING_FAILURE",
+    "HIPRAND_STATUS_INITIALIZATION_FAILED",
+    "HIPRAND_STATUS_ARCH_MISMATCH",
+    "HIPRAND_STATUS_INTERNAL_ERROR",
+    "HIPRAND_STATUS_NOT_IMPLEMENTED",
+]
+_MIOPEN_STATUS = [
+    "miopenStatusNotInitialized",
+    "miopenStatusInvalidValue",
+    "miopenStatusBadParm",
+    "miopenStatusAllocFailed",
+    "miopenStatusInternalError",
+    "miopenStatusNotImplemented",
+    "miopenStatusUnknownError",
+    "miopenStatusUnsupportedOp",
+    "miopenStatusGpuOperationsSkipped",
+    "miopenStatusVersionMismatch",
+]
+_RCCL_STATUS = [
+    "ncclUnhandledCudaError",
+    "ncclSystemError",
+    "ncclInternalError",
+    "ncclInvalidArgument",
+    "ncclInvalidUsage",
+    "ncclRemoteError",
+    "ncclInProgress",
+]
+
+_LIBRARY_STATUS_CODES: List[_Signature] = (
+    [(code, code, "blas", ["rocblas_create_handle", "hipblasCreate"]) for code in _ROCBLAS_STATUS + _HIPBLAS_STATUS]
+    + [(code, code, "fft", ["rocfft_plan_create", "hipfftPlan1d"]) for code in _ROCFFT_STATUS]
+    + [(code, code, "rand", ["rocrand_create_generator", "hiprandCreateGenerator"]) for code in _ROCRAND_STATUS]
+    + [(code, code, "miopen", ["miopenCreate", "miopenFindConvolutionForwardAlgorithm"]) for code in _MIOPEN_STATUS]
+    + [(code, code, "rccl", ["ncclCommInitRank", "ncclAllReduce"]) for code in _RCCL_STATUS]
+)
+
+_LIBRARY_MESSAGES: List[_Signature] = [
+    ("rocBLAS error", "rocblas_status_internal_error", "blas", ["rocblas_create_handle"]),
+    ("hipBLAS error", "HIPBLAS_STATUS_INTERNAL_ERROR", "blas", ["hipblasCreate"]),
+    ("hipBLASLt error", "HIPBLASLT_STATUS_INTERNAL_ERROR", "blas", ["hipblasLtCreate"]),
+    ("Cannot read TensileLibrary", "rocblas_status_arch_mismatch", "blas", ["rocblas_create_handle"]),
+    ("MIOpen Error", "miopenStatusUnknownError", "miopen", ["miopenCreate"]),
+    ("MIOpen(HIP): Error", "miopenStatusUnknownError", "miopen", ["miopenCreate"]),
+    ("RCCL WARN", "ncclSystemError", "rccl", ["ncclCommInitRank"]),
+    ("NCCL error", "ncclSystemError", "rccl", ["ncclCommInitRank"]),
+]
+
+# PyTorch built against ROCm reports HIP failures through its own wrappers.
+_PYTORCH_MESSAGES: List[_Signature] = [
+    ("HIP error: an illegal memory access was encountered", "hipErrorIllegalAddress", "illegal_address", _MEMCPY_APIS + _LAUNCH_APIS),
+    ("HIP error: invalid device function", "hipErrorInvalidDeviceFunction", "invalid_device_function", _LAUNCH_APIS),
+    ("HIP error: invalid argument", "hipErrorInvalidValue", "invalid_value", _MEMCPY_APIS),
+    ("HIP error: out of memory", "hipErrorOutOfMemory", "torch_oom", _MALLOC_APIS),
+    ("HIP error: device-side assert triggered", "hipErrorAssert", "assert", _LAUNCH_APIS),
+    ("HIP error: unspecified launch failure", "hipErrorLaunchFailure", "launch_failure", _LAUNCH_APIS),
+    ("HIP error: no kernel image is available for execution on the device", "hipErrorNoBinaryForGpu", "no_binary", _LAUNCH_APIS),
+    ("HIP error: the launch timed out and was terminated", "hipErrorLaunchTimeOut", "launch_timeout", _LAUNCH_APIS),
+    ("HIP out of memory", "hipErrorOutOfMemory", "torch_oom", _MALLOC_APIS),
+    ("CUDA out of memory", "hipErrorOutOfMemory", "torch_oom", _MALLOC_APIS),
+    ("torch.OutOfMemoryError", "hipErrorOutOfMemory", "torch_oom", _MALLOC_APIS),
+    ("torch.cuda.OutOfMemoryError", "hipErrorOutOfMemory", "torch_oom", _MALLOC_APIS),
+    ("OutOfMemoryError", "hipErrorOutOfMemory", "torch_oom", _MALLOC_APIS),
+    ("Tried to allocate", "hipErrorOutOfMemory", "torch_oom", _MALLOC_APIS),
+    ("No HIP GPUs are available", "hipErrorNoDevice", "torch_device", _DEVICE_APIS),
+    ("No CUDA GPUs are available", "hipErrorNoDevice", "torch_device", _DEVICE_APIS),
+    ("Found no NVIDIA driver on your system", "hipErrorNoDevice", "torch_device", _DEVICE_APIS),
+    ("Torch not compiled with CUDA enabled", "hipErrorNoDevice", "torch_device", _DEVICE_APIS),
+    ("HIP kernel errors might be asynchronously reported", "hipErrorLaunchFailure", "launch_failure", _LAUNCH_APIS),
+    ("CUDA kernel errors might be asynchronously reported", "hipErrorLaunchFailure", "launch_failure", _LAUNCH_APIS),
+    ("Expected all tensors to be on the same device", "torch_device_mismatch", "torch_mixed_device", _MEMCPY_APIS),
+    ("c10::hip::HIPError", "hipErrorUnknown", "unknown", _LAUNCH_APIS),
+    ("HIPBLAS_STATUS_EXECUTION_FAILED when calling", "HIPBLAS_STATUS_EXECUTION_FAILED", "blas", ["hipblasCreate"]),
+    ("CUBLAS_STATUS_EXECUTION_FAILED when calling", "HIPBLAS_STATUS_EXECUTION_FAILED", "blas", ["hipblasCreate"]),
+    ("miopenStatusUnknownError when calling", "miopenStatusUnknownError", "miopen", ["miopenCreate"]),
+]
+
+_SYMPTOMS: List[_Signature] = [
+    ("segmentation fault", "segmentation_fault", "segfault", ["hipMemcpy"]),
+    ("SIGSEGV", "segmentation_fault", "segfault", ["hipMemcpy"]),
+    ("core dumped", "segmentation_fault", "segfault", ["hipMemcpy"]),
+    ("Aborted (core dumped)", "segmentation_fault", "segfault", ["hipMemcpy"]),
+    ("out of memory", "hipErrorOutOfMemory", "out_of_memory", _MALLOC_APIS),
+    ("illegal instruction", "HSA_STATUS_ERROR_ILLEGAL_INSTRUCTION", "hsa_illegal_instruction", _LAUNCH_APIS),
+    ("bus error", "segmentation_fault", "segfault", ["hipHostMalloc"]),
+    ("illegal", "hipErrorIllegalAddress", "illegal_address", _MEMCPY_APIS + _LAUNCH_APIS),
+]
+
+_SOURCES: List[Tuple[str, int, List[_Signature]]] = [
+    ("hip_runtime", PRIORITY_CODE, _HIP_ERROR_CODES),
+    ("hsa", PRIORITY_CODE, _HSA_STATUS_CODES),
+    ("rocm_library", PRIORITY_CODE, _LIBRARY_STATUS_CODES),
+    ("hip_runtime", PRIORITY_MESSAGE, _HIP_MESSAGES),
+    ("rocm_runtime", PRIORITY_MESSAGE, _ROCM_RUNTIME_MESSAGES),
+    ("rocm_library", PRIORITY_MESSAGE, _LIBRARY_MESSAGES),
+    ("pytorch_rocm", PRIORITY_MESSAGE, _PYTORCH_MESSAGES),
+    ("generic", PRIORITY_SYMPTOM, _SYMPTOMS),
+]
+
+
+def _build_index() -> Dict[str, Dict[str, object]]:
+    index: Dict[str, Dict[str, object]] = {}
+    for source, priority, signatures in _SOURCES:
+        for pattern, error_type, cause_key, apis in signatures:
+            key = " ".join(pattern.lower().split())
+            # The first definition wins so exact codes keep their priority.
+            index.setdefault(
+                key,
+                {
+                    "signature": pattern,
+                    "error_type": error_type,
+                    "source": source,
+                    "priority": priority,
+                    "typical_causes": TYPICAL_CAUSES[cause_key],
+                    "related_apis": apis,
+                },
+            )
+    return index
+
+
+SIGNATURES: Dict[str, Dict[str, object]] = _build_index()
+SIGNATURE_TRIE = LiteralTrie(SIGNATURES, ignore_case=True)
+
+
+def iter_signature_hits(text: str) -> Iterator[Tuple[str, int]]:
+    """Yield ``(signature_key, offset)`` for every signature occurrence in ``text``."""
+
+    return SIGNATURE_TRIE.finditer(text)
+
+
+def contains_signature(text: str) -> bool:
+    return SIGNATURE_TRIE.search(text)
+
+
+def match_error_signatures(text: str) -> List[Dict[str, object]]:
+    """Return distinct signatures found in ``text`` with occurrence counts."""
+
+    hits: Dict[str, Dict[str, object]] = {}
+    for key, offset in iter_signature_hits(text):
+        hit = hits.get(key)
+        if hit is None:
+            hits[key] = {**SIGNATURES[key], "count": 1, "first_offset": offset}
+        else:
+            hit["count"] += 1
+    return sorted(hits.values(), key=lambda hit: hit["first_offset"])
+
+
+def classify_error(text: str) -> Dict[str, object]:
+    """Pick the primary error type and aggregate causes and APIs for ``text``."""
+
+    matches = match_error_signatures(text)
+    if not matches:
+        return {
+            "error_type": "unknown",
+            "typical_causes": [],
+            "related_apis": [],
+            "matched_signatures": [],
+        }
+
+    primary = max(matches, key=lambda hit: (hit["priority"], -hit["first_offset"]))
+    causes: List[str] = list(primary["typical_causes"])
+    apis: List[str] = list(primary["related_apis"])
+    for hit in matches:
+        if hit["error_type"] != primary["error_type"]:
+            continue
+        causes.extend(cause for cause in hit["typical_causes"] if cause not in causes)
+        apis.extend(api for api in hit["related_apis"] if api not in apis)
+
+    return {
+        "error_type": primary["error_type"],
+        "typical_causes": causes,
+        "related_apis": apis,
+        "matched_signatures": [
+            {
+                "signature": hit["signature"],
+                "error_type": hit["error_type"],
+                "source": hit["source"],
+                "count": hit["count"],
+                "first_offset": hit["first_offset"],
+            }
+            for hit in matches
+        ],
+    }
@@ -0,0 +1,79 @@
+"""Routing feature extraction for the Master Agent.
+
+Rules and scoring used to lower-case, split and rescan each input
+separately. Here every feature either of them needs is computed once per
+input into a ``RoutingFeatures`` tuple, which both consume and which
+``/master/route_batch`` scores in bulk. Keyword features share one
+lower-cased copy and stop at their first hit. Line and token counts only
+scan as far as the thresholds that use them.
+"""
+from __future__ import annotations
+
+import itertools
+import re
+from typing import NamedTuple, Optional, Tuple
+
+CODE_KEYWORDS = ["__global__", "hipLaunchKernelGGL", "__device__", "threadIdx"]
+ERROR_KEYWORDS = ["hipError", "illegal", "stack trace", "segmentation"]
+HIPIFY_KEYWORDS = ["cudaMalloc", "cudaMemcpy", "<<<", "cudaError"]
+URL_PATTERN = re.compile(r"https?://[\w./-]+", re.IGNORECASE)
+LINE_BREAK_PATTERN = re.compile(r"\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+API_TOKEN_MAX_CHARS = 32
+
+_CODE_LITERALS = tuple(CODE_KEYWORDS)
+_ERROR_LITERALS = tuple(keyword.lower() for keyword in ERROR_KEYWORDS)
+_HIPIFY_LITERALS = tuple(keyword.lower() for keyword in HIPIFY_KEYWORDS)
+
+
+class RoutingFeatures(NamedTuple):
+    has_url: bool
+    code_keyword: bool
+    error_keyword: bool
+    hipify_keyword: bool
+    contains_hip_api: bool
+    contains_cuda_api: bool
+    contains_error: bool
+    has_stack_trace: bool
+    has_code_braces: bool
+    has_semicolon: bool
+    lines_count: int
+    single_token: Optional[str]
+
+
+def extract_features(text: str, url: Optional[str] = None) -> RoutingFeatures:
+    lowered = text.lower()
+    stripped = text.strip()
+    single_token = None
+    if 0 < len(stripped) <= API_TOKEN_MAX_CHARS and len(stripped.split()) == 1:
+        single_token = stripped
+
+    return RoutingFeatures(
+        has_url=bool(url) or URL_PATTERN.search(text) is not None,
+        code_keyword=_contains_any(text, _CODE_LITERALS),
+        error_keyword=_contains_any(lowered, _ERROR_LITERALS),
+        hipify_keyword=_contains_any(lowered, _HIPIFY_LITERALS),
+        contains_hip_api="hip" in lowered,
+        contains_cuda_api="cuda" in lowered,
+        contains_error="error" in lowered or "illegal" in lowered,
+        has_stack_trace="stack" in lowered or "line" in lowered,
+        has_code_braces="{" in text and "}" in text,
+        has_semicolon=";" in text,
+        lines_count=_count_lines(stripped, limit=6),
+        single_token=single_token,
+    )
+
+
+def _contains_any(haystack: str, literals: Tuple[str, ...]) -> bool:
+    for literal in literals:
+        if literal in haystack:
+            return True
+    return False
+
+
+def _count_lines(stripped: str, limit: int) -> int:
+    """``len(stripped.splitlines())``, counting no further than ``limit``."""
+
+    if not stripped:
+        return 0
+    breaks = LINE_BREAK_PATTERN.finditer(stripped)
+    return 1 + sum(1 for _ in itertools.islice(breaks, limit - 1))
@@ -0,0 +1,250 @@
+"""Static CUDA to HIP converter (Tools Layer #1).
+
+The translation unit is rewritten in a single left-to-right scan. One regex
+tokenizes comments, string literals, ``#include`` directives, kernel launches
+and identifiers; identifiers are resolved with an O(1) lookup in
+``hipify_table.CUDA_TO_HIP``. Comments and strings pass through untouched.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Tuple
+
+from .hipify_table import (
+    CATEGORY_HEADER,
+    CUDA_HEADERS,
+    CUDA_IDENTIFIER_PREFIXES,
+    CUDA_TO_HIP,
+    UNSUPPORTED_HEADERS,
+)
+
+MAX_REPORT_POSITIONS = 50
+MAX_LAUNCH_SPAN = 4000
+MAX_SEGMENT_LENGTH = 200
+
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+    |(?P<string>"(?:\\.|[^"\\\n])*"|(?:\b(?:u8|[uUL])|(?<!\w))'(?:\\.|[^'\\\n])*')
+    |(?P<include>\#[ \t]*include[ \t]*(?P<open>[<"])(?P<header>[^>"\n]+)[>"])
+    |(?P<launch>\b[A-Za-z_][\w:]*(?:<[^<>;()\n]*>)?\s*<<<)
+    |(?P<asm>\b(?:asm|__asm__)\b)
+    |(?P<ident>\b[A-Za-z_]\w*)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+IDENTIFIER_PATTERN = re.compile(r"\b[A-Za-z_]\w*")
+_INLINE_ASM_HINT = "PTX inline assembly must be rewritten for AMDGPU or replaced with HIP intrinsics"
+
+
+def hipify_source(code: str) -> Dict[str, object]:
+    """Convert CUDA source to HIP and report every mapping and leftover."""
+
+    pieces: List[str] = []
+    mappings: Dict[Tuple[str, str], Dict[str, object]] = {}
+    leftovers: Dict[str, Dict[str, object]] = {}
+    launches: List[Dict[str, object]] = []
+
+    copied = 0
+    counted = 0
+    line = 1
+    line_start = 0
+    for match in TOKEN_PATTERN.finditer(code):
+        start, end = match.span()
+        newlines = code.count("\n", counted, start)
+        if newlines:
+            line += newlines
+            line_start = code.rfind("\n", counted, start) + 1
+        counted = start
+        column = start - line_start + 1
+        kind = match.lastgroup
+
+        replacement = None
+        if kind == "ident":
+            name = match.group()
+            entry = CUDA_TO_HIP.get(name)
+            if entry is not None:
+                replacement = entry[0]
+                _record_mapping(mappings, name, entry[0], entry[1], line, column)
+            elif name.startswith(CUDA_IDENTIFIER_PREFIXES):
+                _record_leftover(leftovers, name, "unmapped_identifier", line, column, "")
+        elif kind == "include":
+            header = match.group("header").strip()
+            target = CUDA_HEADERS.get(header)
+            if target is not None:
+                close = ">" if match.group("open") == "<" else '"'
+                replacement = f"#include {match.group('open')}{target}{close}"
+                _record_mapping(mappings, header, target, CATEGORY_HEADER, line, column)
+            elif header in UNSUPPORTED_HEADERS:
+                _record_leftover(
+                    leftovers, header, "unsupported_header", line, column,
+                    UNSUPPORTED_HEADERS[header],
+                )
+        elif kind == "launch":
+            kernel = match.group("launch")[:-3].strip()
+            launches.append(describe_launch(code, kernel, start, end, line, column))
+        elif kind == "asm":
+            _record_leftover(leftovers, "asm", "inline_assembly", line, column, _INLINE_ASM_HINT)
+
+        if replacement is not None:
+            pieces.append(code[copied:start])
+            pieces.append(replacement)
+            copied = end
+    pieces.append(code[copied:])
+
+    segments = list(leftovers.values()) + launches
+    segments.sort(key=lambda item: (item["line"], item["column"]))
+    return {
+        "hipified_code": "".join(pieces),
+        "mapping_report": list(mappings.values()),
+        "unconverted_segments": segments,
+    }
+
+
+def translate_fragment(text: str) -> str:
+    """Map CUDA identifiers in a short fragment without reporting."""
+
+    return IDENTIFIER_PATTERN.sub(
+        lambda match: CUDA_TO_HIP.get(match.group(), (match.group(),))[0], text
+    )
+
+
+def _record_mapping(
+    mappings: Dict[Tuple[str, str], Dict[str, object]],
+    source: str,
+    target: str,
+    category: str,
+    line: int,
+    column: int,
+) -> None:
+    entry = mappings.get((source, target))
+    if entry is None:
+        entry = {"from": source, "to": target, "category": category, "count": 0, "positions": []}
+        mappings[(source, target)] = entry
+    entry["count"] += 1
+    if len(entry["positions"]) < MAX_REPORT_POSITIONS:
+        entry["positions"].append([line, column])
+
+
+def _record_leftover(
+    leftovers: Dict[str, Dict[str, object]],
+    segment: str,
+    kind: str,
+    line: int,
+    column: int,
+    suggestion: str,
+) -> None:
+    entry = leftovers.get(segment)
+    if entry is None:
+        leftovers[segment] = {
+            "segment": segment,
+            "kind": kind,
+            "line": line,
+            "column": column,
+            "count": 1,
+            "suggestion": suggestion,
+        }
+    else:
+        entry["count"] += 1
+
+
+def describe_launch(
+    code: str, kernel: str, segment_start: int, config_start: int, line: int, column: int
+) -> Dict[str, object]:
+    """Describe a ``kernel<<<...>>>(args)`` launch and suggest hipLaunchKernelGGL.
+
+    ``config_start`` is the offset just past ``<<<``.
+    """
+
+    config_end = code.find(">>>", config_start, config_start + MAX_LAUNCH_SPAN)
+    if config_end == -1:
+        return {
+            "segment": code[segment_start:config_start][:MAX_SEGMENT_LENGTH],
+            "kind": "kernel_launch",
+            "line": line,
+            "column": column,
+            "count": 1,
+            "kernel": kernel,
+            "suggestion": "unterminated <<< >>> launch configuration",
+        }
+
+    config = split_top_level(code[config_start:config_end])
+    grid, block, shared_mem, stream = (config + ["0", "0", "0", "0"])[:4]
+    grid = grid or "0"
+    block = block or "0"
+
+    args_text = ""
+    segment_end = config_end + 3
+    cursor = segment_end
+    while cursor < len(code) and code[cursor].isspace():
+        cursor += 1
+    if cursor < len(code) and code[cursor] == "(":
+        close = find_closing_paren(code, cursor)
+        if close != -1:
+            args_text = code[cursor + 1 : close]
+            segment_end = close + 1
+
+    kernel_name = f"HIP_KERNEL_NAME({kernel})" if "<" in kernel else kernel
+    call_args = [
+        kernel_name,
+        _as_dim3(translate_fragment(grid)),
+        _as_dim3(translate_fragment(block)),
+        translate_fragment(shared_mem),
+        translate_fragment(stream),
+    ]
+    args = [translate_fragment(arg) for arg in split_top_level(args_text) if arg]
+    return {
+        "segment": code[segment_start:segment_end][:MAX_SEGMENT_LENGTH],
+        "kind": "kernel_launch",
+        "line": line,
+        "column": column,
+        "count": 1,
+        "kernel": kernel,
+        "launch_config": {
+            "grid": grid,
+            "block": block,
+            "shared_mem": shared_mem,
+            "stream": stream,
+        },
+        "suggestion": f"hipLaunchKernelGGL({', '.join(call_args + args)});",
+    }
+
+
+def _as_dim3(expression: str) -> str:
+    return expression if expression.startswith("dim3") else f"dim3({expression})"
+
+
+def split_top_level(text: str) -> List[str]:
+    """Split on commas that are not nested inside brackets."""
+
+    parts: List[str] = []
+    depth = 0
+    current = 0
+    for index, char in enumerate(text):
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(" ".join(text[current:index].split()))
+            current = index + 1
+    tail = " ".join(text[current:].split())
+    if tail or parts:
+        parts.append(tail)
+    return parts
+
+
+def find_closing_paren(code: str, open_index: int) -> int:
+    """Return the index of the ``)`` matching ``code[open_index]`` or -1."""
+
+    depth = 0
+    limit = min(len(code), open_index + MAX_LAUNCH_SPAN)
+    for index in range(open_index, limit):
+        char = code[index]
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return index
+    return -1
@@ -0,0 +1,534 @@
+"""CUDA to HIP mapping table used by the static HIPify converter.
+
+Most CUDA names map to HIP by swapping the library prefix (``cudaMalloc`` ->
+``hipMalloc``, ``CUBLAS_OP_N`` -> ``HIPBLAS_OP_N``); those are listed once
+and expanded with ``_prefixed``. Names whose HIP spelling differs are listed
+explicitly in the ``*_IRREGULAR`` tables.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Tuple
+
+CATEGORY_RUNTIME = "runtime_api"
+CATEGORY_TYPE = "type"
+CATEGORY_ENUM = "enum"
+CATEGORY_DRIVER = "driver_api"
+CATEGORY_COMPLEX = "complex"
+CATEGORY_CUBLAS = "cublas"
+CATEGORY_CURAND = "curand"
+CATEGORY_CUFFT = "cufft"
+CATEGORY_CUSPARSE = "cusparse"
+CATEGORY_HEADER = "header"
+
+_RUNTIME_API = [
+    # Device management
+    "cudaChooseDevice", "cudaDeviceGetAttribute", "cudaDeviceGetByPCIBusId",
+    "cudaDeviceGetCacheConfig", "cudaDeviceGetLimit", "cudaDeviceGetPCIBusId",
+    "cudaDeviceGetSharedMemConfig", "cudaDeviceGetStreamPriorityRange",
+    "cudaDeviceReset", "cudaDeviceSetCacheConfig", "cudaDeviceSetLimit",
+    "cudaDeviceSetSharedMemConfig", "cudaDeviceSynchronize", "cudaGetDevice",
+    "cudaGetDeviceCount", "cudaGetDeviceFlags", "cudaGetDeviceProperties",
+    "cudaSetDevice", "cudaSetDeviceFlags", "cudaDeviceGetP2PAttribute",
+    "cudaDeviceCanAccessPeer", "cudaDeviceEnablePeerAccess",
+    "cudaDeviceDisablePeerAccess", "cudaIpcGetMemHandle", "cudaIpcOpenMemHandle",
+    "cudaIpcCloseMemHandle", "cudaIpcGetEventHandle", "cudaIpcOpenEventHandle",
+    "cudaDeviceGetDefaultMemPool", "cudaDeviceGetMemPool", "cudaDeviceSetMemPool",
+    # Error handling
+    "cudaGetErrorName", "cudaGetErrorString", "cudaGetLastError",
+    "cudaPeekAtLastError",
+    # Streams
+    "cudaStreamCreate", "cudaStreamCreateWithFlags", "cudaStreamCreateWithPriority",
+    "cudaStreamDestroy", "cudaStreamQuery", "cudaStreamSynchronize",
+    "cudaStreamWaitEvent", "cudaStreamAddCallback", "cudaStreamGetFlags",
+    "cudaStreamGetPriority", "cudaStreamAttachMemAsync", "cudaStreamBeginCapture",
+    "cudaStreamEndCapture", "cudaStreamIsCapturing", "cudaStreamGetCaptureInfo",
+    "cudaLaunchHostFunc",
+    # Events
+    "cudaEventCreate", "cudaEventCreateWithFlags", "cudaEventDestroy",
+    "cudaEventElapsedTime", "cudaEventQuery", "cudaEventRecord",
+    "cudaEventSynchronize",
+    # Execution control
+    "cudaFuncGetAttributes", "cudaFuncSetCacheConfig", "cudaFuncSetSharedMemConfig",
+    "cudaFuncSetAttribute", "cudaLaunchKernel", "cudaLaunchCooperativeKernel",
+    "cudaLaunchCooperativeKernelMultiDevice",
+    "cudaOccupancyMaxActiveBlocksPerMultiprocessor",
+    "cudaOccupancyMaxActiveBlocksPerMultiprocessorWithFlags",
+    "cudaOccupancyMaxPotentialBlockSize", "cudaOccupancyMaxPotentialBlockSizeWithFlags",
+    # Memory management
+    "cudaFree", "cudaFreeArray", "cudaFreeAsync", "cudaHostAlloc",
+    "cudaHostGetDevicePointer", "cudaHostGetFlags", "cudaHostRegister",
+    "cudaHostUnregister", "cudaMalloc", "cudaMalloc3D", "cudaMalloc3DArray",
+    "cudaMallocArray", "cudaMallocAsync", "cudaMallocManaged", "cudaMallocPitch",
+    "cudaMemAdvise", "cudaMemGetInfo", "cudaMemPrefetchAsync", "cudaMemcpy",
+    "cudaMemcpy2D", "cudaMemcpy2DAsync", "cudaMemcpy2DToArray",
+    "cudaMemcpy2DFromArray", "cudaMemcpy3D", "cudaMemcpy3DAsync", "cudaMemcpyAsync",
+    "cudaMemcpyFromSymbol", "cudaMemcpyFromSymbolAsync", "cudaMemcpyPeer",
+    "cudaMemcpyPeerAsync", "cudaMemcpyToArray", "cudaMemcpyToSymbol",
+    "cudaMemcpyToSymbolAsync", "cudaMemset", "cudaMemset2D", "cudaMemset2DAsync",
+    "cudaMemset3D", "cudaMemset3DAsync", "cudaMemsetAsync", "cudaGetSymbolAddress",
+    "cudaGetSymbolSize", "cudaPointerGetAttributes", "cudaMemPoolCreate",
+    "cudaMemPoolDestroy", "cudaMemPoolTrimTo", "cudaMemPoolSetAttribute",
+    "cudaMemPoolGetAttribute", "cudaMallocFromPoolAsync", "cudaArrayGetInfo",
+    # Textures and surfaces
+    "cudaCreateChannelDesc", "cudaCreateTextureObject", "cudaDestroyTextureObject",
+    "cudaCreateSurfaceObject", "cudaDestroySurfaceObject",
+    "cudaGetTextureObjectResourceDesc",
+    # Versioning and profiling
+    "cudaDriverGetVersion", "cudaRuntimeGetVersion", "cudaProfilerStart",
+    "cudaProfilerStop",
+    # Graphs
+    "cudaGraphCreate", "cudaGraphDestroy", "cudaGraphInstantiate", "cudaGraphLaunch",
+    "cudaGraphExecDestroy", "cudaGraphAddKernelNode", "cudaGraphAddMemcpyNode",
+    "cudaGraphAddMemsetNode", "cudaGraphAddDependencies", "cudaGraphExecUpdate",
+    "cudaGraphGetNodes",
+]
+
+_RUNTIME_TYPES = [
+    "cudaError_t", "cudaStream_t", "cudaEvent_t", "cudaArray_t", "cudaGraph_t",
+    "cudaGraphExec_t", "cudaGraphNode_t", "cudaMemPool_t", "cudaTextureObject_t",
+    "cudaSurfaceObject_t", "cudaIpcMemHandle_t", "cudaIpcEventHandle_t",
+    "cudaPointerAttributes", "cudaFuncAttributes", "cudaChannelFormatDesc",
+    "cudaExtent", "cudaPitchedPtr", "cudaPos", "cudaMemcpy3DParms",
+    "cudaResourceDesc", "cudaTextureDesc", "cudaKernelNodeParams", "cudaLaunchParams",
+    "cudaStreamCallback_t", "cudaHostFn_t", "cudaMemcpyKind", "cudaLimit",
+    "cudaFuncCache", "cudaSharedMemConfig", "cudaMemoryAdvise",
+    "cudaStreamCaptureMode", "cudaStreamCaptureStatus", "cudaGraphExecUpdateResult",
+    "cudaArray", "cudaMemoryType", "cudaChannelFormatKind", "cudaResourceType",
+    "cudaTextureAddressMode", "cudaTextureFilterMode", "cudaTextureReadMode",
+    "cudaMemPoolAttr",
+]
+
+_RUNTIME_ENUMS = [
+    "cudaSuccess", "cudaErrorInvalidValue", "cudaErrorLaunchFailure",
+    "cudaErrorInvalidDevice", "cudaErrorInvalidDevicePointer",
+    "cudaErrorInvalidMemcpyDirection", "cudaErrorNoDevice", "cudaErrorNotReady",
+    "cudaErrorIllegalAddress", "cudaErrorLaunchOutOfResources",
+    "cudaErrorInvalidConfiguration", "cudaErrorInvalidDeviceFunction",
+    "cudaErrorPeerAccessAlreadyEnabled", "cudaErrorPeerAccessNotEnabled",
+    "cudaErrorNotSupported", "cudaErrorUnknown", "cudaErrorInvalidSymbol",
+    "cudaErrorAssert", "cudaErrorInsufficientDriver", "cudaErrorMissingConfiguration",
+    "cudaErrorPriorLaunchFailure", "cudaErrorInvalidPitchValue",
+    "cudaErrorHostMemoryAlreadyRegistered", "cudaErrorHostMemoryNotRegistered",
+    "cudaErrorStreamCaptureUnsupported", "cudaErrorStreamCaptureInvalidated",
+    "cudaErrorCooperativeLaunchTooLarge", "cudaErrorInvalidKernelImage",
+    "cudaErrorNotInitialized", "cudaErrorProfilerDisabled",
+    "cudaMemcpyHostToDevice", "cudaMemcpyDeviceToHost", "cudaMemcpyDeviceToDevice",
+    "cudaMemcpyHostToHost", "cudaMemcpyDefault", "cudaStreamDefault",
+    "cudaStreamNonBlocking", "cudaStreamPerThread", "cudaEventDefault",
+    "cudaEventBlockingSync", "cudaEventDisableTiming", "cudaEventInterprocess",
+    "cudaHostRegisterDefault", "cudaHostRegisterPortable", "cudaHostRegisterMapped",
+    "cudaDeviceScheduleAuto", "cudaDeviceScheduleSpin", "cudaDeviceScheduleYield",
+    "cudaDeviceScheduleBlockingSync", "cudaDeviceMapHost", "cudaDeviceLmemResizeToMax",
+    "cudaFuncCachePreferNone", "cudaFuncCachePreferShared", "cudaFuncCachePreferL1",
+    "cudaFuncCachePreferEqual", "cudaLimitStackSize", "cudaLimitPrintfFifoSize",
+    "cudaLimitMallocHeapSize", "cudaMemAttachGlobal", "cudaMemAttachHost",
+    "cudaMemAttachSingle", "cudaMemAdviseSetReadMostly", "cudaMemAdviseUnsetReadMostly",
+    "cudaMemAdviseSetPreferredLocation", "cudaMemAdviseUnsetPreferredLocation",
+    "cudaMemAdviseSetAccessedBy", "cudaMemAdviseUnsetAccessedBy", "cudaCpuDeviceId",
+    "cudaReadModeElementType", "cudaReadModeNormalizedFloat", "cudaAddressModeWrap",
+    "cudaAddressModeClamp", "cudaAddressModeMirror", "cudaAddressModeBorder",
+    "cudaFilterModePoint", "cudaFilterModeLinear", "cudaResourceTypeArray",
+    "cudaResourceTypeLinear", "cudaResourceTypePitch2D", "cudaChannelFormatKindSigned",
+    "cudaChannelFormatKindUnsigned", "cudaChannelFormatKindFloat",
+    "cudaStreamCaptureModeGlobal", "cudaStreamCaptureModeThreadLocal",
+    "cudaStreamCaptureModeRelaxed", "cudaGraphExecUpdateSuccess",
+    "cudaMemoryTypeHost", "cudaMemoryTypeDevice", "cudaMemoryTypeManaged",
+    "cudaSharedMemBankSizeDefault", "cudaSharedMemBankSizeFourByte",
+    "cudaSharedMemBankSizeEightByte", "cudaFuncAttributeMaxDynamicSharedMemorySize",
+    "cudaOccupancyDefault",
+]
+
+_DEVICE_ATTRIBUTES = [
+    "MaxThreadsPerBlock", "MaxBlockDimX", "MaxBlockDimY", "MaxBlockDimZ",
+    "MaxGridDimX", "MaxGridDimY", "MaxGridDimZ", "MaxSharedMemoryPerBlock",
+    "TotalConstantMemory", "WarpSize", "MaxRegistersPerBlock", "ClockRate",
+    "MultiProcessorCount", "ComputeCapabilityMajor", "ComputeCapabilityMinor",
+    "MaxThreadsPerMultiProcessor", "MemoryClockRate", "GlobalMemoryBusWidth",
+    "L2CacheSize", "ConcurrentKernels", "EccEnabled", "PciBusId", "PciDeviceId",
+    "IntegratedGpu", "CooperativeLaunch", "ManagedMemory",
+    "MaxSharedMemoryPerMultiprocessor", "ConcurrentManagedAccess",
+]
+
+_RUNTIME_IRREGULAR: Dict[str, str] = {
+    "cudaMallocHost": "hipHostMalloc",
+    "cudaFreeHost": "hipHostFree",
+    "cudaThreadSynchronize": "hipDeviceSynchronize",
+    "cudaThreadExit": "hipDeviceReset",
+    "cudaDeviceProp": "hipDeviceProp_t",
+    "cudaError": "hipError_t",
+    "cudaDeviceAttr": "hipDeviceAttribute_t",
+    "cudaDataType": "hipDataType",
+    "cudaDataType_t": "hipDataType",
+    "cudaErrorMemoryAllocation": "hipErrorOutOfMemory",
+    "cudaErrorInitializationError": "hipErrorNotInitialized",
+    "cudaErrorLaunchTimeout": "hipErrorLaunchTimeOut",
+    "cudaErrorInvalidResourceHandle": "hipErrorInvalidHandle",
+    "cudaErrorNoKernelImageForDevice": "hipErrorNoBinaryForGpu",
+    "cudaErrorCudartUnloading": "hipErrorDeinitialized",
+    "cudaHostAllocDefault": "hipHostMallocDefault",
+    "cudaHostAllocPortable": "hipHostMallocPortable",
+    "cudaHostAllocMapped": "hipHostMallocMapped",
+    "cudaHostAllocWriteCombined": "hipHostMallocWriteCombined",
+}
+
+_DATA_TYPES = [
+    "CUDA_R_16F", "CUDA_C_16F", "CUDA_R_16BF", "CUDA_C_16BF", "CUDA_R_32F",
+    "CUDA_C_32F", "CUDA_R_64F", "CUDA_C_64F", "CUDA_R_8I", "CUDA_C_8I",
+    "CUDA_R_8U", "CUDA_C_8U", "CUDA_R_32I", "CUDA_C_32I",
+]
+
+_DRIVER_IRREGULAR: Dict[str, str] = {
+    "cuInit": "hipInit",
+    "cuDriverGetVersion": "hipDriverGetVersion",
+    "cuDeviceGet": "hipDeviceGet",
+    "cuDeviceGetCount": "hipGetDeviceCount",
+    "cuDeviceGetName": "hipDeviceGetName",
+    "cuDeviceGetAttribute": "hipDeviceGetAttribute",
+    "cuDeviceTotalMem": "hipDeviceTotalMem",
+    "cuDeviceComputeCapability": "hipDeviceComputeCapability",
+    "cuDevicePrimaryCtxRetain": "hipDevicePrimaryCtxRetain",
+    "cuDevicePrimaryCtxRelease": "hipDevicePrimaryCtxRelease",
+    "cuCtxCreate": "hipCtxCreate",
+    "cuCtxDestroy": "hipCtxDestroy",
+    "cuCtxGetCurrent": "hipCtxGetCurrent",
+    "cuCtxSetCurrent": "hipCtxSetCurrent",
+    "cuCtxPushCurrent": "hipCtxPushCurrent",
+    "cuCtxPopCurrent": "hipCtxPopCurrent",
+    "cuCtxSynchronize": "hipCtxSynchronize",
+    "cuModuleLoad": "hipModuleLoad",
+    "cuModuleLoadData": "hipModuleLoadData",
+    "cuModuleLoadDataEx": "hipModuleLoadDataEx",
+    "cuModuleUnload": "hipModuleUnload",
+    "cuModuleGetFunction": "hipModuleGetFunction",
+    "cuModuleGetGlobal": "hipModuleGetGlobal",
+    "cuLaunchKernel": "hipModuleLaunchKernel",
+    "cuMemAlloc": "hipMalloc",
+    "cuMemFree": "hipFree",
+    "cuMemAllocHost": "hipHostMalloc",
+    "cuMemFreeHost": "hipHostFree",
+    "cuMemGetInfo": "hipMemGetInfo",
+    "cuMemcpyHtoD": "hipMemcpyHtoD",
+    "cuMemcpyDtoH": "hipMemcpyDtoH",
+    "cuMemcpyDtoD": "hipMemcpyDtoD",
+    "cuMemcpyHtoDAsync": "hipMemcpyHtoDAsync",
+    "cuMemcpyDtoHAsync": "hipMemcpyDtoHAsync",
+    "cuMemcpyDtoDAsync": "hipMemcpyDtoDAsync",
+    "cuMemsetD8": "hipMemsetD8",
+    "cuMemsetD16": "hipMemsetD16",
+    "cuMemsetD32": "hipMemsetD32",
+    "cuStreamCreate": "hipStreamCreateWithFlags",
+    "cuStreamDestroy": "hipStreamDestroy",
+    "cuStreamSynchronize": "hipStreamSynchronize",
+    "cuStreamQuery": "hipStreamQuery",
+    "cuEventCreate": "hipEventCreateWithFlags",
+    "cuEventRecord": "hipEventRecord",
+    "cuEventSynchronize": "hipEventSynchronize",
+    "cuEventElapsedTime": "hipEventElapsedTime",
+    "cuEventDestroy": "hipEventDestroy",
+    "cuGetErrorString": "hipDrvGetErrorString",
+    "cuGetErrorName": "hipDrvGetErrorName",
+    "CUresult": "hipError_t",
+    "CUdevice": "hipDevice_t",
+    "CUcontext": "hipCtx_t",
+    "CUmodule": "hipModule_t",
+    "CUfunction": "hipFunction_t",
+    "CUdeviceptr": "hipDeviceptr_t",
+    "CUstream": "hipStream_t",
+    "CUevent": "hipEvent_t",
+    "CUDA_SUCCESS": "hipSuccess",
+    "CUDA_ERROR_INVALID_VALUE": "hipErrorInvalidValue",
+    "CUDA_ERROR_OUT_OF_MEMORY": "hipErrorOutOfMemory",
+    "CUDA_ERROR_NOT_INITIALIZED": "hipErrorNotInitialized",
+    "CUDA_ERROR_DEINITIALIZED": "hipErrorDeinitialized",
+    "CUDA_ERROR_NO_DEVICE": "hipErrorNoDevice",
+    "CUDA_ERROR_INVALID_DEVICE": "hipErrorInvalidDevice",
+    "CUDA_ERROR_INVALID_CONTEXT": "hipErrorInvalidContext",
+    "CUDA_ERROR_INVALID_HANDLE": "hipErrorInvalidHandle",
+    "CUDA_ERROR_NOT_FOUND": "hipErrorNotFound",
+    "CUDA_ERROR_NOT_READY": "hipErrorNotReady",
+    "CUDA_ERROR_ILLEGAL_ADDRESS": "hipErrorIllegalAddress",
+    "CUDA_ERROR_LAUNCH_FAILED": "hipErrorLaunchFailure",
+    "CUDA_ERROR_LAUNCH_OUT_OF_RESOURCES": "hipErrorLaunchOutOfResources",
+    "CUDA_ERROR_LAUNCH_TIMEOUT": "hipErrorLaunchTimeOut",
+    "CUDA_ERROR_FILE_NOT_FOUND": "hipErrorFileNotFound",
+    "CUDA_ERROR_NO_BINARY_FOR_GPU": "hipErrorNoBinaryForGpu",
+    "CU_STREAM_DEFAULT": "hipStreamDefault",
+    "CU_STREAM_NON_BLOCKING": "hipStreamNonBlocking",
+    "CU_EVENT_DEFAULT": "hipEventDefault",
+    "CU_EVENT_BLOCKING_SYNC": "hipEventBlockingSync",
+    "CU_EVENT_DISABLE_TIMING": "hipEventDisableTiming",
+    "CU_CTX_SCHED_AUTO": "hipDeviceScheduleAuto",
+    "CU_CTX_SCHED_SPIN": "hipDeviceScheduleSpin",
+    "CU_CTX_SCHED_YIELD": "hipDeviceScheduleYield",
+    "CU_CTX_SCHED_BLOCKING_SYNC": "hipDeviceScheduleBlockingSync",
+    "CU_CTX_MAP_HOST": "hipDeviceMapHost",
+    "CU_DEVICE_ATTRIBUTE_MAX_THREADS_PER_BLOCK": "hipDeviceAttributeMaxThreadsPerBlock",
+    "CU_DEVICE_ATTRIBUTE_MAX_SHARED_MEMORY_PER_BLOCK": "hipDeviceAttributeMaxSharedMemoryPerBlock",
+    "CU_DEVICE_ATTRIBUTE_WARP_SIZE": "hipDeviceAttributeWarpSize",
+    "CU_DEVICE_ATTRIBUTE_MULTIPROCESSOR_COUNT": "hipDeviceAttributeMultiprocessorCount",
+    "CU_DEVICE_ATTRIBUTE_COMPUTE_CAPABILITY_MAJOR": "hipDeviceAttributeComputeCapabilityMajor",
+    "CU_DEVICE_ATTRIBUTE_COMPUTE_CAPABILITY_MINOR": "hipDeviceAttributeComputeCapabilityMinor",
+    "CU_DEVICE_ATTRIBUTE_CLOCK_RATE": "hipDeviceAttributeClockRate",
+}
+
+_COMPLEX_IRREGULAR: Dict[str, str] = {
+    "cuComplex": "hipComplex",
+    "cuFloatComplex": "hipFloatComplex",
+    "cuDoubleComplex": "hipDoubleComplex",
+    "make_cuComplex": "make_hipComplex",
+    "make_cuFloatComplex": "make_hipFloatComplex",
+    "make_cuDoubleComplex": "make_hipDoubleComplex",
+    "cuCrealf": "hipCrealf",
+    "cuCimagf": "hipCimagf",
+    "cuCreal": "hipCreal",
+    "cuCimag": "hipCimag",
+    "cuCaddf": "hipCaddf",
+    "cuCadd": "hipCadd",
+    "cuCsubf": "hipCsubf",
+    "cuCsub": "hipCsub",
+    "cuCmulf": "hipCmulf",
+    "cuCmul": "hipCmul",
+    "cuCdivf": "hipCdivf",
+    "cuCdiv": "hipCdiv",
+    "cuCabsf": "hipCabsf",
+    "cuCabs": "hipCabs",
+    "cuConjf": "hipConjf",
+    "cuConj": "hipConj",
+}
+
+_CUBLAS_API = [
+    "cublasCreate", "cublasDestroy", "cublasSetStream", "cublasGetStream",
+    "cublasSetPointerMode", "cublasGetPointerMode", "cublasSetMathMode",
+    "cublasGetMathMode", "cublasSetVector", "cublasGetVector", "cublasSetMatrix",
+    "cublasGetMatrix", "cublasSetVectorAsync", "cublasGetVectorAsync",
+    "cublasSetMatrixAsync", "cublasGetMatrixAsync", "cublasSgemm", "cublasDgemm",
+    "cublasCgemm", "cublasZgemm", "cublasHgemm", "cublasSgemmBatched",
+    "cublasDgemmBatched", "cublasCgemmBatched", "cublasZgemmBatched",
+    "cublasHgemmBatched", "cublasSgemmStridedBatched", "cublasDgemmStridedBatched",
+    "cublasCgemmStridedBatched", "cublasZgemmStridedBatched",
+    "cublasHgemmStridedBatched", "cublasGemmEx", "cublasGemmBatchedEx",
+    "cublasGemmStridedBatchedEx", "cublasSgemv", "cublasDgemv", "cublasCgemv",
+    "cublasZgemv", "cublasSgemvBatched", "cublasSger", "cublasDger",
+    "cublasSsymv", "cublasDsymv", "cublasSsyrk", "cublasDsyrk", "cublasStrsm",
+    "cublasDtrsm", "cublasStrsv", "cublasDtrsv", "cublasStrmm", "cublasDtrmm",
+    "cublasSgeam", "cublasDgeam", "cublasSdgmm", "cublasDdgmm", "cublasSaxpy",
+    "cublasDaxpy", "cublasCaxpy", "cublasZaxpy", "cublasSdot", "cublasDdot",
+    "cublasCdotu", "cublasCdotc", "cublasSnrm2", "cublasDnrm2", "cublasSscal",
+    "cublasDscal", "cublasCscal", "cublasZscal", "cublasScopy", "cublasDcopy",
+    "cublasSswap", "cublasDswap", "cublasIsamax", "cublasIdamax", "cublasIsamin",
+    "cublasIdamin", "cublasSasum", "cublasDasum", "cublasSrot", "cublasDrot",
+    "cublasSgetrfBatched", "cublasDgetrfBatched", "cublasSgetrsBatched",
+    "cublasDgetrsBatched", "cublasSgeqrfBatched", "cublasDgeqrfBatched",
+    "cublasAxpyEx", "cublasDotEx", "cublasNrm2Ex", "cublasScalEx",
+]
+
+_CUBLAS_TYPES = [
+    "cublasHandle_t", "cublasStatus_t", "cublasOperation_t", "cublasPointerMode_t",
+    "cublasFillMode_t", "cublasDiagType_t", "cublasSideMode_t", "cublasGemmAlgo_t",
+    "cublasComputeType_t", "cublasAtomicsMode_t",
+]
+
+_CUBLAS_ENUMS = [
+    "CUBLAS_STATUS_SUCCESS", "CUBLAS_STATUS_NOT_INITIALIZED",
+    "CUBLAS_STATUS_ALLOC_FAILED", "CUBLAS_STATUS_INVALID_VALUE",
+    "CUBLAS_STATUS_ARCH_MISMATCH", "CUBLAS_STATUS_MAPPING_ERROR",
+    "CUBLAS_STATUS_EXECUTION_FAILED", "CUBLAS_STATUS_INTERNAL_ERROR",
+    "CUBLAS_STATUS_NOT_SUPPORTED", "CUBLAS_OP_N", "CUBLAS_OP_T", "CUBLAS_OP_C",
+    "CUBLAS_POINTER_MODE_HOST", "CUBLAS_POINTER_MODE_DEVICE",
+    "CUBLAS_FILL_MODE_UPPER", "CUBLAS_FILL_MODE_LOWER", "CUBLAS_FILL_MODE_FULL",
+    "CUBLAS_DIAG_UNIT", "CUBLAS_DIAG_NON_UNIT", "CUBLAS_SIDE_LEFT",
+    "CUBLAS_SIDE_RIGHT", "CUBLAS_GEMM_DEFAULT", "CUBLAS_COMPUTE_16F",
+    "CUBLAS_COMPUTE_32F", "CUBLAS_COMPUTE_32F_FAST_16F", "CUBLAS_COMPUTE_32F_FAST_TF32",
+    "CUBLAS_COMPUTE_64F", "CUBLAS_COMPUTE_32I", "CUBLAS_ATOMICS_NOT_ALLOWED",
+    "CUBLAS_ATOMICS_ALLOWED",
+]
+
+_CUBLAS_IRREGULAR: Dict[str, str] = {
+    "CUBLAS_GEMM_DEFAULT_TENSOR_OP": "HIPBLAS_GEMM_DEFAULT",
+    "CUBLAS_GEMM_DFALT": "HIPBLAS_GEMM_DEFAULT",
+}
+
+_CURAND_API = [
+    "curandCreateGenerator", "curandCreateGeneratorHost", "curandDestroyGenerator",
+    "curandSetPseudoRandomGeneratorSeed", "curandSetGeneratorOffset",
+    "curandSetQuasiRandomGeneratorDimensions", "curandSetStream", "curandGenerate",
+    "curandGenerateUniform", "curandGenerateUniformDouble", "curandGenerateNormal",
+    "curandGenerateNormalDouble", "curandGenerateLogNormal",
+    "curandGenerateLogNormalDouble", "curandGeneratePoisson",
+    "curandGenerateSeeds", "curandGetVersion",
+]
+
+_CURAND_DEVICE = [
+    "curand_init", "curand", "curand_uniform", "curand_uniform_double",
+    "curand_uniform2_double", "curand_uniform4", "curand_normal",
+    "curand_normal_double", "curand_normal2", "curand_normal2_double",
+    "curand_normal4", "curand_log_normal", "curand_log_normal_double",
+    "curand_poisson", "curand_discrete",
+]
+
+_CURAND_TYPES = [
+    "curandGenerator_t", "curandStatus_t", "curandStatus", "curandRngType_t",
+    "curandState", "curandState_t", "curandStateXORWOW", "curandStateXORWOW_t",
+    "curandStatePhilox4_32_10", "curandStatePhilox4_32_10_t", "curandStateMRG32k3a",
+    "curandStateMRG32k3a_t", "curandStateSobol32_t", "curandDiscreteDistribution_t",
+]
+
+_CURAND_ENUMS = [
+    "CURAND_STATUS_SUCCESS", "CURAND_STATUS_VERSION_MISMATCH",
+    "CURAND_STATUS_NOT_INITIALIZED", "CURAND_STATUS_ALLOCATION_FAILED",
+    "CURAND_STATUS_TYPE_ERROR", "CURAND_STATUS_OUT_OF_RANGE",
+    "CURAND_STATUS_LENGTH_NOT_MULTIPLE", "CURAND_STATUS_DOUBLE_PRECISION_REQUIRED",
+    "CURAND_STATUS_LAUNCH_FAILURE", "CURAND_STATUS_PREEXISTING_FAILURE",
+    "CURAND_STATUS_INITIALIZATION_FAILED", "CURAND_STATUS_ARCH_MISMATCH",
+    "CURAND_STATUS_INTERNAL_ERROR", "CURAND_RNG_PSEUDO_DEFAULT",
+    "CURAND_RNG_PSEUDO_XORWOW", "CURAND_RNG_PSEUDO_MRG32K3A",
+    "CURAND_RNG_PSEUDO_MTGP32", "CURAND_RNG_PSEUDO_MT19937",
+    "CURAND_RNG_PSEUDO_PHILOX4_32_10", "CURAND_RNG_QUASI_DEFAULT",
+    "CURAND_RNG_QUASI_SOBOL32", "CURAND_RNG_QUASI_SCRAMBLED_SOBOL32",
+    "CURAND_RNG_QUASI_SOBOL64", "CURAND_RNG_QUASI_SCRAMBLED_SOBOL64",
+]
+
+_CUFFT_API = [
+    "cufftPlan1d", "cufftPlan2d", "cufftPlan3d", "cufftPlanMany", "cufftCreate",
+    "cufftDestroy", "cufftSetStream", "cufftExecC2C", "cufftExecR2C",
+    "cufftExecC2R", "cufftExecZ2Z", "cufftExecD2Z", "cufftExecZ2D",
+    "cufftMakePlan1d", "cufftMakePlan2d", "cufftMakePlan3d", "cufftMakePlanMany",
+    "cufftMakePlanMany64", "cufftGetSize", "cufftGetSize1d", "cufftGetSizeMany",
+    "cufftSetWorkArea", "cufftSetAutoAllocation", "cufftEstimate1d",
+    "cufftEstimateMany", "cufftGetVersion",
+]
+
+_CUFFT_TYPES = [
+    "cufftHandle", "cufftResult", "cufftResult_t", "cufftType", "cufftType_t",
+    "cufftComplex", "cufftDoubleComplex", "cufftReal", "cufftDoubleReal",
+]
+
+_CUFFT_ENUMS = [
+    "CUFFT_SUCCESS", "CUFFT_INVALID_PLAN", "CUFFT_ALLOC_FAILED", "CUFFT_INVALID_TYPE",
+    "CUFFT_INVALID_VALUE", "CUFFT_INTERNAL_ERROR", "CUFFT_EXEC_FAILED",
+    "CUFFT_SETUP_FAILED", "CUFFT_INVALID_SIZE", "CUFFT_UNALIGNED_DATA",
+    "CUFFT_INCOMPLETE_PARAMETER_LIST", "CUFFT_INVALID_DEVICE", "CUFFT_PARSE_ERROR",
+    "CUFFT_NO_WORKSPACE", "CUFFT_NOT_IMPLEMENTED", "CUFFT_NOT_SUPPORTED",
+    "CUFFT_R2C", "CUFFT_C2R", "CUFFT_C2C", "CUFFT_D2Z", "CUFFT_Z2D", "CUFFT_Z2Z",
+    "CUFFT_FORWARD",
+]
+
+_CUFFT_IRREGULAR: Dict[str, str] = {
+    "CUFFT_INVERSE": "HIPFFT_BACKWARD",
+}
+
+_CUSPARSE_API = [
+    "cusparseCreate", "cusparseDestroy", "cusparseSetStream", "cusparseGetStream",
+    "cusparseCreateMatDescr", "cusparseDestroyMatDescr", "cusparseSetMatType",
+    "cusparseSetMatIndexBase", "cusparseCreateCsr", "cusparseCreateCoo",
+    "cusparseCreateDnVec", "cusparseCreateDnMat", "cusparseDestroySpMat",
+    "cusparseDestroyDnVec", "cusparseDestroyDnMat", "cusparseSpMV",
+    "cusparseSpMV_bufferSize", "cusparseSpMM", "cusparseSpMM_bufferSize",
+    "cusparseXcsr2coo", "cusparseXcoo2csr",
+]
+
+_CUSPARSE_TYPES = [
+    "cusparseHandle_t", "cusparseStatus_t", "cusparseMatDescr_t",
+    "cusparseSpMatDescr_t", "cusparseDnVecDescr_t", "cusparseDnMatDescr_t",
+    "cusparseOperation_t", "cusparseIndexBase_t", "cusparseSpMVAlg_t",
+    "cusparseSpMMAlg_t",
+]
+
+_CUSPARSE_ENUMS = [
+    "CUSPARSE_STATUS_SUCCESS", "CUSPARSE_STATUS_NOT_INITIALIZED",
+    "CUSPARSE_STATUS_ALLOC_FAILED", "CUSPARSE_STATUS_INVALID_VALUE",
+    "CUSPARSE_STATUS_EXECUTION_FAILED", "CUSPARSE_STATUS_INTERNAL_ERROR",
+    "CUSPARSE_OPERATION_NON_TRANSPOSE", "CUSPARSE_OPERATION_TRANSPOSE",
+    "CUSPARSE_INDEX_BASE_ZERO", "CUSPARSE_INDEX_BASE_ONE",
+    "CUSPARSE_MATRIX_TYPE_GENERAL", "CUSPARSE_INDEX_32I", "CUSPARSE_INDEX_64I",
+]
+
+CUDA_HEADERS: Dict[str, str] = {
+    "cuda_runtime.h": "hip/hip_runtime.h",
+    "cuda_runtime_api.h": "hip/hip_runtime_api.h",
+    "cuda.h": "hip/hip_runtime.h",
+    "device_launch_parameters.h": "hip/hip_runtime.h",
+    "cuda_fp16.h": "hip/hip_fp16.h",
+    "cuda_bf16.h": "hip/hip_bf16.h",
+    "cuComplex.h": "hip/hip_complex.h",
+    "cooperative_groups.h": "hip/hip_cooperative_groups.h",
+    "cuda_profiler_api.h": "hip/hip_runtime_api.h",
+    "cuda_texture_types.h": "hip/hip_texture_types.h",
+    "vector_types.h": "hip/hip_vector_types.h",
+    "cublas_v2.h": "hipblas/hipblas.h",
+    "cublas.h": "hipblas/hipblas.h",
+    "cublasLt.h": "hipblaslt/hipblaslt.h",
+    "curand.h": "hiprand/hiprand.h",
+    "curand_kernel.h": "hiprand/hiprand_kernel.h",
+    "cufft.h": "hipfft/hipfft.h",
+    "cufftXt.h": "hipfft/hipfftXt.h",
+    "cusparse.h": "hipsparse/hipsparse.h",
+    "cusparse_v2.h": "hipsparse/hipsparse.h",
+    "cusolverDn.h": "hipsolver/hipsolver.h",
+    "cub/cub.cuh": "hipcub/hipcub.hpp",
+    "nccl.h": "rccl/rccl.h",
+}
+
+# Headers with no drop-in HIP equivalent; the value is the porting hint.
+UNSUPPORTED_HEADERS: Dict[str, str] = {
+    "cudnn.h": "port to MIOpen (miopen/miopen.h); APIs are not 1:1",
+    "nvrtc.h": "use hiprtc (hip/hiprtc.h) and review compile options",
+    "cuda_gl_interop.h": "use hip/hip_gl_interop.h and review interop calls",
+    "nvToolsExt.h": "use roctx (roctracer/roctx.h)",
+    "mma.h": "WMMA intrinsics need rocWMMA (rocwmma/rocwmma.hpp)",
+}
+
+# Identifier prefixes that mark CUDA-specific names left unconverted.
+CUDA_IDENTIFIER_PREFIXES: Tuple[str, ...] = (
+    "cuda", "CUDA_", "CU_", "cublas", "CUBLAS_", "curand", "CURAND_", "cufft",
+    "CUFFT_", "cusparse", "CUSPARSE_", "cusolver", "CUSOLVER_", "cudnn", "CUDNN_",
+    "nvrtc", "NVRTC_", "nvtx", "cuMem", "cuCtx", "cuDevice", "cuModule",
+    "cuStream", "cuEvent", "cuLaunch",
+)
+
+
+def _prefixed(
+    names: Iterable[str], old: str, new: str, category: str
+) -> Dict[str, Tuple[str, str]]:
+    return {name: (new + name[len(old):], category) for name in names}
+
+
+def _explicit(mapping: Dict[str, str], category: str) -> Dict[str, Tuple[str, str]]:
+    return {name: (target, category) for name, target in mapping.items()}
+
+
+def _build_table() -> Dict[str, Tuple[str, str]]:
+    table: Dict[str, Tuple[str, str]] = {}
+    table.update(_prefixed(_RUNTIME_API, "cuda", "hip", CATEGORY_RUNTIME))
+    table.update(_prefixed(_RUNTIME_TYPES, "cuda", "hip", CATEGORY_TYPE))
+    table.update(_prefixed(_RUNTIME_ENUMS, "cuda", "hip", CATEGORY_ENUM))
+    table.update(
+        _prefixed(
+            (f"cudaDevAttr{name}" for name in _DEVICE_ATTRIBUTES),
+            "cudaDevAttr",
+            "hipDeviceAttribute",
+            CATEGORY_ENUM,
+        )
+    )
+    table.update(_prefixed(_DATA_TYPES, "CUDA_", "HIP_", CATEGORY_ENUM))
+    table.update(_explicit(_RUNTIME_IRREGULAR, CATEGORY_RUNTIME))
+    table.update(_explicit(_DRIVER_IRREGULAR, CATEGORY_DRIVER))
+    table.update(_explicit(_COMPLEX_IRREGULAR, CATEGORY_COMPLEX))
+    table.update(_prefixed(_CUBLAS_API + _CUBLAS_TYPES, "cublas", "hipblas", CATEGORY_CUBLAS))
+    table.update(_prefixed(_CUBLAS_ENUMS, "CUBLAS_", "HIPBLAS_", CATEGORY_CUBLAS))
+    table.update(_explicit(_CUBLAS_IRREGULAR, CATEGORY_CUBLAS))
+    table.update(
+        _prefixed(_CURAND_API + _CURAND_DEVICE + _CURAND_TYPES, "curand", "hiprand", CATEGORY_CURAND)
+    )
+    table.update(_prefixed(_CURAND_ENUMS, "CURAND_", "HIPRAND_", CATEGORY_CURAND))
+    table.update(_prefixed(_CUFFT_API + _CUFFT_TYPES, "cufft", "hipfft", CATEGORY_CUFFT))
+    table.update(_prefixed(_CUFFT_ENUMS, "CUFFT_", "HIPFFT_", CATEGORY_CUFFT))
+    table.update(_explicit(_CUFFT_IRREGULAR, CATEGORY_CUFFT))
+    table.update(
+        _prefixed(_CUSPARSE_API + _CUSPARSE_TYPES, "cusparse", "hipsparse", CATEGORY_CUSPARSE)
+    )
+    table.update(_prefixed(_CUSPARSE_ENUMS, "CUSPARSE_", "HIPSPARSE_", CATEGORY_CUSPARSE))
+    return table
+
+
+CUDA_TO_HIP: Dict[str, Tuple[str, str]] = _build_table()
@@ -0,0 +1,81 @@
+"""Match large literal keyword sets with a single trie-shaped regular expression."""
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, Iterator, Tuple
+
+_WORD_CHARS = "A-Za-z0-9_"
+
+
+class LiteralTrie:
+    """Scan text for any of a set of literals in one left-to-right pass.
+
+    Literals are folded into a prefix trie before being rendered as a regex,
+    so every alternation branches on a single character. The work per input
+    position is bounded by the longest literal rather than by the number of
+    literals, which keeps scans linear in the input size. A space inside a
+    literal matches any run of whitespace.
+    """
+
+    def __init__(
+        self, literals: Iterable[str], *, ignore_case: bool = False, whole_word: bool = True
+    ) -> None:
+        self.ignore_case = ignore_case
+        trie: Dict[str, dict] = {}
+        for literal in literals:
+            key = self.normalize(literal)
+            if not key:
+                continue
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        body = _render(trie) if trie else r"(?!x)x"
+        if whole_word:
+            body = rf"(?<![{_WORD_CHARS}])(?:{body})(?![{_WORD_CHARS}])"
+        # Lower-casing the input once and matching case-sensitively is several
+        # times faster than re.IGNORECASE; the flag is only a fallback for text
+        # whose length changes when lower-cased.
+        self.pattern = re.compile(body)
+        self._fallback = re.compile(body, re.IGNORECASE) if ignore_case else self.pattern
+
+    def normalize(self, text: str) -> str:
+        """Return the key form of ``text`` used for trie entries and hits."""
+
+        key = " ".join(text.split())
+        return key.lower() if self.ignore_case else key
+
+    def finditer(self, text: str) -> Iterator[Tuple[str, int]]:
+        """Yield ``(key, offset)`` for each non-overlapping literal in ``text``."""
+
+        pattern = self.pattern
+        if self.ignore_case:
+            lowered = text.lower()
+            if len(lowered) == len(text):
+                text = lowered
+            else:
+                pattern = self._fallback
+        for match in pattern.finditer(text):
+            yield self.normalize(match.group()), match.start()
+
+    def search(self, text: str) -> bool:
+        return next(self.finditer(text), None) is not None
+
+
+def _render(node: Dict[str, dict]) -> str:
+    terminal = "" in node
+    branches = [
+        _escape(char) + _render(child) for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1:
+        body = branches[0]
+        return f"(?:{body})?" if terminal else body
+    body = "(?:" + "|".join(branches) + ")"
+    return body + "?" if terminal else body
+
+
+def _escape(char: str) -> str:
+    return r"\s+" if char == " " else re.escape(char)
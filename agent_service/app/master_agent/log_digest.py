@@ -0,0 +1,240 @@
+"""Incremental digest of large runtime logs for error mode.
+
+Logs are fed as byte chunks, e.g. batches of an HTTP upload stream. Each
+chunk is cut at its last newline and only complete lines are scanned, so
+memory stays bounded by the chunk size plus the digest.
+Signature hits come from ``error_signatures.SIGNATURE_TRIE``. Lines that
+differ only in addresses, ids or counters are treated as one error with an
+occurrence count. Only the top distinct errors, each with a little
+surrounding context, are rendered for the worker.
+"""
+from __future__ import annotations
+
+import codecs
+import re
+from collections import deque
+from typing import Deque, Dict, List
+
+from .error_signatures import SIGNATURE_TRIE, SIGNATURES
+
+CONTEXT_LINES = 2
+MAX_DISTINCT_ERRORS = 500
+MAX_STACK_FRAMES = 20
+MAX_LINE_CHARS = 500
+MAX_CARRY_CHARS = 1024 * 1024
+FILE_CHUNK_BYTES = 4 * 1024 * 1024
+
+VOLATILE_PATTERN = re.compile(r"0x[0-9a-fA-F]+|\d+")
+STACK_FRAME_PATTERN = re.compile(
+    r"""^[ \t]*(?:
+        at[ \t]+\S[^\n]*:[^\n]*
+        |\#\d+[ \t]+0x[0-9a-fA-F]+[^\n]*
+        |File[ \t]+"[^"\n]+",[ \t]+line[ \t]+\d+[^\n]*
+        |frame[ \t]+\#\d+:[^\n]*
+    )""",
+    re.MULTILINE | re.VERBOSE,
+)
+
+
+class LogDigester:
+    """Consume a log chunk by chunk and keep only what the digest needs."""
+
+    def __init__(self, context_lines: int = CONTEXT_LINES) -> None:
+        self._context_lines = context_lines
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._carry = ""
+        self._tail: Deque[str] = deque(maxlen=context_lines)
+        self._pending: List[List[object]] = []
+        self._errors: Dict[str, Dict[str, object]] = {}
+        self._signatures: Dict[str, Dict[str, int]] = {}
+        self._frames: Dict[str, str] = {}
+        self._dropped = 0
+        self._chars = 0
+        self._lines = 0
+
+    def feed(self, data: bytes) -> None:
+        self.feed_text(self._decoder.decode(data))
+
+    def feed_text(self, text: str) -> None:
+        self._chars += len(text)
+        self._carry += text
+        cut = self._carry.rfind("\n")
+        if cut == -1:
+            if len(self._carry) > MAX_CARRY_CHARS:
+                # A pathological line with no newline: scan what we have.
+                self._scan(self._carry + "\n")
+                self._carry = ""
+            return
+        block, self._carry = self._carry[: cut + 1], self._carry[cut + 1 :]
+        self._scan(block)
+
+    def close(self) -> None:
+        self._carry += self._decoder.decode(b"", final=True)
+        if self._carry:
+            self._scan(self._carry + "\n")
+            self._carry = ""
+
+    def digest(self, top: int = 10) -> Dict[str, object]:
+        ranked = sorted(
+            self._errors.values(),
+            key=lambda entry: (-entry["priority"], -entry["count"], entry["first_line"]),
+        )
+        signatures = sorted(
+            (
+                {
+                    "signature": SIGNATURES[key]["signature"],
+                    "error_type": SIGNATURES[key]["error_type"],
+                    "source": SIGNATURES[key]["source"],
+                    "count": seen["count"],
+                    "first_line": seen["first_line"],
+                }
+                for key, seen in self._signatures.items()
+            ),
+            key=lambda hit: hit["first_line"],
+        )
+        return {
+            "chars": self._chars,
+            "lines": self._lines,
+            "distinct_errors": len(self._errors),
+            "dropped_errors": self._dropped,
+            "errors": [
+                {key: value for key, value in entry.items() if key != "priority"}
+                for entry in ranked[:top]
+            ],
+            "matched_signatures": signatures,
+            "stack_trace": list(self._frames.values()),
+        }
+
+    def _scan(self, block: str) -> None:
+        base_line = self._lines + 1
+        if self._pending:
+            self._fill_pending(block)
+
+        for frame in STACK_FRAME_PATTERN.finditer(block):
+            if len(self._frames) >= MAX_STACK_FRAMES:
+                break
+            text = frame.group().strip()[:MAX_LINE_CHARS]
+            self._frames.setdefault(VOLATILE_PATTERN.sub("#", text), text)
+
+        counted = 0
+        line_number = base_line
+        last_line_start = -1
+        for key, offset in SIGNATURE_TRIE.finditer(block):
+            line_start = block.rfind("\n", 0, offset) + 1
+            line_number += block.count("\n", counted, line_start)
+            counted = line_start
+
+            seen = self._signatures.get(key)
+            if seen is None:
+                self._signatures[key] = {"count": 1, "first_line": line_number}
+            else:
+                seen["count"] += 1
+
+            if line_start == last_line_start:
+                continue
+            last_line_start = line_start
+            line_end = block.find("\n", offset)
+            self._record_line(block, key, line_start, line_end, line_number)
+
+        self._lines += block.count("\n")
+        for line in block[:-1].rsplit("\n", self._context_lines)[-self._context_lines :]:
+            self._tail.append(line[:MAX_LINE_CHARS])
+
+    def _record_line(
+        self, block: str, key: str, line_start: int, line_end: int, line_number: int
+    ) -> None:
+        text = block[line_start:line_end].strip()[:MAX_LINE_CHARS]
+        dedupe_key = VOLATILE_PATTERN.sub("#", text)
+        entry = self._errors.get(dedupe_key)
+        if entry is not None:
+            entry["count"] += 1
+            entry["last_line"] = line_number
+            return
+        if len(self._errors) >= MAX_DISTINCT_ERRORS:
+            self._dropped += 1
+            return
+
+        entry = {
+            "signature": SIGNATURES[key]["signature"],
+            "error_type": SIGNATURES[key]["error_type"],
+            "priority": SIGNATURES[key]["priority"],
+            "line": text,
+            "count": 1,
+            "first_line": line_number,
+            "last_line": line_number,
+            "context_before": self._lines_before(block, line_start),
+            "context_after": [],
+        }
+        self._errors[dedupe_key] = entry
+        remaining = self._collect_after(block, line_end + 1, entry["context_after"], self._context_lines)
+        if remaining:
+            self._pending.append([entry["context_after"], remaining])
+
+    def _lines_before(self, block: str, line_start: int) -> List[str]:
+        lines: List[str] = []
+        end = line_start - 1
+        while len(lines) < self._context_lines and end >= 0:
+            start = block.rfind("\n", 0, end) + 1
+            lines.append(block[start:end][:MAX_LINE_CHARS])
+            end = start - 1
+        missing = self._context_lines - len(lines)
+        if missing > 0 and self._tail:
+            lines.extend(reversed(list(self._tail)[-missing:]))
+        lines.reverse()
+        return lines
+
+    def _collect_after(self, block: str, start: int, into: List[str], wanted: int) -> int:
+        while wanted and start < len(block):
+            end = block.find("\n", start)
+            if end == -1:
+                end = len(block)
+            into.append(block[start:end][:MAX_LINE_CHARS])
+            start = end + 1
+            wanted -= 1
+        return wanted
+
+    def _fill_pending(self, block: str) -> None:
+        still_pending = []
+        for into, wanted in self._pending:
+            remaining = self._collect_after(block, 0, into, wanted)
+            if remaining:
+                still_pending.append([into, remaining])
+        self._pending = still_pending
+
+
+def extract_stack_trace(text: str, limit: int = MAX_STACK_FRAMES) -> List[str]:
+    frames: List[str] = []
+    for frame in STACK_FRAME_PATTERN.finditer(text):
+        if len(frames) >= limit:
+            break
+        frames.append(frame.group().strip()[:MAX_LINE_CHARS])
+    return frames
+
+
+def render_digest(digest: Dict[str, object]) -> str:
+    """Render a digest as the compact log excerpt forwarded to the worker."""
+
+    parts = [
+        f"# log digest: {digest['lines']} lines, {digest['distinct_errors']} distinct errors"
+    ]
+    for error in digest["errors"]:
+        span = f"line {error['first_line']}"
+        if error["count"] > 1:
+            span += f"-{error['last_line']}, x{error['count']}"
+        parts.append(f"[{span}] {error['error_type']}")
+        parts.extend(f"    {line}" for line in error["context_before"])
+        parts.append(f">>> {error['line']}")
+        parts.extend(f"    {line}" for line in error["context_after"])
+    if digest["stack_trace"]:
+        parts.append("# stack trace")
+        parts.extend(digest["stack_trace"])
+    return "\n".join(parts)
+
+
+def digest_text(text: str, top: int = 10) -> Dict[str, object]:
+    digester = LogDigester()
+    for offset in range(0, len(text), FILE_CHUNK_BYTES):
+        digester.feed_text(text[offset : offset + FILE_CHUNK_BYTES])
+    digester.close()
+    return digester.digest(top)
+
@@ -1,37 +1,105 @@
 """Master Agent service orchestrating routing and preprocessing."""
 from __future__ import annotations
 
-from typing import List
+from typing import Dict, List, Tuple
 
 from .. import schemas
+from ..tracing import span
 from . import preprocess, rules, scoring
+from .features import RoutingFeatures, extract_features
 
 
 def build_master_response(payload: schemas.MasterRouteRequest) -> schemas.MasterRouteResponse:
-    allowed_modes = _normalize_allowed_modes(payload.parallel_modes)
-
-    mode = None
-    if payload.explicit_mode and payload.explicit_mode in allowed_modes:
-        mode = payload.explicit_mode
-    else:
-        rule_mode = rules.rule_based_detect(payload)
-        if rule_mode in allowed_modes:
-            mode = rule_mode
-
-    scores = scoring.compute_scores(payload)
-    scored_mode = max(allowed_modes, key=lambda m: scores.get(m, 0))
-    mode = mode or scored_mode
-
-    preprocessed = preprocess.preprocess_payload(mode, payload)
+    with span("route.select") as current:
+        mode = _routed_mode(payload)
+        if current is not None:
+            current.set(mode=mode)
+    with span("preprocess", mode=mode):
+        preprocessed = preprocess.preprocess_payload(mode, payload)
+    raw_input = payload.text
+    if "log_digest" in preprocessed:
+        # Large logs travel downstream as their digest, not verbatim.
+        raw_input = preprocessed["error_message"]
 
     return schemas.MasterRouteResponse(
         mode=mode,
         preprocessed=preprocessed,
-        raw_input=payload.text,
+        raw_input=raw_input,
         session_id=payload.session_id,
     )
 
 
+def select_mode(payload: schemas.MasterRouteRequest) -> Tuple[str, Dict[str, int], List[str]]:
+    """Return the routed mode, the per-mode scores and the allowed modes."""
+
+    allowed_modes = _normalize_allowed_modes(payload.parallel_modes)
+    features = extract_features(payload.text, payload.url)
+    scores = scoring.scores_from_features(features)
+    mode = _choose_mode(payload.explicit_mode, features, payload.text, scores, allowed_modes)
+    return mode, scores, allowed_modes
+
+
+def _routed_mode(payload: schemas.MasterRouteRequest) -> str:
+    # An allowed explicit mode wins outright, so skip features and scoring.
+    if payload.explicit_mode and payload.explicit_mode in _normalize_allowed_modes(payload.parallel_modes):
+        return payload.explicit_mode
+    mode, _, _ = select_mode(payload)
+    return mode
+
+
+def route_batch(payload: schemas.MasterRouteBatchRequest) -> schemas.MasterRouteBatchResponse:
+    """Route many inputs at once: one feature pass each, one scoring product."""
+
+    allowed_modes = _normalize_allowed_modes(payload.parallel_modes)
+    features = [extract_features(item.text, item.url) for item in payload.items]
+    score_rows = scoring.score_matrix([scoring.feature_vector(entry) for entry in features])
+
+    results = []
+    for item, item_features, row in zip(payload.items, features, score_rows):
+        scores = dict(zip(schemas.SUPPORTED_MODES, row))
+        mode = _choose_mode(item.explicit_mode, item_features, item.text, scores, allowed_modes)
+        results.append(schemas.MasterRouteBatchResult(id=item.id, mode=mode, scores=row))
+    return schemas.MasterRouteBatchResponse(
+        score_modes=schemas.SUPPORTED_MODES.copy(), results=results
+    )
+
+
+def _choose_mode(
+    explicit_mode: str | None,
+    features: RoutingFeatures,
+    text: str,
+    scores: Dict[str, int],
+    allowed_modes: List[str],
+) -> str:
+    if explicit_mode and explicit_mode in allowed_modes:
+        return explicit_mode
+    rule_mode = rules.detect_from_features(features, text)
+    if rule_mode in allowed_modes:
+        return rule_mode
+    return max(allowed_modes, key=lambda m: scores.get(m, 0))
+
+
+def rank_candidates(
+    payload: schemas.MasterRouteRequest, top_k: int, margin: int
+) -> List[Tuple[str, int]]:
+    """Routed mode first, then other allowed modes scoring within ``margin`` of the best."""
+
+    mode, scores, allowed_modes = select_mode(payload)
+    best = max(scores.get(candidate, 0) for candidate in allowed_modes)
+    alternatives = sorted(
+        (
+            candidate
+            for candidate in allowed_modes
+            if candidate != mode
+            and scores.get(candidate, 0) > 0
+            and scores.get(candidate, 0) >= best - margin
+        ),
+        key=lambda candidate: -scores.get(candidate, 0),
+    )
+    ranked = [mode] + alternatives[: max(top_k - 1, 0)]
+    return [(candidate, scores.get(candidate, 0)) for candidate in ranked]
+
+
 def _normalize_allowed_modes(candidates: List[str] | None) -> List[str]:
     if not candidates:
         return schemas.SUPPORTED_MODES.copy()
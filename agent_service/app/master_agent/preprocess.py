@@ -1,10 +1,14 @@
 """Non-AI preprocessing stubs for Master Agent."""
 from __future__ import annotations
 
-from typing import Dict
+import re
+from typing import Dict, List
 
+from ..config import get_settings
 from ..schemas import MasterRouteRequest
-from . import document_fetcher
+from . import code_structure, document_fetcher, error_signatures, hipify, log_digest
+
+HIP_CALL_PATTERN = re.compile(r"\bhip(?!Error)[A-Z][A-Za-z0-9_]*")
 
 
 def preprocess_payload(mode: str, payload: MasterRouteRequest) -> Dict[str, object]:
@@ -25,29 +29,44 @@ def preprocess_payload(mode: str, payload: MasterRouteRequest) -> Dict[str, obje
             "section_contents": fetched.get("section_contents", {}),
         }
     if mode == "code":
+        structure = code_structure.extract_code_structure(text)
         return {
-            "language": _guess_language(text),
-            "api_list": _extract_api_candidates(text),
+            "language": structure["language"],
+            "api_list": structure["api_list"],
             "normalized_code": text.strip(),
-            "issues_found": [],
-            "kernel_blocks": _detect_kernel_names(text),
-            "pointer_metadata": {},
+            "issues_found": structure["issues_found"],
+            "kernel_blocks": [kernel["name"] for kernel in structure["kernels"]],
+            "pointer_metadata": structure["pointer_metadata"],
+            "kernels": structure["kernels"],
+            "launch_config": structure["launch_config"],
+            "index_patterns": structure["index_patterns"],
         }
     if mode == "error":
+        settings = get_settings()
+        if len(text) > settings.log_digest_threshold:
+            return preprocess_log_digest(
+                log_digest.digest_text(text, settings.log_digest_top_errors)
+            )
+        classification = error_signatures.classify_error(text)
         return {
-            "error_type": _detect_error_type(text),
+            "error_type": classification["error_type"],
             "error_message": text,
-            "likely_api": _detect_likely_api(text),
-            "stack_trace": _extract_stack_trace(text),
+            "likely_api": _detect_likely_api(text, classification["related_apis"]),
+            "stack_trace": log_digest.extract_stack_trace(text, limit=5),
             "code_context": "",
             "pointer_metadata": {},
+            "typical_causes": classification["typical_causes"],
+            "related_apis": classification["related_apis"],
+            "matched_signatures": classification["matched_signatures"],
         }
     if mode == "hipify":
+        converted = hipify.hipify_source(text)
         return {
             "original_code": text,
-            "hipified_code_static": text.replace("cuda", "hip"),
-            "mapping_report": _build_mapping_report(text),
-            "unconverted_segments": _detect_unconverted_segments(text),
+            "hipified_code_static": converted["hipified_code"],
+            "mapping_report": converted["mapping_report"],
+            "unconverted_segments": converted["unconverted_segments"],
+            "needs_review": bool(converted["unconverted_segments"]),
         }
     if mode == "api":
         api_name = text.strip()
@@ -63,6 +82,31 @@ def preprocess_payload(mode: str, payload: MasterRouteRequest) -> Dict[str, obje
     return {"raw": text, "session_id": session_id}
 
 
+def preprocess_log_digest(digest: Dict[str, object]) -> Dict[str, object]:
+    """Error-mode payload for a large log, carrying its digest instead of the log."""
+
+    message = log_digest.render_digest(digest)
+    classification = error_signatures.classify_error(message)
+    return {
+        "error_type": classification["error_type"],
+        "error_message": message,
+        "likely_api": _detect_likely_api(message, classification["related_apis"]),
+        "stack_trace": digest["stack_trace"],
+        "code_context": "",
+        "pointer_metadata": {},
+        "typical_causes": classification["typical_causes"],
+        "related_apis": classification["related_apis"],
+        "matched_signatures": digest["matched_signatures"],
+        "log_digest": {
+            "chars": digest["chars"],
+            "lines": digest["lines"],
+            "distinct_errors": digest["distinct_errors"],
+            "dropped_errors": digest["dropped_errors"],
+            "errors": digest["errors"],
+        },
+    }
+
+
 def _extract_first_url(text: str) -> str:
     for token in text.split():
         if token.startswith("http://") or token.startswith("https://"):
@@ -75,60 +119,10 @@ def _extract_api_candidates(text: str) -> list[str]:
     return [token for token in tokens if token.startswith("hip") or token.startswith("cuda")]
 
 
-def _guess_language(text: str) -> str:
-    if "__global__" in text or "hipLaunchKernelGGL" in text:
-        return "hip"
-    if "__device__" in text:
-        return "cuda"
-    return "c++"
-
-
-def _detect_kernel_names(text: str) -> list[str]:
-    result = []
-    for line in text.splitlines():
-        line = line.strip()
-        if line.startswith("__global__"):
-            parts = line.split()
-            if len(parts) >= 3:
-                result.append(parts[2].split("(")[0])
-    return result
-
-
-def _detect_error_type(text: str) -> str:
-    for word in text.split():
-        if word.startswith("hipError"):
-            return word
-    if "illegal" in text.lower():
-        return "hipErrorIllegalAddress"
-    return "unknown"
-
-
-def _detect_likely_api(text: str) -> str:
-    for token in text.split():
-        if token.startswith("hip"):
-            return token
+def _detect_likely_api(text: str, related_apis: List[str]) -> str:
+    match = HIP_CALL_PATTERN.search(text)
+    if match:
+        return match.group()
+    if related_apis:
+        return related_apis[0]
     return "hipMemcpy"
-
-
-def _extract_stack_trace(text: str) -> list[str]:
-    lines = []
-    for line in text.splitlines():
-        if ":" in line and line.strip().startswith("at"):
-            lines.append(line.strip())
-    return lines[:5]
-
-
-def _build_mapping_report(text: str) -> list[dict[str, str]]:
-    report = []
-    if "cudaMalloc" in text:
-        report.append({"from": "cudaMalloc", "to": "hipMalloc"})
-    if "cudaMemcpy" in text:
-        report.append({"from": "cudaMemcpy", "to": "hipMemcpy"})
-    return report
-
-
-def _detect_unconverted_segments(text: str) -> list[str]:
-    segments = []
-    if "<<<" in text and ">>>" in text:
-        segments.append("<<<grid, block>>>")
-    return segments
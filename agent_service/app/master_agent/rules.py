@@ -3,15 +3,12 @@ from __future__ import annotations
 
 import re
 from typing import Optional
-from urllib.parse import urlparse
 
 from .. import schemas
+from . import error_signatures
+from .features import URL_PATTERN, RoutingFeatures, extract_features
 
-CODE_KEYWORDS = ["__global__", "hipLaunchKernelGGL", "__device__", "threadIdx"]
-ERROR_KEYWORDS = ["hipError", "illegal", "stack trace", "segmentation"]
-HIPIFY_KEYWORDS = ["cudaMalloc", "cudaMemcpy", "<<<", "cudaError"]
 API_PATTERN = re.compile(r"^[A-Za-z0-9_]{2,32}$")
-URL_PATTERN = re.compile(r"https?://[\w./-]+", re.IGNORECASE)
 
 
 def detect_explicit_document(payload: schemas.MasterRouteRequest) -> bool:
@@ -23,23 +20,31 @@ def detect_explicit_document(payload: schemas.MasterRouteRequest) -> bool:
 
 
 def rule_based_detect(payload: schemas.MasterRouteRequest) -> Optional[str]:
-    text = payload.text
-    lowered = text.lower()
+    return detect_from_features(extract_features(payload.text, payload.url), payload.text)
 
-    if detect_explicit_document(payload):
+
+def detect_from_features(features: RoutingFeatures, text: str) -> Optional[str]:
+    """Apply the routing rules, in priority order, to pre-extracted features.
+
+    Error signatures are only scanned when no earlier rule has decided.
+    """
+
+    if features.has_url:
         return "document"
 
-    if any(keyword in text for keyword in CODE_KEYWORDS):
+    if features.code_keyword:
         return "code"
 
-    if any(keyword.lower() in lowered for keyword in ERROR_KEYWORDS):
+    if features.error_keyword:
+        return "error"
+
+    if error_signatures.contains_signature(text):
         return "error"
 
-    if any(keyword.lower() in lowered for keyword in HIPIFY_KEYWORDS):
+    if features.hipify_keyword:
         return "hipify"
 
-    tokenized = text.strip().split()
-    if len(tokenized) == 1 and API_PATTERN.match(tokenized[0]):
+    if features.single_token is not None and API_PATTERN.match(features.single_token):
         return "api"
 
     return None
@@ -1,46 +1,78 @@
-"""Scoring functions for Master Agent routing."""
+"""Scoring functions for Master Agent routing.
+
+Scores are a linear function of a fixed feature vector: ``WEIGHTS`` holds
+one row per mode (in ``SUPPORTED_MODES`` order) and one column per entry of
+``FEATURE_NAMES``. A batch of inputs is scored as one matrix product.
+"""
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, List, Sequence, Tuple
 
 from ..schemas import MasterRouteRequest, SUPPORTED_MODES
-from . import rules
+from .features import RoutingFeatures, extract_features
+
+FEATURE_NAMES: Tuple[str, ...] = (
+    "has_url",
+    "contains_hip_api",
+    "lines_over_5",
+    "has_code_braces",
+    "has_semicolon",
+    "lines_over_3",
+    "contains_error",
+    "has_stack_trace",
+    "contains_cuda_api",
+    "is_api_like",
+)
+
+# Rows follow SUPPORTED_MODES: document, code, error, hipify, api.
+WEIGHTS: Tuple[Tuple[int, ...], ...] = (
+    (20, 10, 5, 0, 0, 0, 0, 0, 0, 0),
+    (0, 0, 0, 15, 10, 20, 0, 0, 0, 0),
+    (0, 0, 0, 0, 0, 0, 40, 10, 0, 0),
+    (0, -10, 0, 0, 0, 0, 0, 0, 50, 0),
+    (0, 0, 0, 0, 0, 0, 0, 0, 0, 40),
+)
+
+_SPARSE_WEIGHTS = tuple(
+    tuple((index, weight) for index, weight in enumerate(row) if weight) for row in WEIGHTS
+)
+
+
+def feature_vector(features: RoutingFeatures) -> Tuple[int, ...]:
+    return (
+        int(features.has_url),
+        int(features.contains_hip_api),
+        int(features.lines_count > 5),
+        int(features.has_code_braces),
+        int(features.has_semicolon),
+        int(features.lines_count > 3),
+        int(features.contains_error),
+        int(features.has_stack_trace),
+        int(features.contains_cuda_api),
+        int(features.single_token is not None),
+    )
+
+
+def score_matrix(vectors: Sequence[Sequence[int]]) -> List[List[int]]:
+    """Return one score row per feature vector (``vectors @ WEIGHTS.T``)."""
+
+    return [score_row(vector) for vector in vectors]
+
+
+def score_row(vector: Sequence[int]) -> List[int]:
+    row = []
+    for weights in _SPARSE_WEIGHTS:
+        total = 0
+        for index, weight in weights:
+            if vector[index]:
+                total += weight * vector[index]
+        row.append(total)
+    return row
+
+
+def scores_from_features(features: RoutingFeatures) -> Dict[str, int]:
+    return dict(zip(SUPPORTED_MODES, score_row(feature_vector(features))))
 
 
 def compute_scores(payload: MasterRouteRequest) -> Dict[str, int]:
-    text = payload.text
-    lowered = text.lower()
-    tokens = text.strip().split()
-
-    features = {
-        "has_url": rules.detect_explicit_document(payload),
-        "has_code_braces": "{" in text and "}" in text,
-        "has_semicolon": ";" in text,
-        "lines_count": len(text.strip().splitlines()),
-        "contains_hip_api": "hip" in lowered,
-        "contains_cuda_api": "cuda" in lowered,
-        "contains_error": "error" in lowered or "illegal" in lowered,
-        "has_stack_trace": "stack" in lowered or "line" in lowered,
-        "token_count": len(tokens),
-    }
-
-    scores: Dict[str, int] = {mode: 0 for mode in SUPPORTED_MODES}
-
-    scores["document"] += 20 if features["has_url"] else 0
-    scores["document"] += 10 if features["contains_hip_api"] else 0
-    scores["document"] += 5 if features["lines_count"] > 5 else 0
-
-    scores["code"] += 15 if features["has_code_braces"] else 0
-    scores["code"] += 10 if features["has_semicolon"] else 0
-    scores["code"] += 20 if features["lines_count"] > 3 else 0
-
-    scores["error"] += 40 if features["contains_error"] else 0
-    scores["error"] += 10 if features["has_stack_trace"] else 0
-
-    scores["hipify"] += 50 if features["contains_cuda_api"] else 0
-    scores["hipify"] -= 10 if features["contains_hip_api"] else 0
-
-    is_api_like = features["token_count"] == 1 and 0 < len(text.strip()) <= 32
-    scores["api"] += 40 if is_api_like else 0
-
-    return scores
+    return scores_from_features(extract_features(payload.text, payload.url))
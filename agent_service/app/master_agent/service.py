@@ -1,19 +1,40 @@
 """Service helpers to execute the ADK Master Agent."""
 from __future__ import annotations
 
+import asyncio
+from functools import lru_cache
+from typing import TYPE_CHECKING, AsyncIterator, Dict
+
+from fastapi import HTTPException, status
+
 from .. import schemas
-from ..adk_app.master_agent import MasterAgent
 from ..adk_app.runner import run_adk_agent
+from ..config import get_settings
+from .log_digest import LogDigester
+from .preprocess import preprocess_log_digest
+
+if TYPE_CHECKING:
+    from ..adk_app.master_agent import MasterAgent
+
+APP_NAME = "amdlingo-master"
+# Upload chunks are batched to this size before being digested off the event loop.
+LOG_FEED_BYTES = 1024 * 1024
 
-_MASTER_AGENT = MasterAgent()
-_APP_NAME = "amdlingo-master"
+
+@lru_cache(maxsize=1)
+def get_master_agent() -> MasterAgent:
+    """Build the Master Agent on first use; importing it loads ``google.adk``."""
+
+    from ..adk_app.master_agent import MasterAgent
+
+    return MasterAgent()
 
 
 async def execute_master(payload: schemas.MasterRouteRequest) -> schemas.MasterRouteResponse:
     final_state = await run_adk_agent(
-        _MASTER_AGENT,
+        get_master_agent(),
         session_id=f"{payload.session_id}-master",
-        app_name=_APP_NAME,
+        app_name=APP_NAME,
         state={"master_request": payload.model_dump()},
         user_message=payload.text,
     )
@@ -26,3 +47,46 @@ async def execute_master(payload: schemas.MasterRouteRequest) -> schemas.MasterR
             "session_id": payload.session_id,
         }
     return schemas.MasterRouteResponse.model_validate(response_dict)
+
+
+async def execute_master_log(
+    session_id: str, chunks: AsyncIterator[bytes]
+) -> schemas.MasterRouteResponse:
+    """Route an uploaded log to error mode, digesting it as it streams in.
+
+    The mode is fixed, so routing is skipped and only the digest is kept.
+    """
+
+    settings = get_settings()
+    digester = LogDigester()
+    received = 0
+    batch = bytearray()
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > settings.log_upload_max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="log upload too large",
+            )
+        batch += chunk
+        if len(batch) >= LOG_FEED_BYTES:
+            # Digesting is CPU-bound; one batch at a time keeps the digester in order.
+            await asyncio.to_thread(digester.feed, bytes(batch))
+            batch.clear()
+    digest = await asyncio.to_thread(
+        _finish_digest, digester, bytes(batch), settings.log_digest_top_errors
+    )
+
+    preprocessed = preprocess_log_digest(digest)
+    return schemas.MasterRouteResponse(
+        mode="error",
+        preprocessed=preprocessed,
+        raw_input=preprocessed["error_message"],
+        session_id=session_id,
+    )
+
+
+def _finish_digest(digester: LogDigester, rest: bytes, top: int) -> Dict[str, object]:
+    digester.feed(rest)
+    digester.close()
+    return digester.digest(top)
@@ -0,0 +1,4 @@
+"""Fused route-and-execute pipeline."""
+from .service import run_pipeline
+
+__all__ = ["run_pipeline"]
@@ -0,0 +1,206 @@
+"""Route, preprocess and run the chosen worker in one in-process call."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from .. import schemas
+from ..config import get_settings
+from ..master_agent import execute_master, logic
+from ..workers import get_worker_registry
+
+_settings = get_settings()
+# Shared across requests: speculative candidates never queue for a slot.
+_SPECULATIVE_BUDGET = asyncio.Semaphore(max(_settings.speculative_concurrency, 0))
+
+
+async def run_pipeline(payload: schemas.MasterRouteRequest) -> schemas.PipelineResponse:
+    if payload.speculative:
+        return await run_speculative(payload)
+
+    master_response = await execute_master(payload)
+    worker_response = await run_worker(master_response)
+    return schemas.PipelineResponse(
+        mode=worker_response.mode,
+        result=worker_response.result,
+        session_id=worker_response.session_id,
+        usage=worker_response.usage,
+        routing={
+            "mode": master_response.mode,
+            "explicit_mode": payload.explicit_mode,
+        },
+    )
+
+
+async def stream_pipeline(
+    payload: schemas.MasterRouteRequest,
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """``run_pipeline`` as a sequence of stage events.
+
+    ``routed`` (mode and scores), then ``preprocessed``, then a ``token``
+    event per chunk of worker output, then ``result`` with the
+    ``PipelineResponse``. Stage events carry ``elapsed_ms`` since the start.
+    Speculative requests and in-process workers produce no ``token`` events.
+    """
+
+    started = time.perf_counter()
+    mode, scores, _ = logic.select_mode(payload)
+    yield "routed", {
+        "mode": mode,
+        "explicit_mode": payload.explicit_mode,
+        "scores": scores,
+        "elapsed_ms": _elapsed_ms(started),
+    }
+    if payload.speculative:
+        response = await run_speculative(payload)
+        yield "result", response.model_dump()
+        return
+
+    # Routed above already; pinning the mode keeps the Master Agent from routing again.
+    master_response = await execute_master(payload.model_copy(update={"explicit_mode": mode}))
+    yield "preprocessed", {
+        "mode": master_response.mode,
+        "fields": sorted(master_response.preprocessed),
+        "elapsed_ms": _elapsed_ms(started),
+    }
+    worker_request = schemas.WorkerRequest(
+        mode=master_response.mode,
+        preprocessed=master_response.preprocessed,
+        raw_input=master_response.raw_input,
+        session_id=master_response.session_id,
+    )
+    async for event, data in get_worker_registry().stream(worker_request):
+        if event != "result":
+            yield event, data
+            continue
+        response = schemas.PipelineResponse(
+            mode=data.mode,
+            result=data.result,
+            session_id=data.session_id,
+            usage=data.usage,
+            routing={"mode": master_response.mode, "explicit_mode": payload.explicit_mode},
+        )
+        yield "result", response.model_dump()
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+async def run_worker(master_response: schemas.MasterRouteResponse) -> schemas.WorkerResponse:
+    """Run the worker for a routed request without leaving the process when possible."""
+
+    worker_request = schemas.WorkerRequest(
+        mode=master_response.mode,
+        preprocessed=master_response.preprocessed,
+        raw_input=master_response.raw_input,
+        session_id=master_response.session_id,
+    )
+    return await get_worker_registry().run(worker_request)
+
+
+async def run_speculative(payload: schemas.MasterRouteRequest) -> schemas.PipelineResponse:
+    """Run the routed mode and close runners-up concurrently.
+
+    Candidates are the routed mode plus up to ``speculative_top_k - 1`` modes
+    scoring within ``speculative_margin`` of the best score. The routed mode
+    always runs. Alternatives only run if a slot in the shared budget is
+    free right now. The first candidate (in rank order) that succeeds is
+    accepted. Alternatives still running ``speculative_grace_seconds`` after
+    that are cancelled.
+    """
+
+    candidates = logic.rank_candidates(
+        payload, _settings.speculative_top_k, _settings.speculative_margin
+    )
+    records: List[Dict[str, Any]] = [
+        {"mode": mode, "score": score, "status": "pending", "elapsed_ms": None, "usage": None}
+        for mode, score in candidates
+    ]
+    tasks: Dict[int, asyncio.Task] = {}
+    for index, (mode, _) in enumerate(candidates):
+        uses_budget = index > 0
+        if uses_budget:
+            if _SPECULATIVE_BUDGET.locked():
+                records[index]["status"] = "skipped"
+                continue
+            await _SPECULATIVE_BUDGET.acquire()
+        task = asyncio.ensure_future(_run_candidate(payload, mode, records[index]))
+        if uses_budget:
+            # Released on completion, including tasks cancelled before they start.
+            task.add_done_callback(lambda _: _SPECULATIVE_BUDGET.release())
+        tasks[index] = task
+
+    try:
+        accepted_index: Optional[int] = None
+        accepted: Optional[schemas.WorkerResponse] = None
+        first_error: Optional[HTTPException] = None
+        for index in sorted(tasks):
+            try:
+                accepted = await tasks[index]
+            except HTTPException as exc:
+                first_error = first_error or exc
+                continue
+            accepted_index = index
+            break
+        if accepted is None:
+            raise first_error or HTTPException(status_code=502, detail="no candidate succeeded")
+
+        running = [task for index, task in tasks.items() if index != accepted_index and not task.done()]
+        if running:
+            await asyncio.wait(running, timeout=_settings.speculative_grace_seconds)
+    finally:
+        for index, task in tasks.items():
+            if not task.done():
+                task.cancel()
+                records[index]["status"] = "cancelled"
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    alternatives = []
+    for index, task in tasks.items():
+        if index == accepted_index or task.cancelled() or task.exception() is not None:
+            continue
+        alternative = task.result()
+        alternatives.append(
+            {"mode": alternative.mode, "result": alternative.result, "usage": alternative.usage}
+        )
+
+    return schemas.PipelineResponse(
+        mode=accepted.mode,
+        result=accepted.result,
+        session_id=accepted.session_id,
+        usage=accepted.usage,
+        routing={
+            "mode": candidates[0][0],
+            "explicit_mode": payload.explicit_mode,
+            "accepted_mode": accepted.mode,
+            "candidates": records,
+        },
+        alternatives=alternatives,
+    )
+
+
+async def _run_candidate(
+    payload: schemas.MasterRouteRequest, mode: str, record: Dict[str, Any]
+) -> schemas.WorkerResponse:
+    started = time.perf_counter()
+    try:
+        master_response = await execute_master(
+            payload.model_copy(update={"explicit_mode": mode, "speculative": False})
+        )
+        worker_response = await run_worker(master_response)
+        record["status"] = "completed"
+        record["usage"] = worker_response.usage
+        return worker_response
+    except asyncio.CancelledError:
+        record["status"] = "cancelled"
+        raise
+    except HTTPException as exc:
+        record["status"] = "failed"
+        record["error"] = str(exc.detail)
+        raise
+    finally:
+        record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Response, status
+
+from ..artifact_store import get_artifact_store
+
+router = APIRouter(prefix="/artifacts", tags=["artifacts"])
+
+
+@router.get("/{ref}")
+async def get_artifact(ref: str) -> Response:
+    body = get_artifact_store().get_bytes(ref)
+    if body is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="artifact not found")
+    return Response(content=body, media_type="application/json")
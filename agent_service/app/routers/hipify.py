@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from ..schemas import HipifyBatchRequest
+from ..hipify_batch import service as hipify_batch_service
+
+router = APIRouter(prefix="/hipify", tags=["hipify"])
+
+
+@router.post("/batch")
+async def run_hipify_batch(payload: HipifyBatchRequest) -> StreamingResponse:
+    stream = await hipify_batch_service.stream_batch(payload)
+    return StreamingResponse(stream, media_type="application/x-ndjson")
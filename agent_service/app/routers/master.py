@@ -1,8 +1,16 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request, status
 
-from ..schemas import MasterRouteRequest, MasterRouteResponse
+from ..schemas import (
+    MasterRouteBatchRequest,
+    MasterRouteBatchResponse,
+    MasterRouteRequest,
+    MasterRouteResponse,
+)
+from ..artifact_store import by_reference
+from ..config import get_settings
+from ..master_agent import logic as master_logic
 from ..master_agent import service as master_service
 
 router = APIRouter(prefix="/master", tags=["master"])
@@ -10,4 +18,19 @@ router = APIRouter(prefix="/master", tags=["master"])
 
 @router.post("/route", response_model=MasterRouteResponse)
 async def route_payload(payload: MasterRouteRequest) -> MasterRouteResponse:
-    return await master_service.execute_master(payload)
+    return by_reference(await master_service.execute_master(payload))
+
+
+@router.post("/route_log", response_model=MasterRouteResponse)
+async def route_log(request: Request, session_id: str) -> MasterRouteResponse:
+    return by_reference(await master_service.execute_master_log(session_id, request.stream()))
+
+
+@router.post("/route_batch", response_model=MasterRouteBatchResponse)
+async def route_batch(payload: MasterRouteBatchRequest) -> MasterRouteBatchResponse:
+    if len(payload.items) > get_settings().route_batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"at most {get_settings().route_batch_max_items} items per batch",
+        )
+    return master_logic.route_batch(payload)
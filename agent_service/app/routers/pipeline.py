@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Tuple
+
+import httpx
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from ..schemas import MasterRouteRequest, PipelineResponse
+from ..pipeline import service as pipeline_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="", tags=["pipeline"])
+
+
+@router.post("/pipeline", response_model=PipelineResponse)
+async def run_pipeline(payload: MasterRouteRequest) -> PipelineResponse:
+    return await pipeline_service.run_pipeline(payload)
+
+
+@router.post("/pipeline/stream")
+async def stream_pipeline(payload: MasterRouteRequest) -> StreamingResponse:
+    """``/pipeline`` as server-sent events; see ``pipeline_service.stream_pipeline``.
+
+    A failure is reported as an ``error`` event with ``status_code`` and ``detail``.
+    """
+
+    events = pipeline_service.stream_pipeline(payload)
+    return StreamingResponse(_sse_events(events), media_type="text/event-stream")
+
+
+async def _sse_events(events: AsyncIterator[Tuple[str, Dict[str, Any]]]) -> AsyncIterator[str]:
+    try:
+        async for event, data in events:
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    except HTTPException as exc:
+        yield _error_event(exc.status_code, exc.detail)
+    except httpx.HTTPError as exc:
+        yield _error_event(status.HTTP_502_BAD_GATEWAY, str(exc) or type(exc).__name__)
+    except Exception as exc:
+        logger.exception("Pipeline stream failed")
+        yield _error_event(status.HTTP_500_INTERNAL_SERVER_ERROR, str(exc))
+
+
+def _error_event(status_code: int, detail: Any) -> str:
+    error = {"status_code": status_code, "detail": detail}
+    return f"event: error\ndata: {json.dumps(error, ensure_ascii=False)}\n\n"
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, status
+
+from ..schemas import WorkerRequest, WorkerResponse
+from ..workers import get_worker_registry
+
+router = APIRouter(prefix="/worker", tags=["worker"])
+
+
+@router.post("/{mode}", response_model=WorkerResponse)
+async def run_worker(mode: str, payload: WorkerRequest) -> WorkerResponse:
+    if payload.mode != mode:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"payload mode {payload.mode!r} does not match /worker/{mode}",
+        )
+    return await get_worker_registry().run(payload)
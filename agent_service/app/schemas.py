@@ -13,18 +13,44 @@ class MasterRouteRequest(BaseModel):
     explicit_mode: Optional[str] = None
     parallel_modes: List[str] = Field(default_factory=lambda: SUPPORTED_MODES.copy())
     url: Optional[str] = None
+    speculative: bool = False
 
 
 class MasterRouteResponse(BaseModel):
     mode: Literal["document", "code", "error", "hipify", "api"]
-    preprocessed: Dict[str, Any]
+    preprocessed: Dict[str, Any] = Field(default_factory=dict)
+    preprocessed_ref: Optional[str] = None
     raw_input: str
     session_id: str
 
 
+class MasterRouteBatchItem(BaseModel):
+    text: str
+    id: Optional[str] = None
+    url: Optional[str] = None
+    explicit_mode: Optional[str] = None
+
+
+class MasterRouteBatchRequest(BaseModel):
+    items: List[MasterRouteBatchItem]
+    parallel_modes: List[str] = Field(default_factory=lambda: SUPPORTED_MODES.copy())
+
+
+class MasterRouteBatchResult(BaseModel):
+    id: Optional[str] = None
+    mode: str
+    scores: List[int] = Field(description="Routing scores, aligned with score_modes")
+
+
+class MasterRouteBatchResponse(BaseModel):
+    score_modes: List[str]
+    results: List[MasterRouteBatchResult]
+
+
 class WorkerRequest(BaseModel):
     mode: str
-    preprocessed: Dict[str, Any]
+    preprocessed: Dict[str, Any] = Field(default_factory=dict)
+    preprocessed_ref: Optional[str] = None
     raw_input: str
     session_id: str
 
@@ -34,3 +60,26 @@ class WorkerResponse(BaseModel):
     result: Dict[str, Any]
     session_id: str
     usage: Optional[Dict[str, Any]] = None
+
+
+class PipelineResponse(BaseModel):
+    mode: str
+    result: Dict[str, Any]
+    session_id: str
+    usage: Optional[Dict[str, Any]] = None
+    routing: Dict[str, Any] = Field(default_factory=dict)
+    alternatives: Optional[List[Dict[str, Any]]] = None
+
+
+class HipifyBatchFile(BaseModel):
+    path: str
+    content: str
+
+
+class HipifyBatchRequest(BaseModel):
+    session_id: str
+    files: List[HipifyBatchFile] = Field(default_factory=list)
+    archive_base64: Optional[str] = Field(
+        default=None, description="Base64-encoded .zip or .tar(.gz) of a source tree"
+    )
+    review: bool = True
@@ -0,0 +1,4 @@
+"""Worker registry shared by every mode."""
+from .registry import WorkerRegistry, get_worker_registry
+
+__all__ = ["WorkerRegistry", "get_worker_registry"]
@@ -0,0 +1,274 @@
+"""Registry of worker modes and the common path every worker call takes.
+
+A mode registers an async handler. ``document`` runs in-process on the ADK
+Document Worker. The other modes are forwarded to the gateway's worker
+engine. Every call then goes through the same machinery:
+
+* a per-mode concurrency limit,
+* a result cache keyed by mode, preprocessed payload (or its artifact ref)
+  and raw input, with ``context_sync_key`` rewritten on a hit,
+* sharing of identical in-flight calls,
+* ``usage`` annotated with ``worker_ms``, ``queue_ms`` and ``cache``.
+
+A mode may also register a stream handler, which ``stream`` uses to relay
+the worker's output while it is generated. Streamed calls check and fill
+the same cache; modes without one yield only the final response.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from .. import schemas
+from ..artifact_store import by_reference, encode
+from ..config import get_settings
+from ..document_worker import service as document_service
+from ..llm_gateway_client import get_llm_client
+from ..tracing import record_span, span
+
+WorkerHandler = Callable[[schemas.WorkerRequest], Awaitable[schemas.WorkerResponse]]
+# Yields ("token", {"text": ...}) events, then ("result", WorkerResponse).
+WorkerStreamHandler = Callable[[schemas.WorkerRequest], AsyncIterator[Tuple[str, Any]]]
+
+
+@dataclass
+class _Registration:
+    handler: WorkerHandler
+    slots: asyncio.Semaphore
+    cacheable: bool
+    stream_handler: Optional[WorkerStreamHandler] = None
+
+
+class WorkerRegistry:
+    def __init__(self, *, cache_entries: int, cache_ttl_seconds: float) -> None:
+        self._workers: Dict[str, _Registration] = {}
+        self._cache_entries = cache_entries
+        self._cache_ttl = cache_ttl_seconds
+        self._cache: "OrderedDict[str, Tuple[schemas.WorkerResponse, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def register(
+        self,
+        mode: str,
+        handler: WorkerHandler,
+        *,
+        concurrency: int,
+        cacheable: bool = True,
+        stream_handler: Optional[WorkerStreamHandler] = None,
+    ) -> None:
+        self._workers[mode] = _Registration(
+            handler=handler,
+            slots=asyncio.Semaphore(max(concurrency, 1)),
+            cacheable=cacheable,
+            stream_handler=stream_handler,
+        )
+
+    def modes(self) -> List[str]:
+        return list(self._workers)
+
+    async def run(self, request: schemas.WorkerRequest) -> schemas.WorkerResponse:
+        registration = self._registration(request.mode)
+        if not registration.cacheable or self._cache_entries <= 0:
+            return await self._execute(registration, request)
+
+        key = _cache_key(request)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return _for_session(
+                cached, request.session_id, {"cache": "hit", "queue_ms": 0.0, "worker_ms": 0.0}
+            )
+        if key in self._inflight:
+            shared = await asyncio.shield(self._inflight[key])
+            return _for_session(shared, request.session_id, {"cache": "shared"})
+
+        # The call runs in its own task and every caller, this one included,
+        # shields it: cancelling one caller must not cancel the others.
+        task = asyncio.ensure_future(self._execute_and_cache(key, registration, request))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        return await asyncio.shield(task)
+
+    async def stream(self, request: schemas.WorkerRequest) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield ``("token", data)`` events as the worker writes, then ``("result", response)``."""
+
+        registration = self._registration(request.mode)
+        if registration.stream_handler is None:
+            yield "result", await self.run(request)
+            return
+        cacheable = registration.cacheable and self._cache_entries > 0
+        if cacheable:
+            key = _cache_key(request)
+            cached = self._cache_get(key)
+            if cached is not None:
+                usage = {"cache": "hit", "queue_ms": 0.0, "worker_ms": 0.0}
+                yield "result", _for_session(cached, request.session_id, usage)
+                return
+            if key in self._inflight:
+                shared = await asyncio.shield(self._inflight[key])
+                yield "result", _for_session(shared, request.session_id, {"cache": "shared"})
+                return
+
+        response: Optional[schemas.WorkerResponse] = None
+        queued = time.perf_counter()
+        queued_ns = time.time_ns()
+        async with registration.slots:
+            started = time.perf_counter()
+            async for event, data in registration.stream_handler(request):
+                if event == "result":
+                    response = data
+                else:
+                    yield event, data
+            finished = time.perf_counter()
+        # Spans cannot stay open across the yields above; record this one after the fact.
+        record_span(
+            f"worker.{request.mode}",
+            queued_ns,
+            time.time_ns(),
+            queue_ms=round((started - queued) * 1000, 2),
+            streamed=True,
+        )
+        if response is None:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY, detail="worker stream ended without a result"
+            )
+        timings = {
+            "cache": "miss" if cacheable else "off",
+            "queue_ms": round((started - queued) * 1000, 2),
+            "worker_ms": round((finished - started) * 1000, 2),
+        }
+        response = response.model_copy(update={"usage": {**(response.usage or {}), **timings}})
+        if cacheable:
+            self._cache_put(key, response)
+        yield "result", response
+
+    def _registration(self, mode: str) -> _Registration:
+        registration = self._workers.get(mode)
+        if registration is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=f"unknown worker mode: {mode}"
+            )
+        return registration
+
+    async def _execute(
+        self, registration: _Registration, request: schemas.WorkerRequest
+    ) -> schemas.WorkerResponse:
+        queued = time.perf_counter()
+        with span(f"worker.{request.mode}") as current:
+            async with registration.slots:
+                started = time.perf_counter()
+                response = await registration.handler(request)
+                finished = time.perf_counter()
+            if current is not None:
+                current.set(queue_ms=round((started - queued) * 1000, 2))
+        timings = {
+            "cache": "miss" if registration.cacheable and self._cache_entries > 0 else "off",
+            "queue_ms": round((started - queued) * 1000, 2),
+            "worker_ms": round((finished - started) * 1000, 2),
+        }
+        return response.model_copy(update={"usage": {**(response.usage or {}), **timings}})
+
+    async def _execute_and_cache(
+        self, key: str, registration: _Registration, request: schemas.WorkerRequest
+    ) -> schemas.WorkerResponse:
+        response = await self._execute(registration, request)
+        self._cache_put(key, response)
+        return response
+
+    def _finish_inflight(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark retrieved so waiter-less failures are not logged as unhandled.
+            task.exception()
+
+    def _cache_get(self, key: str) -> Optional[schemas.WorkerResponse]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        response, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return response
+
+    def _cache_put(self, key: str, response: schemas.WorkerResponse) -> None:
+        self._cache[key] = (response, time.monotonic() + self._cache_ttl)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_entries:
+            self._cache.popitem(last=False)
+
+
+def _cache_key(request: schemas.WorkerRequest) -> str:
+    digest = hashlib.sha256()
+    digest.update(request.mode.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(
+        request.preprocessed_ref.encode("utf-8")
+        if request.preprocessed_ref
+        else encode(request.preprocessed)
+    )
+    digest.update(b"\0")
+    digest.update(request.raw_input.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _for_session(
+    response: schemas.WorkerResponse, session_id: str, usage: Dict[str, Any]
+) -> schemas.WorkerResponse:
+    return response.model_copy(
+        update={
+            "result": {**response.result, "context_sync_key": session_id},
+            "session_id": session_id,
+            "usage": {**(response.usage or {}), **usage},
+        }
+    )
+
+
+async def _call_gateway(request: schemas.WorkerRequest) -> schemas.WorkerResponse:
+    response = await get_llm_client().call_worker(
+        request.mode, by_reference(request).model_dump(exclude_none=True)
+    )
+    return schemas.WorkerResponse.model_validate(response)
+
+
+async def _stream_gateway(request: schemas.WorkerRequest) -> AsyncIterator[Tuple[str, Any]]:
+    payload = by_reference(request).model_dump(exclude_none=True)
+    async for event, data in get_llm_client().stream_worker(request.mode, payload):
+        if event == "result":
+            yield event, schemas.WorkerResponse.model_validate(data)
+        else:
+            yield event, data
+
+
+_REGISTRY: Optional[WorkerRegistry] = None
+
+
+def get_worker_registry() -> WorkerRegistry:
+    global _REGISTRY
+    if _REGISTRY is None:
+        settings = get_settings()
+        registry = WorkerRegistry(
+            cache_entries=settings.worker_cache_entries,
+            cache_ttl_seconds=settings.worker_cache_ttl_seconds,
+        )
+        registry.register(
+            "document",
+            document_service.generate_document_response,
+            concurrency=settings.worker_concurrency,
+        )
+        for mode in ("code", "error", "hipify", "api"):
+            registry.register(
+                mode,
+                _call_gateway,
+                concurrency=settings.worker_concurrency,
+                stream_handler=_stream_gateway,
+            )
+        _REGISTRY = registry
+    return _REGISTRY
@@ -0,0 +1,126 @@
+"""Benchmark per-request agent execution overhead.
+
+Compares three ways of running the Master Agent once per request:
+
+* ``fresh``  - a new ``InMemoryRunner`` per call (the original behaviour),
+* ``pooled`` - the shared runner from ``get_runner`` (``direct=False``),
+* ``direct`` - the fast path calling ``compute_state_delta``.
+
+It then fires ``--concurrent`` runner-path requests that share one
+session id and checks that none of them comes back without a result.
+
+Run from ``agent_service``::
+
+    python -m benchmarks.bench_adk_runner --requests 500 --concurrent 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from app import master_agent as _master_package  # noqa: F401  (must load before adk_app.master_agent)
+from app import schemas
+from app.adk_app.master_agent import MasterAgent
+from app.adk_app.runner import DEFAULT_USER_ID, run_adk_agent
+
+APP_NAME = "bench-master"
+SAMPLE_CODE = """__global__ void add(const float* a, float* b, int n) {
+    int i = blockIdx.x * blockDim.x + threadIdx.x;
+    b[i] += a[i];
+}
+"""
+
+
+async def run_fresh(agent: MasterAgent, session_id: str, state: dict, text: str) -> dict:
+    runner = InMemoryRunner(agent=agent, app_name=APP_NAME)
+    service = runner.session_service
+    await service.create_session(
+        app_name=APP_NAME, user_id=DEFAULT_USER_ID, session_id=session_id, state=state
+    )
+    content = types.Content(role="user", parts=[types.Part(text=text)])
+    async for _ in runner.run_async(user_id=DEFAULT_USER_ID, session_id=session_id, new_message=content):
+        pass
+    session = await service.get_session(app_name=APP_NAME, user_id=DEFAULT_USER_ID, session_id=session_id)
+    await service.delete_session(app_name=APP_NAME, user_id=DEFAULT_USER_ID, session_id=session_id)
+    return session.state if session else {}
+
+
+async def measure(call: Callable[[int], Awaitable[dict]], requests: int) -> List[float]:
+    await call(-1)  # warm up
+    samples: List[float] = []
+    for index in range(requests):
+        start = time.perf_counter()
+        state = await call(index)
+        samples.append(time.perf_counter() - start)
+        assert state.get("master_response"), "agent produced no response"
+    return samples
+
+
+def report(label: str, samples: List[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:7s} mean {statistics.mean(samples) * 1000:7.3f} ms  "
+        f"p50 {statistics.median(samples) * 1000:7.3f} ms  p95 {p95 * 1000:7.3f} ms"
+    )
+
+
+async def check_shared_session(agent: MasterAgent, concurrent: int) -> None:
+    async def one(index: int) -> bool:
+        payload = schemas.MasterRouteRequest(text=f"{SAMPLE_CODE}// {index}", session_id="shared")
+        state = await run_adk_agent(
+            agent, session_id="shared-master", app_name=APP_NAME,
+            state={"master_request": payload.model_dump()}, user_message=payload.text,
+            direct=False,
+        )
+        response = state.get("master_response") or {}
+        return response.get("raw_input", "").endswith(f"// {index}")
+
+    results = await asyncio.gather(*(one(index) for index in range(concurrent)))
+    print(f"shared session: {concurrent} concurrent requests, {results.count(False)} lost or mixed up")
+
+
+async def main_async(requests: int, concurrent: int) -> None:
+    agent = MasterAgent()
+
+    def state_for(index: int) -> dict:
+        payload = schemas.MasterRouteRequest(text=SAMPLE_CODE, session_id=f"bench-{index}")
+        return {"master_request": payload.model_dump()}
+
+    async def fresh(index: int) -> dict:
+        return await run_fresh(agent, f"bench-{index}-master", state_for(index), SAMPLE_CODE)
+
+    async def pooled(index: int) -> dict:
+        return await run_adk_agent(
+            agent, session_id=f"bench-{index}-master", app_name=APP_NAME,
+            state=state_for(index), user_message=SAMPLE_CODE, direct=False,
+        )
+
+    async def direct(index: int) -> dict:
+        return await run_adk_agent(
+            agent, session_id=f"bench-{index}-master", app_name=APP_NAME,
+            state=state_for(index), user_message=SAMPLE_CODE, direct=True,
+        )
+
+    for label, call in (("fresh", fresh), ("pooled", pooled), ("direct", direct)):
+        report(label, await measure(call, requests))
+    if concurrent:
+        await check_shared_session(agent, concurrent)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrent", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.requests, args.concurrent))
+
+
+if __name__ == "__main__":
+    main()
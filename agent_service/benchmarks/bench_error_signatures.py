@@ -0,0 +1,88 @@
+"""Benchmark Error Signature DB matching on multi-megabyte synthetic logs.
+
+Run from ``agent_service``::
+
+    python -m benchmarks.bench_error_signatures --sizes 1 8 32
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List
+
+from app.master_agent import error_signatures
+from app.master_agent.literal_trie import LiteralTrie
+
+FILLER_LINES = [
+    "INFO step 1200 loss=0.4312 lr=3.0e-4 throughput=1893.2 samples/s",
+    "DEBUG allocator: reserved 18.2 GiB, allocated 17.9 GiB on device 0",
+    "  at launch_kernel (/src/ops/gemm.cpp:214)",
+    "hipMemcpyAsync(dst=0x7f3a00000000, src=0x55d0c0001000, bytes=4194304)",
+]
+ERROR_LINES = [
+    "Memory access fault by GPU node-2 (Agent handle: 0x55d0) on address 0x7f3a. "
+    "Reason: Page not present or supervisor privilege.",
+    "RuntimeError: HIP error: an illegal memory access was encountered",
+    "torch.OutOfMemoryError: HIP out of memory. Tried to allocate 2.00 GiB",
+    "rocblas_status_invalid_size returned from rocblas_sgemm",
+]
+
+
+def build_log(size_mb: float) -> str:
+    lines: List[str] = []
+    total = 0
+    target = int(size_mb * 1024 * 1024)
+    index = 0
+    while total < target:
+        if index % 997 == 0:
+            line = ERROR_LINES[(index // 997) % len(ERROR_LINES)]
+        else:
+            line = FILLER_LINES[index % len(FILLER_LINES)]
+        lines.append(line)
+        total += len(line) + 1
+        index += 1
+    return "\n".join(lines)
+
+
+def time_call(func, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1, 4, 16])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--extra-signatures",
+        type=int,
+        default=5000,
+        help="synthetic signatures added to show matching cost is independent of DB size",
+    )
+    args = parser.parse_args()
+
+    signatures = list(error_signatures.SIGNATURES)
+    inflated = LiteralTrie(
+        signatures + [f"rocm_synthetic_status_{i}" for i in range(args.extra_signatures)],
+        ignore_case=True,
+    )
+
+    print(f"signatures: {len(signatures)} (inflated: {len(signatures) + args.extra_signatures})")
+    for size in args.sizes:
+        log = build_log(size)
+        megabytes = len(log) / (1024 * 1024)
+        db_time = time_call(error_signatures.classify_error, log, args.repeat)
+        inflated_time = time_call(lambda text: sum(1 for _ in inflated.finditer(text)), log, args.repeat)
+        print(
+            f"{megabytes:7.1f} MB  classify {db_time * 1000:8.1f} ms "
+            f"({megabytes / db_time:6.1f} MB/s)  inflated DB {inflated_time * 1000:8.1f} ms "
+            f"({megabytes / inflated_time:6.1f} MB/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Micro-benchmarks for the deterministic hot paths, over a checked-in corpus.
+
+Covers HTML parsing for document mode, routing (``rule_based_detect`` and
+``compute_scores``), ``preprocess_payload`` per mode, the gateway's
+document output parsers, and ``_normalize_document_result``. Inputs come
+from ``benchmarks/corpus``: ROCm doc pages (Sphinx and Doxygen markup),
+CUDA sources, error logs and vLLM document outputs. Nothing touches the
+network.
+
+Each case reports ops/s (best of ``--repeat`` timed rounds) and the peak
+memory allocated by one call, and is compared with a stored baseline.
+Baselines are machine-specific; record one before making a change.
+
+Run from ``agent_service``::
+
+    python -m benchmarks.bench_hot_paths --save-baseline
+    python -m benchmarks.bench_hot_paths --fail-on-regression
+    python -m benchmarks.bench_hot_paths --filter route.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import importlib.util
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app import master_agent as _master_package  # noqa: F401  (must load before adk_app)
+from app.adk_app.document_agent import _normalize_document_result
+from app.master_agent import document_fetcher, rules, scoring
+from app.master_agent.preprocess import preprocess_payload
+from app.schemas import MasterRouteRequest
+
+BENCH_DIR = Path(__file__).resolve().parent
+CORPUS = BENCH_DIR / "corpus"
+DEFAULT_BASELINE = BENCH_DIR / "hot_paths_baseline.json"
+GATEWAY_APP = BENCH_DIR.parents[1] / "llm_gateway" / "app"
+GATEWAY_PACKAGE = "llm_gateway_app"
+DOCUMENT_URL = "https://rocm.docs.amd.com/projects/HIP/en/latest/install/install.html"
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[], Any]
+
+
+def read(relative: str) -> str:
+    return (CORPUS / relative).read_text(encoding="utf-8")
+
+
+def load_gateway_module(name: str) -> ModuleType:
+    """Import ``llm_gateway/app/<name>.py``; that package is also called ``app``."""
+
+    if GATEWAY_PACKAGE not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            GATEWAY_PACKAGE,
+            GATEWAY_APP / "__init__.py",
+            submodule_search_locations=[str(GATEWAY_APP)],
+        )
+        package = importlib.util.module_from_spec(spec)
+        sys.modules[GATEWAY_PACKAGE] = package
+        spec.loader.exec_module(package)
+    return importlib.import_module(f"{GATEWAY_PACKAGE}.{name}")
+
+
+def build_cases() -> List[Case]:
+    cases: List[Case] = []
+
+    for page in sorted((CORPUS / "html").glob("*.html")):
+        html = page.read_text(encoding="utf-8")
+        cases.append(
+            Case(
+                f"document.parse[{page.stem}]",
+                lambda html=html: document_fetcher.parse_document(html, DOCUMENT_URL),
+            )
+        )
+
+    routing_inputs = {
+        "code": read("cuda/vector_add.cu"),
+        "error": read("logs/hip_oom.log"),
+        "log": read("logs/training_run.log"),
+        "url": f"Summarize the install steps in {DOCUMENT_URL}",
+        "api": "hipMemcpyAsync",
+        "question": "What is the difference between a wavefront and a warp on MI300X?",
+    }
+    for label, text in routing_inputs.items():
+        payload = MasterRouteRequest(text=text, session_id="bench")
+        cases.append(Case(f"route.rules[{label}]", lambda p=payload: rules.rule_based_detect(p)))
+        cases.append(Case(f"route.scores[{label}]", lambda p=payload: scoring.compute_scores(p)))
+
+    preprocess_inputs: List[Tuple[str, str, str]] = [
+        ("document", "document", "How do I install HIP on an NVIDIA machine?"),
+        ("code", "code", read("cuda/matmul_shared.cu")),
+        ("error", "error", read("logs/memory_access_fault.log")),
+        ("error", "error-digest", read("logs/training_run.log")),
+        ("hipify", "hipify", read("cuda/reduction.cu")),
+        ("api", "api", "hipMallocAsync"),
+    ]
+    for mode, label, text in preprocess_inputs:
+        payload = MasterRouteRequest(text=text, session_id="bench")
+        cases.append(
+            Case(f"preprocess[{label}]", lambda m=mode, p=payload: preprocess_payload(m, p))
+        )
+
+    document_llm = load_gateway_module("document_llm")
+    for output in sorted((CORPUS / "vllm").glob("document_*.txt")):
+        content = output.read_text(encoding="utf-8")
+        cases.append(
+            Case(
+                f"gateway.parse_structured[{output.stem}]",
+                lambda c=content: document_llm._parse_structured_text(c),
+            )
+        )
+    markdown = read("vllm/document_markdown.txt")
+    cases.append(
+        Case("gateway.parse_markdown", lambda: document_llm._parse_markdown_sections(markdown))
+    )
+
+    results = json.loads(read("vllm/document_results.json"))
+    cases.append(
+        Case(
+            "document.normalize_result",
+            lambda: [_normalize_document_result(result, "bench") for result in results],
+        )
+    )
+    return cases
+
+
+def ops_per_second(case: Case, min_time: float, repeat: int) -> float:
+    """Best rate over ``repeat`` rounds, each running at least ``min_time`` seconds."""
+
+    case.run()  # warm up caches and lazy imports
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            case.run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        calls *= 2
+    best = calls / elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            case.run()
+        best = max(best, calls / (time.perf_counter() - start))
+    return best
+
+
+def peak_allocated(case: Case) -> int:
+    """Peak bytes allocated during one call, above what was allocated before it."""
+
+    tracemalloc.start()
+    try:
+        case.run()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return max(peak - before, 0)
+
+
+def compare(
+    ops: float, baseline: Optional[Dict[str, float]], threshold: float
+) -> Tuple[str, bool]:
+    if not baseline or "ops_per_sec" not in baseline:
+        return "", False
+    change = ops / baseline["ops_per_sec"] - 1
+    regressed = change < -threshold
+    return f"{change * 100:+6.1f}%{'  REGRESSED' if regressed else ''}", regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="only cases whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per timed round")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="ops/s drop flagged as a regression"
+    )
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    baseline: Dict[str, Dict[str, float]] = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+
+    cases = [case for case in build_cases() if args.filter in case.name]
+    width = max((len(case.name) for case in cases), default=10)
+    print(f"{'case':<{width}}  {'ops/s':>11} {'us/op':>9} {'peak KiB':>9}  vs baseline")
+    results: Dict[str, Dict[str, float]] = {}
+    regressions = 0
+    for case in cases:
+        ops = ops_per_second(case, args.min_time, args.repeat)
+        peak = peak_allocated(case)
+        results[case.name] = {"ops_per_sec": round(ops, 1), "peak_bytes": peak}
+        delta, regressed = compare(ops, baseline.get(case.name), args.threshold)
+        regressions += regressed
+        print(
+            f"{case.name:<{width}}  {ops:11,.0f} {1e6 / ops:9.1f} {peak / 1024:9.1f}  {delta}"
+        )
+
+    if args.save_baseline:
+        encoded = json.dumps(results, indent=1, sort_keys=True) + "\n"
+        args.baseline.write_text(encoded, encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+    elif not baseline:
+        print(f"no baseline at {args.baseline}; record one with --save-baseline")
+    elif regressions:
+        print(f"{regressions} case(s) slower than baseline by more than {args.threshold:.0%}")
+        if args.fail_on_regression:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
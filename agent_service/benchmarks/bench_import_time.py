@@ -0,0 +1,84 @@
+"""Measure how long a service takes to import, and which modules cost most.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter
+``--repeat`` times, keeps the fastest run, and prints the total plus the
+most expensive top-level packages (cumulative time, children included).
+
+Run from any service directory, e.g. from ``agent_service``::
+
+    python -m benchmarks.bench_import_time --module app.main
+    python -m benchmarks.bench_import_time --cwd ../llm_gateway --module app.main
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# "import time:      self [us] |  cumulative | imported package"
+LINE_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+# Deferred off the import path; they should be loaded by warmup instead.
+HEAVY_PACKAGES = ("google.adk.runners", "google.genai.types", "openai", "bs4")
+
+
+def measure(module: str, cwd: str) -> Tuple[int, List[Tuple[str, int, int]]]:
+    """Return total microseconds and ``(name, depth, cumulative us)`` per import."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise SystemExit(result.stderr.strip().splitlines()[-1])
+    imports: List[Tuple[str, int, int]] = []
+    for line in result.stderr.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match is None:
+            continue
+        _, cumulative, indent, name = match.groups()
+        imports.append((name, len(indent) // 2, int(cumulative)))
+    total = sum(cumulative for _, depth, cumulative in imports if depth == 0)
+    return total, imports
+
+
+def top_packages(imports: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """Cumulative time per top-level package (its outermost import dominates)."""
+
+    packages: Dict[str, int] = {}
+    for name, _, cumulative in imports:
+        package = name.split(".")[0]
+        packages[package] = max(packages.get(package, 0), cumulative)
+    return packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--cwd", default=os.getcwd(), help="service directory")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    best_total, best_imports = measure(args.module, args.cwd)
+    for _ in range(args.repeat - 1):
+        total, imports = measure(args.module, args.cwd)
+        if total < best_total:
+            best_total, best_imports = total, imports
+
+    print(f"import {args.module}: {best_total / 1000:.1f} ms (best of {args.repeat})")
+    ranked = sorted(top_packages(best_imports).items(), key=lambda item: -item[1])
+    for package, cumulative in ranked[: args.top]:
+        print(f"  {package:<32} {cumulative / 1000:8.1f} ms")
+    loaded = {name for name, _, _ in best_imports}
+    heavy = [name for name in HEAVY_PACKAGES if name in loaded]
+    print(f"heavy packages loaded at import: {', '.join(heavy) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#include <cstdio>
+#include <cuda_runtime.h>
+#include <cooperative_groups.h>
+
+namespace cg = cooperative_groups;
+
+template <unsigned int BLOCK>
+__global__ void reduce_sum(const float* input, float* partial, unsigned int n) {
+    extern __shared__ float sdata[];
+    cg::thread_block block = cg::this_thread_block();
+
+    unsigned int tid = threadIdx.x;
+    unsigned int i = blockIdx.x * (BLOCK * 2) + threadIdx.x;
+    float sum = 0.0f;
+    while (i < n) {
+        sum += input[i];
+        if (i + BLOCK < n) {
+            sum += input[i + BLOCK];
+        }
+        i += gridDim.x * BLOCK * 2;
+    }
+    sdata[tid] = sum;
+    cg::sync(block);
+
+    for (unsigned int s = BLOCK / 2; s > 32; s >>= 1) {
+        if (tid < s) {
+            sdata[tid] = sum = sum + sdata[tid + s];
+        }
+        cg::sync(block);
+    }
+
+    if (tid < 32) {
+        // Warp-synchronous tail assumes a warp of 32 lanes.
+        for (int offset = 16; offset > 0; offset /= 2) {
+            sum += __shfl_down_sync(0xffffffff, sum, offset);
+        }
+    }
+    if (tid == 0) {
+        atomicAdd(partial, sum);
+    }
+}
+
+int main() {
+    const unsigned int n = 1u << 26;
+    float* d_in;
+    float* d_out;
+    cudaMalloc(&d_in, n * sizeof(float));
+    cudaMallocManaged(&d_out, sizeof(float));
+    *d_out = 0.0f;
+
+    int device = 0;
+    cudaDeviceProp prop;
+    cudaGetDeviceProperties(&prop, device);
+    const int blocks = prop.multiProcessorCount * 4;
+    constexpr unsigned int threads = 256;
+
+    reduce_sum<threads><<<blocks, threads, threads * sizeof(float)>>>(d_in, d_out, n);
+    cudaError_t err = cudaDeviceSynchronize();
+    if (err != cudaSuccess) {
+        printf("reduction failed: %s\n", cudaGetErrorString(err));
+        return 1;
+    }
+    printf("sum = %f on %s (warpSize %d)\n", *d_out, prop.name, prop.warpSize);
+    cudaFree(d_in);
+    cudaFree(d_out);
+    return 0;
+}
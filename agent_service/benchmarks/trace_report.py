@@ -0,0 +1,129 @@
+"""Summarise exported trace spans into per-stage latency percentiles.
+
+Reads the OTLP/JSON lines written by ``app.tracing`` in each service (one
+file per service, or one shared file) and prints count, p50, p90, p99 and
+max duration for every span name, grouped by service.
+
+Run from ``agent_service``::
+
+    python -m benchmarks.trace_report traces/*.jsonl --root "POST /analyze/document"
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+PERCENTILES = (50, 90, 99)
+
+# (service, trace id, span id, parent span id, name, duration in ms)
+SpanRow = Tuple[str, str, str, Optional[str], str, float]
+
+
+def read_spans(paths: Iterable[str]) -> Iterator[SpanRow]:
+    for path in paths:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                for resource_spans in request.get("resourceSpans", []):
+                    service = _service_name(resource_spans.get("resource", {}))
+                    for scope_spans in resource_spans.get("scopeSpans", []):
+                        for span in scope_spans.get("spans", []):
+                            duration_ns = int(span["endTimeUnixNano"]) - int(
+                                span["startTimeUnixNano"]
+                            )
+                            yield (
+                                service,
+                                span["traceId"],
+                                span["spanId"],
+                                span.get("parentSpanId"),
+                                span["name"],
+                                duration_ns / 1e6,
+                            )
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarise(
+    spans: List[SpanRow], root: Optional[str] = None
+) -> Dict[Tuple[str, str], List[float]]:
+    """Group span durations by ``(service, name)``.
+
+    With ``root`` set, only traces whose root span has that name are kept.
+    A root is a span with no parent in the collected data.
+    """
+
+    if root is not None:
+        span_ids = {row[2] for row in spans}
+        traces: Set[str] = {
+            trace_id
+            for _, trace_id, _, parent_id, name, _ in spans
+            if name == root and (parent_id is None or parent_id not in span_ids)
+        }
+        spans = [row for row in spans if row[1] in traces]
+
+    durations: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+    for service, _, _, _, name, duration_ms in spans:
+        durations[(service, name)].append(duration_ms)
+    for values in durations.values():
+        values.sort()
+    return durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="trace JSONL files")
+    parser.add_argument("--root", help="only traces whose root span has this name")
+    parser.add_argument(
+        "--sort",
+        choices=("p50", "p99", "total", "name"),
+        default="total",
+        help="row order (total = summed time across all spans of a stage)",
+    )
+    args = parser.parse_args()
+
+    durations = summarise(list(read_spans(args.paths)), args.root)
+    if not durations:
+        print("no spans found")
+        return
+
+    def sort_key(item: Tuple[Tuple[str, str], List[float]]):
+        (service, name), values = item
+        if args.sort == "name":
+            return (service, name)
+        if args.sort == "p50":
+            return (-percentile(values, 50),)
+        if args.sort == "p99":
+            return (-percentile(values, 99),)
+        return (-sum(values),)
+
+    width = max(len(f"{service} {name}") for service, name in durations)
+    header = "".join(f"{f'p{pct}':>10}" for pct in PERCENTILES)
+    print(f"{'stage':<{width}}  {'count':>7}{header}{'max':>10}   (ms)")
+    for (service, name), values in sorted(durations.items(), key=sort_key):
+        cells = "".join(f"{percentile(values, pct):10.1f}" for pct in PERCENTILES)
+        print(f"{f'{service} {name}':<{width}}  {len(values):7d}{cells}{values[-1]:10.1f}")
+
+
+def _service_name(resource: dict) -> str:
+    for attribute in resource.get("attributes", []):
+        if attribute.get("key") == "service.name":
+            return attribute.get("value", {}).get("stringValue", "unknown")
+    return "unknown"
+
+
+if __name__ == "__main__":
+    main()
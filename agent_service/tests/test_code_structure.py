@@ -0,0 +1,62 @@
+import time
+
+from app.master_agent.code_structure import extract_code_structure
+
+KERNEL_SOURCE = """
+__global__ void __launch_bounds__(256) add(const float* __restrict__ a, float *b, int n) {
+  __shared__ float tile[256];
+  int i = blockIdx.x * blockDim.x + threadIdx.x;
+  b[i] = a[i] + tile[0];
+}
+"""
+
+
+def test_kernel_and_shared_declarations():
+    result = extract_code_structure(KERNEL_SOURCE)
+
+    kernel = result["kernels"][0]
+    assert kernel["name"] == "add"
+    assert kernel["line"] == 2
+    assert kernel["pointer_params"] == ["a", "b"]
+    assert result["pointer_metadata"]["tile"] == "shared"
+
+
+def test_prose_after_qualifiers_does_not_backtrack():
+    words = " ".join(["kernel"] * 200)
+    prompts = [
+        f"why does my __global__ kernel {words} crash",
+        f"my __shared__ buffer {words} looks wrong",
+    ]
+
+    for prompt in prompts:
+        started = time.perf_counter()
+        result = extract_code_structure(prompt)
+        assert time.perf_counter() - started < 0.5
+        assert result["kernels"] == []
+
+
+def test_digit_separators_do_not_hide_the_rest_of_the_line():
+    result = extract_code_structure("int n = 1'000'000; float* d; cudaMalloc(&d, n);")
+
+    assert result["api_list"] == ["cudaMalloc"]
+    assert result["pointer_metadata"] == {"d": "device"}
+
+
+def test_qualified_name_chains_do_not_backtrack():
+    prompts = [
+        "__global__ void " + "ns::" * 40 + "x",
+        "__global__ void " + "a:" * 200,
+        "__shared__ " + "ns::" * 40 + "x",
+        "__shared__ " + "a:" * 200,
+    ]
+
+    for prompt in prompts:
+        started = time.perf_counter()
+        extract_code_structure(prompt)
+        assert time.perf_counter() - started < 0.5
+
+
+def test_qualified_kernel_name():
+    result = extract_code_structure("__global__ void ns::add(float* a) { }")
+
+    assert [kernel["name"] for kernel in result["kernels"]] == ["add"]
@@ -0,0 +1,21 @@
+from app.master_agent.hipify import hipify_source
+
+
+def test_digit_separators_are_not_char_literals():
+    code = "size_t n = 1'000'000; cudaMalloc(&p, n);\nint mask = 0xFF'FF; cudaFree(p);"
+
+    result = hipify_source(code)
+
+    assert result["hipified_code"] == (
+        "size_t n = 1'000'000; hipMalloc(&p, n);\nint mask = 0xFF'FF; hipFree(p);"
+    )
+
+
+def test_char_and_string_literals_are_left_alone():
+    code = "char q = '\"'; wchar_t w = L'\"'; const char* s = \"cudaMalloc\"; cudaFree(p);"
+
+    result = hipify_source(code)
+
+    assert result["hipified_code"] == (
+        "char q = '\"'; wchar_t w = L'\"'; const char* s = \"cudaMalloc\"; hipFree(p);"
+    )
@@ -0,0 +1,50 @@
+import pytest
+from fastapi import HTTPException
+
+from app import schemas
+from app.hipify_batch import service
+
+
+def test_cache_evicts_by_bytes():
+    cache = service._LRUCache(capacity=10, max_bytes=120)
+
+    cache.put("a", {"code": "x" * 40})
+    cache.put("b", {"code": "y" * 40})
+    cache.put("c", {"code": "z" * 40})
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.get("c") is not None
+
+
+def test_cache_skips_entries_larger_than_its_budget():
+    cache = service._LRUCache(capacity=10, max_bytes=100)
+
+    cache.put("big", {"code": "x" * 200})
+
+    assert cache.get("big") is None
+
+
+def test_inline_files_count_towards_the_batch_limits(monkeypatch):
+    monkeypatch.setattr(service, "MAX_BATCH_FILES", 2)
+    payload = schemas.HipifyBatchRequest(
+        session_id="s",
+        files=[schemas.HipifyBatchFile(path=f"{index}.cu", content="") for index in range(3)],
+    )
+
+    with pytest.raises(HTTPException) as excinfo:
+        service._collect_files(payload)
+
+    assert excinfo.value.status_code == 413
+
+
+def test_inline_bytes_count_towards_the_batch_limits(monkeypatch):
+    monkeypatch.setattr(service, "MAX_TOTAL_BYTES", 10)
+    payload = schemas.HipifyBatchRequest(
+        session_id="s", files=[schemas.HipifyBatchFile(path="a.cu", content="x" * 11)]
+    )
+
+    with pytest.raises(HTTPException) as excinfo:
+        service._collect_files(payload)
+
+    assert excinfo.value.status_code == 413
@@ -1,44 +1,138 @@
 """HTTP client for interacting with agent service."""
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, AsyncIterator, Optional
 
 import httpx
 from fastapi import HTTPException, status
 
 from .config import get_settings
+from .tracing import inject, span
 from . import schemas
 
 
 class AgentServiceClient:
-    """Simple wrapper around agent service HTTP API."""
+    """Simple wrapper around agent service HTTP API.
+
+    All calls share one pooled ``httpx.AsyncClient``, so concurrent requests
+    reuse keep-alive connections instead of opening one each.
+    """
 
     def __init__(self) -> None:
         settings = get_settings()
         self._base_url = settings.agent_service_url.rstrip("/")
         self._timeout = settings.agent_service_timeout
+        self._max_connections = settings.agent_service_max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def warm_up(self) -> None:
+        """Open a pooled connection to the agent service before the first request."""
+
+        response = await self._get_client().get(f"{self._base_url}/healthz")
+        response.raise_for_status()
 
     async def route_request(
-        self, payload: schemas.MasterRouteRequest
+        self, payload: schemas.MasterRouteRequest, timeout: Optional[float] = None
+    ) -> schemas.MasterRouteResponse:
+        response_data = await self._post(
+            "/master/route", payload.model_dump(exclude_none=True), timeout=timeout
+        )
+        return schemas.MasterRouteResponse.model_validate(response_data)
+
+    async def run_pipeline(
+        self, payload: schemas.MasterRouteRequest, timeout: Optional[float] = None
+    ) -> schemas.PipelineResponse:
+        response_data = await self._post(
+            "/pipeline", payload.model_dump(exclude_none=True), timeout=timeout
+        )
+        return schemas.PipelineResponse.model_validate(response_data)
+
+    async def route_log(
+        self, session_id: str, chunks: AsyncIterator[bytes]
     ) -> schemas.MasterRouteResponse:
-        response_data = await self._post("/master/route", payload.model_dump(exclude_none=True))
+        response_data = await self._post(
+            "/master/route_log", None, params={"session_id": session_id}, content=chunks
+        )
         return schemas.MasterRouteResponse.model_validate(response_data)
 
     async def call_worker(
-        self, mode: str, payload: schemas.WorkerRequest
+        self, mode: str, payload: schemas.WorkerRequest, timeout: Optional[float] = None
     ) -> schemas.WorkerResponse:
         response_data = await self._post(
-            f"/worker/{mode}", payload.model_dump(exclude_none=True)
+            f"/worker/{mode}", payload.model_dump(exclude_none=True), timeout=timeout
         )
         return schemas.WorkerResponse.model_validate(response_data)
 
-    async def _post(self, path: str, json_payload: dict[str, Any]) -> dict[str, Any]:
+    async def stream_hipify_batch(
+        self, payload: schemas.HipifyBatchRequest
+    ) -> AsyncIterator[bytes]:
+        return await self._stream_post("/hipify/batch", payload.model_dump(exclude_none=True))
+
+    async def stream_pipeline(self, payload: schemas.MasterRouteRequest) -> AsyncIterator[bytes]:
+        return await self._stream_post("/pipeline/stream", payload.model_dump(exclude_none=True))
+
+    async def _stream_post(
+        self, path: str, json_payload: dict[str, Any]
+    ) -> AsyncIterator[bytes]:
+        """Open a streamed POST and return an iterator relaying the raw body.
+
+        Connection and status errors are raised before the iterator is
+        returned so callers can still answer with a proper error response.
+        """
+
+        url = f"{self._base_url}{path}"
+        client = self._get_client()
+        try:
+            with span(f"agent_service POST {path}", kind="client"):
+                response = await client.send(
+                    client.build_request("POST", url, json=json_payload, headers=inject()),
+                    stream=True,
+                )
+        except httpx.RequestError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Failed to reach agent service: {exc}",
+            ) from exc
+        if response.is_error:
+            body = await response.aread()
+            await response.aclose()
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"agent service error: {body.decode('utf-8', errors='replace')}",
+            )
+
+        async def _relay() -> AsyncIterator[bytes]:
+            try:
+                async for chunk in response.aiter_raw():
+                    yield chunk
+            finally:
+                await response.aclose()
+
+        return _relay()
+
+    async def _post(
+        self,
+        path: str,
+        json_payload: dict[str, Any] | None,
+        timeout: Optional[float] = None,
+        **request_kwargs: Any,
+    ) -> dict[str, Any]:
         url = f"{self._base_url}{path}"
+        if timeout is not None:
+            # Overrides the client default for this call only.
+            request_kwargs["timeout"] = timeout
         try:
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                response = await client.post(url, json=json_payload)
-                response.raise_for_status()
-                return response.json()
+            with span(f"agent_service POST {path}", kind="client"):
+                response = await self._get_client().post(
+                    url, json=json_payload, headers=inject(), **request_kwargs
+                )
+            response.raise_for_status()
+            return response.json()
         except httpx.RequestError as exc:
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
@@ -50,6 +144,23 @@ class AgentServiceClient:
                 detail=f"agent service error: {exc.response.text}",
             ) from exc
 
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                ),
+            )
+        return self._client
+
+
+_CLIENT: Optional[AgentServiceClient] = None
+
 
 def get_agent_service_client() -> AgentServiceClient:
-    return AgentServiceClient()
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = AgentServiceClient()
+    return _CLIENT
@@ -0,0 +1,218 @@
+"""Analysis steps shared by the HTTP and WebSocket routes and background jobs.
+
+Session store calls may block on disk or the network, so they run through
+``asyncio.to_thread``.
+"""
+from __future__ import annotations
+
+import asyncio
+import codecs
+import json
+from typing import Any, AsyncIterator, Callable, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from .agent_service_client import get_agent_service_client
+from .config import get_settings
+from .result_cache import get_result_cache
+from .session_store import session_store
+from .tracing import span
+from . import schemas
+
+# Called as ``progress(event, **data)`` at each step of an analysis.
+Progress = Callable[..., None]
+
+
+async def analyze(payload: schemas.AnalyzeRequest, mode: Optional[str]) -> schemas.BackendResponse:
+    """Answer ``payload`` through the result cache and record it in its session."""
+
+    await asyncio.to_thread(session_store.create_session, payload.session_id)
+    with span("result_cache.run", mode=mode or "auto") as current:
+        response = await get_result_cache().run(payload, mode, lambda: run_analysis(payload, mode))
+        if current is not None:
+            current.set(result_cache=(response.usage or {}).get("result_cache"))
+    await record_exchange(payload.session_id, payload.text, response.mode, response.result)
+    return response
+
+
+async def analyze_events(
+    payload: schemas.AnalyzeRequest, mode: Optional[str]
+) -> AsyncIterator[Tuple[str, Any]]:
+    """``analyze`` as the event sequence of ``stream_analysis``.
+
+    A cached result is a lone ``result`` event. Otherwise the agent stream is
+    opened here, so failures to start it are raised before any event.
+    """
+
+    await asyncio.to_thread(session_store.create_session, payload.session_id)
+    cached = get_result_cache().lookup(payload, mode)
+    if cached is not None:
+        events = _single("result", cached)
+    else:
+        events = await stream_analysis(payload, mode)
+    return _recorded(payload, mode, events)
+
+
+async def _single(event: str, data: Any) -> AsyncIterator[Tuple[str, Any]]:
+    yield event, data
+
+
+async def _recorded(
+    payload: schemas.AnalyzeRequest, mode: Optional[str], events: AsyncIterator[Tuple[str, Any]]
+) -> AsyncIterator[Tuple[str, Any]]:
+    async for event, data in events:
+        if event == "result":
+            if (data.usage or {}).get("result_cache") != "hit":
+                data = get_result_cache().store(payload, mode, data)
+            await record_exchange(payload.session_id, payload.text, data.mode, data.result)
+        yield event, data
+
+
+async def run_analysis(
+    payload: schemas.AnalyzeRequest,
+    mode: Optional[str],
+    *,
+    timeout: Optional[float] = None,
+    progress: Optional[Progress] = None,
+) -> schemas.BackendResponse:
+    """Route and run ``payload``; ``mode`` None lets the Master Agent pick.
+
+    With ``progress`` the separate route and worker calls are used even when
+    the fused pipeline is enabled, so that each step can be reported.
+    """
+
+    master_request = _master_request(payload, mode)
+    client = get_agent_service_client()
+
+    if get_settings().use_agent_pipeline and progress is None:
+        pipeline_response = await client.run_pipeline(master_request, timeout=timeout)
+        return schemas.BackendResponse(
+            mode=pipeline_response.mode,
+            result=pipeline_response.result,
+            session_id=pipeline_response.session_id,
+            usage=pipeline_response.usage,
+            alternatives=pipeline_response.alternatives,
+        )
+
+    master_response = await client.route_request(master_request, timeout=timeout)
+    if progress is not None:
+        progress("routed", mode=master_response.mode)
+        if master_response.mode == "document":
+            url = master_response.preprocessed.get("url") or payload.url
+            progress("fetched", **({"url": url} if url else {}))
+    return await run_worker(master_response, timeout=timeout, progress=progress)
+
+
+async def stream_analysis(
+    payload: schemas.AnalyzeRequest, mode: Optional[str]
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Start ``payload`` on the agent's ``/pipeline/stream`` and relay its events.
+
+    Returns an iterator of ``(event, data)`` pairs as the agent sends them:
+    ``routed``, ``preprocessed`` and ``token`` with their JSON data, then
+    ``result`` with a ``BackendResponse``. Errors reaching the agent are
+    raised here, before anything is streamed; an ``error`` event later on is
+    raised as ``HTTPException`` from the iterator.
+    """
+
+    chunks = await get_agent_service_client().stream_pipeline(_master_request(payload, mode))
+    return _pipeline_events(chunks)
+
+
+async def _pipeline_events(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[str, Any]]:
+    async for event, data in _parse_sse(chunks):
+        body = json.loads(data)
+        if event == "error":
+            raise HTTPException(
+                status_code=body.get("status_code", status.HTTP_502_BAD_GATEWAY),
+                detail=body.get("detail"),
+            )
+        if event == "result":
+            body = schemas.BackendResponse(
+                mode=body["mode"],
+                result=body["result"],
+                session_id=body["session_id"],
+                usage=body.get("usage"),
+                alternatives=body.get("alternatives"),
+            )
+        yield event, body
+
+
+async def _parse_sse(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[str, str]]:
+    """Split a server-sent event body into ``(event, data)`` as blocks complete."""
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk).replace("\r\n", "\n")
+        *blocks, pending = pending.split("\n\n")
+        for block in blocks:
+            event, data = "message", []
+            for line in block.split("\n"):
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    data.append(line[5:].strip())
+            if data:
+                yield event, "\n".join(data)
+
+
+async def run_worker(
+    master_response: schemas.MasterRouteResponse,
+    *,
+    timeout: Optional[float] = None,
+    progress: Optional[Progress] = None,
+) -> schemas.BackendResponse:
+    worker_request = schemas.WorkerRequest(
+        mode=master_response.mode,
+        preprocessed=master_response.preprocessed,
+        preprocessed_ref=master_response.preprocessed_ref,
+        raw_input=master_response.raw_input,
+        session_id=master_response.session_id,
+    )
+    if progress is not None:
+        progress("generating", mode=master_response.mode)
+    worker_response = await get_agent_service_client().call_worker(
+        master_response.mode, worker_request, timeout=timeout
+    )
+    return schemas.BackendResponse(
+        mode=worker_response.mode,
+        result=worker_response.result,
+        session_id=worker_response.session_id,
+        usage=worker_response.usage,
+    )
+
+
+def _master_request(
+    payload: schemas.AnalyzeRequest, mode: Optional[str]
+) -> schemas.MasterRouteRequest:
+    return schemas.MasterRouteRequest(
+        text=payload.text,
+        session_id=payload.session_id,
+        explicit_mode=mode,
+        parallel_modes=payload.parallel_modes or schemas.SUPPORTED_MODES,
+        url=payload.url,
+        speculative=payload.speculative,
+    )
+
+
+async def record_exchange(
+    session_id: str, user_text: str, mode: str, result: dict[str, Any]
+) -> None:
+    user_entry = {
+        "role": "user",
+        "text": user_text,
+        "mode": mode,
+    }
+    assistant_entry = {
+        "role": "assistant",
+        "mode": mode,
+        "result": result,
+    }
+    with span("session.record", mode=mode):
+        await asyncio.to_thread(_append_entries, session_id, [user_entry, assistant_entry])
+
+
+def _append_entries(session_id: str, entries: list[dict[str, Any]]) -> None:
+    for entry in entries:
+        session_store.append_entry(session_id, entry)
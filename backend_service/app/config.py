@@ -1,5 +1,8 @@
 from functools import lru_cache
 import os
+import socket
+from typing import Dict, List
+
 from pydantic import BaseModel, Field
 
 
@@ -14,6 +17,152 @@ class Settings(BaseModel):
         default=30.0,
         description="Timeout (in seconds) for requests to agent service",
     )
+    agent_service_max_connections: int = Field(
+        default=100,
+        description="Pooled connections to the agent service",
+    )
+    use_agent_pipeline: bool = Field(
+        default=True,
+        description="Use the fused /pipeline endpoint instead of /master/route + /worker",
+    )
+    session_max_entries: int = Field(
+        default=500,
+        description="Entries kept per session; older ones are overwritten",
+    )
+    session_memory_budget_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        description="Total encoded size of stored entries before idle sessions are evicted",
+    )
+    session_lock_stripes: int = Field(
+        default=64,
+        description="Number of locks session ids are striped over",
+    )
+    session_page_size: int = Field(
+        default=50,
+        description="Default number of entries per history page",
+    )
+    session_page_max: int = Field(
+        default=500,
+        description="Largest history page a client may request",
+    )
+    session_long_poll_max_seconds: float = Field(
+        default=60.0,
+        description="Longest wait a /session/history long-poll may request",
+    )
+    session_keepalive_seconds: float = Field(
+        default=15.0,
+        description="Idle interval between keepalive comments on /session/subscribe",
+    )
+    session_backend: str = Field(
+        default="memory",
+        description="Session storage: 'memory', 'sqlite' (durable, WAL-backed) or 'redis' (shared)",
+    )
+    session_db_path: str = Field(
+        default="data/sessions.db",
+        description="SQLite database file used by the sqlite session backend",
+    )
+    session_compact_interval_seconds: float = Field(
+        default=300.0,
+        description="Interval between compactions of the sqlite session backend",
+    )
+    session_retention_seconds: float = Field(
+        default=30 * 24 * 3600.0,
+        description="Idle time after which persisted sessions are deleted; 0 keeps them forever",
+    )
+    shared_state_url: str = Field(
+        default="",
+        description="Redis-protocol server shared by replicas (redis://host:6379/0); empty = local",
+    )
+    shared_state_prefix: str = Field(
+        default="amdlingo:",
+        description="Key prefix for everything stored on the shared-state server",
+    )
+    shared_state_local_entries: int = Field(
+        default=4096,
+        description="Shared-state values kept in the local read-through cache",
+    )
+    shared_state_local_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        description="Total size of values kept in the local read-through cache",
+    )
+    shared_state_local_ttl_seconds: float = Field(
+        default=60.0,
+        description="Longest time a shared-state value is served from the local cache",
+    )
+    replica_id: str = Field(
+        default_factory=socket.gethostname,
+        description="Name of this replica on the session hash ring",
+    )
+    replicas: List[str] = Field(
+        default_factory=list,
+        description="All replica names; sessions are owned by replica via consistent hashing",
+    )
+    result_cache_ttl_seconds: Dict[str, float] = Field(
+        default_factory=lambda: {
+            "document": 3600.0,
+            "code": 600.0,
+            "error": 1800.0,
+            "hipify": 3600.0,
+            "api": 86400.0,
+        },
+        description="Per-mode lifetime of cached analysis results; 0 disables caching for a mode",
+    )
+    analyze_batch_max_items: int = Field(
+        default=256,
+        description="Upper bound on items per /analyze/batch call",
+    )
+    analyze_batch_concurrency: int = Field(
+        default=8,
+        description="Most items of one /analyze/batch call analyzed at once",
+    )
+    job_workers: int = Field(
+        default=4,
+        description="Background jobs run at once",
+    )
+    job_timeout_seconds: float = Field(
+        default=900.0,
+        description="Time limit for one background job, including its agent service calls",
+    )
+    job_max_pending: int = Field(
+        default=1000,
+        description="Unfinished jobs accepted before /jobs answers 429",
+    )
+    job_retention_seconds: float = Field(
+        default=24 * 3600.0,
+        description="How long finished jobs and their results are kept",
+    )
+    job_db_path: str = Field(
+        default="data/jobs.db",
+        description="SQLite file holding job state and results; empty keeps jobs in memory",
+    )
+    job_long_poll_max_seconds: float = Field(
+        default=60.0,
+        description="Longest wait a /jobs/{job_id} long-poll may request",
+    )
+    socket_max_inflight: int = Field(
+        default=64,
+        description="Analyses one /ws connection may have running at once",
+    )
+    socket_send_buffer: int = Field(
+        default=256,
+        description="Messages queued for a slow /ws client before producers wait",
+    )
+    trace_export_path: str = Field(
+        default="",
+        description="JSONL file receiving OTLP/JSON trace spans; empty disables tracing",
+    )
+    trace_sample_rate: float = Field(
+        default=1.0,
+        description="Fraction of new traces recorded; requests with a traceparent follow it",
+    )
+    admin_token: str = Field(
+        default="",
+        description="Token for /debug profiling endpoints (empty = profiling disabled)",
+    )
+    profile_max_seconds: float = Field(
+        default=60.0,
+        description="Longest sampling window accepted by /debug/profile",
+    )
 
     class Config:
         frozen = True
@@ -29,4 +178,96 @@ def get_settings() -> Settings:
         agent_service_timeout=float(
             os.getenv("AGENT_SERVICE_TIMEOUT", defaults.agent_service_timeout)
         ),
+        agent_service_max_connections=int(
+            os.getenv("AGENT_SERVICE_MAX_CONNECTIONS", defaults.agent_service_max_connections)
+        ),
+        use_agent_pipeline=os.getenv("USE_AGENT_PIPELINE", "true").lower()
+        in ("1", "true", "yes"),
+        session_max_entries=int(
+            os.getenv("SESSION_MAX_ENTRIES", defaults.session_max_entries)
+        ),
+        session_memory_budget_bytes=int(
+            os.getenv("SESSION_MEMORY_BUDGET_BYTES", defaults.session_memory_budget_bytes)
+        ),
+        session_lock_stripes=int(
+            os.getenv("SESSION_LOCK_STRIPES", defaults.session_lock_stripes)
+        ),
+        session_page_size=int(os.getenv("SESSION_PAGE_SIZE", defaults.session_page_size)),
+        session_page_max=int(os.getenv("SESSION_PAGE_MAX", defaults.session_page_max)),
+        session_long_poll_max_seconds=float(
+            os.getenv("SESSION_LONG_POLL_MAX_SECONDS", defaults.session_long_poll_max_seconds)
+        ),
+        session_keepalive_seconds=float(
+            os.getenv("SESSION_KEEPALIVE_SECONDS", defaults.session_keepalive_seconds)
+        ),
+        session_backend=os.getenv("SESSION_BACKEND", defaults.session_backend).lower(),
+        session_db_path=os.getenv("SESSION_DB_PATH", defaults.session_db_path),
+        session_compact_interval_seconds=float(
+            os.getenv(
+                "SESSION_COMPACT_INTERVAL_SECONDS", defaults.session_compact_interval_seconds
+            )
+        ),
+        session_retention_seconds=float(
+            os.getenv("SESSION_RETENTION_SECONDS", defaults.session_retention_seconds)
+        ),
+        shared_state_url=os.getenv("SHARED_STATE_URL", defaults.shared_state_url),
+        shared_state_prefix=os.getenv("SHARED_STATE_PREFIX", defaults.shared_state_prefix),
+        shared_state_local_entries=int(
+            os.getenv("SHARED_STATE_LOCAL_ENTRIES", defaults.shared_state_local_entries)
+        ),
+        shared_state_local_bytes=int(
+            os.getenv("SHARED_STATE_LOCAL_BYTES", defaults.shared_state_local_bytes)
+        ),
+        shared_state_local_ttl_seconds=float(
+            os.getenv(
+                "SHARED_STATE_LOCAL_TTL_SECONDS", defaults.shared_state_local_ttl_seconds
+            )
+        ),
+        replica_id=os.getenv("REPLICA_ID", defaults.replica_id),
+        replicas=[
+            name.strip()
+            for name in os.getenv("BACKEND_REPLICAS", "").split(",")
+            if name.strip()
+        ],
+        result_cache_ttl_seconds={
+            **defaults.result_cache_ttl_seconds,
+            **_parse_mode_seconds(os.getenv("RESULT_CACHE_TTLS", "")),
+        },
+        analyze_batch_max_items=int(
+            os.getenv("ANALYZE_BATCH_MAX_ITEMS", defaults.analyze_batch_max_items)
+        ),
+        analyze_batch_concurrency=int(
+            os.getenv("ANALYZE_BATCH_CONCURRENCY", defaults.analyze_batch_concurrency)
+        ),
+        job_workers=int(os.getenv("JOB_WORKERS", defaults.job_workers)),
+        job_timeout_seconds=float(os.getenv("JOB_TIMEOUT_SECONDS", defaults.job_timeout_seconds)),
+        job_max_pending=int(os.getenv("JOB_MAX_PENDING", defaults.job_max_pending)),
+        job_retention_seconds=float(
+            os.getenv("JOB_RETENTION_SECONDS", defaults.job_retention_seconds)
+        ),
+        job_db_path=os.getenv("JOB_DB_PATH", defaults.job_db_path),
+        job_long_poll_max_seconds=float(
+            os.getenv("JOB_LONG_POLL_MAX_SECONDS", defaults.job_long_poll_max_seconds)
+        ),
+        socket_max_inflight=int(
+            os.getenv("SOCKET_MAX_INFLIGHT", defaults.socket_max_inflight)
+        ),
+        socket_send_buffer=int(os.getenv("SOCKET_SEND_BUFFER", defaults.socket_send_buffer)),
+        trace_export_path=os.getenv("TRACE_EXPORT_PATH", defaults.trace_export_path),
+        trace_sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", defaults.trace_sample_rate)),
+        admin_token=os.getenv("ADMIN_TOKEN", defaults.admin_token),
+        profile_max_seconds=float(
+            os.getenv("PROFILE_MAX_SECONDS", defaults.profile_max_seconds)
+        ),
     )
+
+
+def _parse_mode_seconds(value: str) -> Dict[str, float]:
+    """Parse ``"api=86400,code=0"`` into ``{"api": 86400.0, "code": 0.0}``."""
+
+    parsed = {}
+    for item in value.split(","):
+        mode, _, seconds = item.partition("=")
+        if mode.strip() and seconds.strip():
+            parsed[mode.strip()] = float(seconds)
+    return parsed
@@ -0,0 +1,334 @@
+"""Background analysis jobs.
+
+Large document, hipify or log analyses can outlive an HTTP request. A job
+is submitted once. It then runs on one of ``job_workers`` asyncio workers
+in this process, and clients poll (or long-poll) it or cancel it by id.
+Every step is recorded as a progress event: queued, started, routed,
+fetched (document mode), generating, then done, failed or cancelled.
+
+Each job is written to SQLite whenever it changes, off the event loop and
+in order. After a restart, finished jobs can still be read. Unfinished
+jobs, including those cut off mid-run, are queued again. Finished jobs are
+deleted after ``job_retention_seconds``.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+from . import schemas
+from .analysis import record_exchange, run_analysis
+from .config import get_settings
+from .result_cache import get_result_cache
+from .session_store import session_store
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = frozenset({"done", "failed", "cancelled"})
+PRUNE_INTERVAL_SECONDS = 60.0
+CANCEL_WAIT_SECONDS = 5.0
+
+
+@dataclass
+class Job:
+    job_id: str
+    request: schemas.AnalyzeRequest
+    state: str = "queued"
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Dict[str, Any]] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    cancel_requested: bool = False
+    task: Optional[asyncio.Task] = None
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "request": self.request.model_dump(exclude_none=True),
+            "state": self.state,
+            "events": self.events,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "Job":
+        return cls(
+            job_id=record["job_id"],
+            request=schemas.AnalyzeRequest.model_validate(record["request"]),
+            state=record["state"],
+            events=record["events"],
+            result=record["result"],
+            error=record["error"],
+            created_at=record["created_at"],
+            updated_at=record["updated_at"],
+        )
+
+
+class JobStore:
+    """SQLite copy of every job; writes go through one background thread."""
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL, "
+            "record TEXT NOT NULL)"
+        )
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-store")
+
+    def load(self) -> List[Dict[str, Any]]:
+        rows = self._connection.execute("SELECT record FROM jobs ORDER BY updated_at").fetchall()
+        return [json.loads(record) for (record,) in rows]
+
+    def save(self, record: Dict[str, Any]) -> None:
+        encoded = json.dumps(record, ensure_ascii=False, default=str)
+        self._executor.submit(
+            self._write, record["job_id"], record["state"], record["updated_at"], encoded
+        )
+
+    def delete(self, job_ids: List[str]) -> None:
+        if job_ids:
+            self._executor.submit(self._delete, job_ids)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._connection.close()
+
+    def _write(self, job_id: str, state: str, updated_at: float, encoded: str) -> None:
+        try:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, state, updated_at, record) "
+                "VALUES (?, ?, ?, ?)",
+                (job_id, state, updated_at, encoded),
+            )
+        except sqlite3.Error:
+            logger.exception("Failed to persist job %s", job_id)
+
+    def _delete(self, job_ids: List[str]) -> None:
+        try:
+            self._connection.executemany(
+                "DELETE FROM jobs WHERE job_id = ?", [(job_id,) for job_id in job_ids]
+            )
+        except sqlite3.Error:
+            logger.exception("Failed to delete %d expired jobs", len(job_ids))
+
+
+class JobManager:
+    def __init__(
+        self,
+        *,
+        db_path: str,
+        workers: int,
+        timeout_seconds: float,
+        retention_seconds: float,
+        max_pending: int,
+    ) -> None:
+        self._db_path = db_path
+        self._store: Optional[JobStore] = None
+        self._workers = max(workers, 1)
+        self._timeout = timeout_seconds
+        self._retention = retention_seconds
+        self._max_pending = max_pending
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        if self._db_path:
+            self._store = JobStore(self._db_path)
+            for record in self._store.load():
+                job = Job.from_record(record)
+                self._jobs[job.job_id] = job
+                if job.state not in TERMINAL_STATES:
+                    job.state = "queued"
+                    self._event(job, "requeued")
+                    self._queue.put_nowait(job.job_id)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self._workers)]
+        self._tasks.append(asyncio.create_task(self._prune()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    def submit(self, payload: schemas.AnalyzeRequest) -> Job:
+        pending = sum(1 for job in self._jobs.values() if job.state not in TERMINAL_STATES)
+        if pending >= self._max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"at most {self._max_pending} unfinished jobs",
+            )
+        job = Job(job_id=uuid.uuid4().hex, request=payload)
+        self._jobs[job.job_id] = job
+        self._event(job, "queued")
+        self._queue.put_nowait(job.job_id)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="job not found")
+        return job
+
+    async def cancel(self, job_id: str) -> Job:
+        job = self.get(job_id)
+        if job.state in TERMINAL_STATES:
+            return job
+        job.cancel_requested = True
+        task = job.task
+        if task is None:
+            self._finish(job, "cancelled")
+        else:
+            task.cancel()
+            # Aborts the in-flight agent service call; give it a moment to unwind.
+            await asyncio.wait({task}, timeout=CANCEL_WAIT_SECONDS)
+        return job
+
+    async def wait(self, job: Job, *, after: int, timeout: float) -> None:
+        """Wait up to ``timeout`` seconds for the job to have more than ``after`` events."""
+
+        deadline = time.monotonic() + timeout
+        while len(job.events) <= after and job.state not in TERMINAL_STATES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(job.changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
+
+    async def _work(self) -> None:
+        while True:
+            job = self._jobs.get(await self._queue.get())
+            if job is None or job.state != "queued":
+                continue
+            job.task = asyncio.ensure_future(self._traced_run(job))
+            try:
+                await asyncio.wait({job.task})
+                if job.cancel_requested and job.state not in TERMINAL_STATES:
+                    # Cancelled before its first step, so _run never saw it.
+                    self._finish(job, "cancelled")
+            finally:
+                if not job.task.done():
+                    # Shutting down: leave the job unfinished so it is requeued.
+                    job.task.cancel()
+                job.task = None
+
+    async def _traced_run(self, job: Job) -> None:
+        # Each job is its own trace, unrelated to the request that submitted it.
+        with span("job.run", job_id=job.job_id, mode=job.request.explicit_mode or "auto"):
+            await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        payload = job.request
+        job.state = "running"
+        self._event(job, "started")
+        try:
+            await asyncio.to_thread(session_store.create_session, payload.session_id)
+            mode = payload.explicit_mode
+            analysis = get_result_cache().run(
+                payload,
+                mode,
+                lambda: run_analysis(
+                    payload, mode, timeout=self._timeout, progress=partial(self._event, job)
+                ),
+            )
+            response = await asyncio.wait_for(analysis, self._timeout)
+            await record_exchange(payload.session_id, payload.text, response.mode, response.result)
+        except asyncio.CancelledError:
+            if job.cancel_requested:
+                self._finish(job, "cancelled")
+            raise
+        except HTTPException as exc:
+            error = {"status_code": exc.status_code, "detail": exc.detail}
+            self._finish(job, "failed", error=error)
+        except asyncio.TimeoutError:
+            self._finish(
+                job,
+                "failed",
+                error={
+                    "status_code": status.HTTP_504_GATEWAY_TIMEOUT,
+                    "detail": f"job exceeded {self._timeout:g}s",
+                },
+            )
+        except Exception as exc:
+            logger.exception("Job %s failed", job.job_id)
+            self._finish(
+                job,
+                "failed",
+                error={"status_code": status.HTTP_500_INTERNAL_SERVER_ERROR, "detail": str(exc)},
+            )
+        else:
+            job.result = response.model_dump(exclude_none=True)
+            self._finish(job, "done", result_cache=(response.usage or {}).get("result_cache"))
+
+    def _finish(
+        self, job: Job, state: str, *, error: Optional[Dict[str, Any]] = None, **data: Any
+    ) -> None:
+        job.state = state
+        job.error = error
+        self._event(job, state, **data)
+
+    def _event(self, job: Job, event: str, **data: Any) -> None:
+        job.updated_at = time.time()
+        job.events.append({"event": event, "at": job.updated_at, **data})
+        if self._store is not None:
+            self._store.save(job.to_record())
+        changed, job.changed = job.changed, asyncio.Event()
+        changed.set()
+
+    async def _prune(self) -> None:
+        while True:
+            await asyncio.sleep(PRUNE_INTERVAL_SECONDS)
+            cutoff = time.time() - self._retention
+            expired = [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job.state in TERMINAL_STATES and job.updated_at < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+            if self._store is not None:
+                self._store.delete(expired)
+
+
+_MANAGER: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    global _MANAGER
+    if _MANAGER is None:
+        settings = get_settings()
+        _MANAGER = JobManager(
+            db_path=settings.job_db_path,
+            workers=settings.job_workers,
+            timeout_seconds=settings.job_timeout_seconds,
+            retention_seconds=settings.job_retention_seconds,
+            max_pending=settings.job_max_pending,
+        )
+    return _MANAGER
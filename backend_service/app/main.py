@@ -1,14 +1,51 @@
 from __future__ import annotations
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 
-from .routers import analysis, session
+from .agent_service_client import get_agent_service_client
+from .jobs import get_job_manager
+from .readiness import get_readiness, warmup_steps
+from .routers import analysis, jobs, plugin, session
+from .session_store import session_store
+from .profiling import ProfilingMiddleware, router as debug_router
+from .tracing import TracingMiddleware
 
 app = FastAPI(title="AMDlingo Backend")
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(TracingMiddleware)
 app.include_router(analysis.router)
 app.include_router(session.router)
+app.include_router(jobs.router)
+app.include_router(plugin.router)
+app.include_router(debug_router)
+
+
+@app.on_event("startup")
+async def start_jobs() -> None:
+    await get_job_manager().start()
+
+
+@app.on_event("startup")
+async def start_warmup() -> None:
+    get_readiness().start(warmup_steps())
+
+
+@app.on_event("shutdown")
+async def close_clients() -> None:
+    await get_job_manager().stop()
+    await get_agent_service_client().aclose()
+    session_store.close()
 
 
 @app.get("/healthz")
 async def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readiness() -> JSONResponse:
+    """200 once warmup has finished; 503 with per-step progress until then."""
+
+    state = get_readiness()
+    return JSONResponse(state.status(), status_code=200 if state.ready else 503)
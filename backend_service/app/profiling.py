@@ -0,0 +1,262 @@
+"""On-demand CPU and memory profiling behind an admin token.
+
+Everything here is off unless ``admin_token`` is set. Requests to the
+``/debug`` endpoints must then carry it in ``X-Admin-Token``.
+
+* ``GET /debug/profile`` samples every thread's stack for a time window
+  and returns collapsed stacks (``frame;frame;frame count`` per line),
+  the input format of ``flamegraph.pl`` and speedscope.
+* A request sent with ``X-Profile: 1`` and the admin token runs under
+  ``cProfile``. The response carries an ``X-Profile-Id`` header, and
+  ``GET /debug/profile/requests/{id}`` returns the stats. cProfile sees
+  the whole event loop thread, so coroutines of concurrent requests
+  are included too.
+* ``/debug/memory/*`` starts ``tracemalloc``, takes snapshots, lists top
+  allocation sites and diffs two snapshots.
+
+With no token set the middleware checks one cached setting per request
+and the sampler, cProfile and tracemalloc never start.
+"""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from .config import get_settings
+
+ADMIN_HEADER = "x-admin-token"
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "x-profile-id"
+MAX_STACK_DEPTH = 128
+KEPT_REQUEST_PROFILES = 16
+KEPT_SNAPSHOTS = 8
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+)
+
+_sampler_lock = threading.Lock()
+_request_lock = threading.Lock()
+_request_profiles: "OrderedDict[str, pstats.Stats]" = OrderedDict()
+_snapshots: "OrderedDict[str, tracemalloc.Snapshot]" = OrderedDict()
+
+
+def sample_stacks(seconds: float, interval: float) -> Counter:
+    """Count collapsed stacks of all other threads every ``interval`` seconds."""
+
+    own = threading.get_ident()
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            frames: List[str] = []
+            while frame is not None and len(frames) < MAX_STACK_DEPTH:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+                frame = frame.f_back
+            frames.append(names.get(ident, f"thread-{ident}"))
+            stacks[";".join(reversed(frames))] += 1
+        time.sleep(interval)
+    return stacks
+
+
+def enabled() -> bool:
+    return bool(get_settings().admin_token)
+
+
+def _authorised(token: str) -> bool:
+    expected = get_settings().admin_token
+    return bool(expected) and hmac.compare_digest(token.encode(), expected.encode())
+
+
+async def require_admin(x_admin_token: str = Header("")) -> None:
+    if not enabled():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not _authorised(x_admin_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="invalid admin token")
+
+
+router = APIRouter(prefix="/debug", tags=["debug"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def sample_profile(
+    seconds: float = Query(5.0, gt=0.0, description="Sampling window"),
+    interval_ms: float = Query(5.0, ge=1.0, le=1000.0, description="Time between samples"),
+) -> str:
+    """Sample all threads for ``seconds`` and return collapsed stacks."""
+
+    limit = get_settings().profile_max_seconds
+    if seconds > limit:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"seconds must be at most {limit}",
+        )
+    if not _sampler_lock.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="a profile is already running"
+        )
+    try:
+        stacks = await asyncio.to_thread(sample_stacks, seconds, interval_ms / 1000)
+    finally:
+        _sampler_lock.release()
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+@router.get("/profile/requests/{profile_id}", response_class=PlainTextResponse)
+async def request_profile(
+    profile_id: str,
+    sort: Literal["cumulative", "tottime", "calls"] = "cumulative",
+    limit: int = Query(50, ge=1, le=1000),
+) -> str:
+    stats = _request_profiles.get(profile_id)
+    if stats is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="profile not found")
+    output = io.StringIO()
+    stats.stream = output
+    stats.sort_stats(sort).print_stats(limit)
+    return output.getvalue()
+
+
+@router.post("/memory/start")
+async def start_memory_tracing(
+    frames: int = Query(1, ge=1, le=64, description="Stack frames stored per allocation"),
+) -> Dict[str, Any]:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    return {"tracing": True, "frames": tracemalloc.get_traceback_limit()}
+
+
+@router.post("/memory/stop")
+async def stop_memory_tracing() -> Dict[str, Any]:
+    tracemalloc.stop()
+    _snapshots.clear()
+    return {"tracing": False}
+
+
+@router.post("/memory/snapshots")
+async def take_memory_snapshot(
+    limit: int = Query(20, ge=1, le=500),
+    group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+) -> Dict[str, Any]:
+    """Snapshot current allocations and return the largest sites."""
+
+    if not tracemalloc.is_tracing():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="memory tracing is not started"
+        )
+    snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+    snapshot_id = uuid.uuid4().hex[:12]
+    _snapshots[snapshot_id] = snapshot
+    while len(_snapshots) > KEPT_SNAPSHOTS:
+        _snapshots.popitem(last=False)
+    current, peak = tracemalloc.get_traced_memory()
+    stats = await asyncio.to_thread(snapshot.statistics, group_by)
+    return {
+        "snapshot_id": snapshot_id,
+        "traced_bytes": current,
+        "peak_bytes": peak,
+        "top": [_stat(stat) for stat in stats[:limit]],
+    }
+
+
+@router.get("/memory/diff")
+async def diff_memory_snapshots(
+    base: str,
+    target: str,
+    limit: int = Query(20, ge=1, le=500),
+    group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+) -> Dict[str, Any]:
+    """Allocation sites that grew most between snapshots ``base`` and ``target``."""
+
+    older, newer = _snapshots.get(base), _snapshots.get(target)
+    if older is None or newer is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="snapshot not found")
+    stats = await asyncio.to_thread(newer.compare_to, older, group_by)
+    return {
+        "base": base,
+        "target": target,
+        "size_diff_bytes": sum(stat.size_diff for stat in stats),
+        "top": [_stat(stat) for stat in stats[:limit]],
+    }
+
+
+class ProfilingMiddleware:
+    """ASGI middleware running ``X-Profile`` requests under ``cProfile``.
+
+    Only one request is profiled at a time; others that ask while one is
+    running are served unprofiled, without an ``X-Profile-Id`` header.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not enabled():
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        if PROFILE_HEADER.encode() not in headers or not _authorised(
+            headers.get(ADMIN_HEADER.encode(), b"").decode("latin-1")
+        ):
+            await self.app(scope, receive, send)
+            return
+        if not _request_lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+
+        async def send_with_id(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (PROFILE_ID_HEADER.encode(), profile_id.encode()),
+                    ],
+                }
+            await send(message)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                profiler.disable()
+        finally:
+            _request_lock.release()
+        _request_profiles[profile_id] = pstats.Stats(profiler)
+        while len(_request_profiles) > KEPT_REQUEST_PROFILES:
+            _request_profiles.popitem(last=False)
+
+
+def _stat(stat: Any) -> Dict[str, Any]:
+    record: Dict[str, Any] = {
+        "where": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+        "size_bytes": stat.size,
+        "count": stat.count,
+    }
+    if hasattr(stat, "size_diff"):
+        record["size_diff_bytes"] = stat.size_diff
+        record["count_diff"] = stat.count_diff
+    return record
@@ -0,0 +1,118 @@
+"""Readiness gate: warm the service up before it takes traffic.
+
+``/healthz`` only reports that the process is up. ``/readyz`` answers 503
+until every warmup step has run, then 200 with per-step timings. Steps
+pre-pay what the first request would otherwise pay: the session store and
+result cache backends, and the connection pool to the agent service.
+
+A failing required step keeps the service unready and is retried, with
+backoff from ``RETRY_INITIAL_SECONDS`` doubling up to ``RETRY_MAX_SECONDS``,
+until it succeeds; ``/readyz`` reports each step's attempts and last error.
+Optional steps, such as warming connections to a downstream service, run
+once, are reported and never block readiness.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .agent_service_client import get_agent_service_client
+from .result_cache import get_result_cache
+from .session_store import session_store
+
+logger = logging.getLogger(__name__)
+
+_IMPORTED_AT = time.perf_counter()
+RETRY_INITIAL_SECONDS = 1.0
+RETRY_MAX_SECONDS = 30.0
+
+
+@dataclass
+class WarmupStep:
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    required: bool = True
+
+
+class Readiness:
+    def __init__(self) -> None:
+        self.ready = False
+        self._steps: Dict[str, Dict[str, Any]] = {}
+        self._ready_after_ms: Optional[float] = None
+        self._task: Optional[asyncio.Future] = None
+
+    def start(self, steps: List[WarmupStep]) -> None:
+        """Run ``steps`` in order in the background."""
+
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run(steps))
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "warming",
+            "ready_after_ms": self._ready_after_ms,
+            "steps": self._steps,
+        }
+
+    async def _run(self, steps: List[WarmupStep]) -> None:
+        pending = steps
+        delay = RETRY_INITIAL_SECONDS
+        while True:
+            failed = [step for step in pending if not await self._attempt(step) and step.required]
+            if not failed:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RETRY_MAX_SECONDS)
+            pending = failed
+        self.ready = True
+        self._ready_after_ms = round((time.perf_counter() - _IMPORTED_AT) * 1000, 2)
+
+    async def _attempt(self, step: WarmupStep) -> bool:
+        attempts = self._steps.get(step.name, {}).get("attempts", 0) + 1
+        started = time.perf_counter()
+        try:
+            await step.run()
+        except Exception as exc:  # noqa: BLE001 - reported in /readyz
+            logger.warning("Warmup step %s failed (attempt %d): %s", step.name, attempts, exc)
+            self._steps[step.name] = {
+                "status": "failed",
+                "required": step.required,
+                "attempts": attempts,
+                "error": f"{type(exc).__name__}: {exc}",
+                "ms": round((time.perf_counter() - started) * 1000, 2),
+            }
+            return False
+        self._steps[step.name] = {
+            "status": "ok",
+            "required": step.required,
+            "attempts": attempts,
+            "ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        return True
+
+
+_READINESS = Readiness()
+
+
+def get_readiness() -> Readiness:
+    return _READINESS
+
+
+def warmup_steps() -> List[WarmupStep]:
+    return [
+        WarmupStep("session_store", _load_session_store),
+        WarmupStep("result_cache", _load_result_cache),
+        WarmupStep("agent_service", get_agent_service_client().warm_up, required=False),
+    ]
+
+
+async def _load_session_store() -> None:
+    # A lookup of a session that does not exist still round-trips the backend.
+    await asyncio.to_thread(session_store.get_page, "__readiness__", limit=1)
+
+
+async def _load_result_cache() -> None:
+    get_result_cache()
@@ -0,0 +1,234 @@
+"""Cross-session cache of analysis results.
+
+Many sessions ask the same thing: a common ``hipErrorIllegalAddress`` paste,
+a popular API name, the same ROCm page. Results are cached by mode and a
+normalised form of the input, so cosmetic differences still hit:
+
+* code and hipify input: whitespace collapsed, blank lines dropped,
+* error logs: additionally, addresses, PIDs and line numbers masked,
+* URLs, in the ``url`` field or in document text: canonicalised.
+
+Requests without a mode (automatic routing) are keyed as ``auto``.
+
+Entries live in the shared state (local LRU, or the replicas' shared
+server) with a per-mode TTL. Identical requests in flight share one
+pipeline run, in a task of its own: cancelling one request leaves it
+running for the others, and it is cancelled once nobody waits on it.
+A hit is re-addressed to the asking session (``context_sync_key``), and
+``usage["result_cache"]`` reports ``hit``, ``shared``, ``miss`` or ``off``.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from . import schemas
+from .config import get_settings
+from .shared_state import SharedState, get_shared_state
+
+URL_PATTERN = re.compile(r"https?://[\w./%?&=#:~+-]+", re.IGNORECASE)
+HEX_ADDRESS_PATTERN = re.compile(r"\b0x[0-9a-f]+\b", re.IGNORECASE)
+PID_PATTERN = re.compile(r"\b(pid|tid|process|thread)([\s:=#]*)\d+\b", re.IGNORECASE)
+BRACKETED_NUMBER_PATTERN = re.compile(r"\[\d+\]")
+SOURCE_LINE_PATTERN = re.compile(r"(\.\w+):\d+(?::\d+)?")
+LINE_WORD_PATTERN = re.compile(r"\b(line)\s+\d+\b", re.IGNORECASE)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+Compute = Callable[[], Awaitable[schemas.BackendResponse]]
+
+
+def normalize_whitespace(text: str) -> str:
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def mask_error_text(text: str) -> str:
+    text = HEX_ADDRESS_PATTERN.sub("0x#", text)
+    text = PID_PATTERN.sub(r"\1\2#", text)
+    text = BRACKETED_NUMBER_PATTERN.sub("[#]", text)
+    text = SOURCE_LINE_PATTERN.sub(r"\1:#", text)
+    text = LINE_WORD_PATTERN.sub(r"\1 #", text)
+    return text
+
+
+def canonical_url(url: str) -> str:
+    """Lower-case scheme and host, drop default port, fragment and ``utm_*``, sort the query."""
+
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or "").lower()
+    if port is not None and DEFAULT_PORTS.get(scheme) != port:
+        netloc = f"{netloc}:{port}"
+    path = re.sub(r"/{2,}", "/", parts.path)
+    if path.endswith("/"):
+        path = path.rstrip("/")
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_")
+    )
+    return urlunsplit((scheme, netloc, path or "/", urlencode(query), ""))
+
+
+def normalize_text(mode: Optional[str], text: str) -> str:
+    if mode == "error":
+        text = mask_error_text(text)
+    elif mode == "document":
+        text = URL_PATTERN.sub(lambda match: canonical_url(match.group(0)), text)
+    return normalize_whitespace(text)
+
+
+def cache_key(payload: schemas.AnalyzeRequest, mode: Optional[str]) -> str:
+    url = canonical_url(payload.url) if payload.url else None
+    parts = [mode or "auto", normalize_text(mode, payload.text), url]
+    if payload.speculative:
+        # Alternatives depend on which modes were allowed to run.
+        parts.append(sorted(payload.parallel_modes or schemas.SUPPORTED_MODES))
+    encoded = json.dumps(parts, ensure_ascii=False).encode("utf-8")
+    return "result:" + hashlib.sha256(encoded).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, state: SharedState, ttls: Dict[str, float]) -> None:
+        self._state = state
+        self._ttls = ttls
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._waiters: Dict[asyncio.Future, int] = {}
+
+    async def run(
+        self, payload: schemas.AnalyzeRequest, mode: Optional[str], compute: Compute
+    ) -> schemas.BackendResponse:
+        """Return the cached result for ``payload`` or compute and store it."""
+
+        if not self.enabled(mode):
+            return _with_status(await compute(), "off")
+
+        key = cache_key(payload, mode)
+        cached = self._get(key, payload.session_id)
+        if cached is not None:
+            return cached
+        if key in self._inflight:
+            shared = await self._wait(key, self._inflight[key])
+            return for_session(shared, payload.session_id, "shared")
+
+        task = asyncio.ensure_future(self._compute_and_set(key, compute))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return _with_status(await self._wait(key, task), "miss")
+
+    def lookup(
+        self, payload: schemas.AnalyzeRequest, mode: Optional[str]
+    ) -> Optional[schemas.BackendResponse]:
+        """The cached result for ``payload``, re-addressed to its session, if any."""
+
+        if not self.enabled(mode):
+            return None
+        return self._get(cache_key(payload, mode), payload.session_id)
+
+    def store(
+        self,
+        payload: schemas.AnalyzeRequest,
+        mode: Optional[str],
+        response: schemas.BackendResponse,
+    ) -> schemas.BackendResponse:
+        """Cache a result computed outside ``run``; returns it with its cache status."""
+
+        if not self.enabled(mode):
+            return _with_status(response, "off")
+        self._set(cache_key(payload, mode), response)
+        return _with_status(response, "miss")
+
+    def enabled(self, mode: Optional[str]) -> bool:
+        if mode is None:
+            return any(ttl > 0 for ttl in self._ttls.values())
+        return self._ttls.get(mode, 0) > 0
+
+    async def _compute_and_set(self, key: str, compute: Compute) -> schemas.BackendResponse:
+        response = await compute()
+        self._set(key, response)
+        return response
+
+    async def _wait(self, key: str, task: asyncio.Future) -> schemas.BackendResponse:
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    # The last waiter left (cancelled or timed out): stop the run,
+                    # and let later requests start a fresh one.
+                    self._drop(key, task)
+                    task.cancel()
+
+    def _finish(self, key: str, task: asyncio.Future) -> None:
+        self._drop(key, task)
+        if not task.cancelled():
+            # Mark retrieved so waiter-less failures are not logged as unhandled.
+            task.exception()
+
+    def _drop(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def _get(self, key: str, session_id: str) -> Optional[schemas.BackendResponse]:
+        cached = self._state.get(key)
+        if cached is None:
+            return None
+        response = schemas.BackendResponse.model_validate_json(cached)
+        return for_session(response, session_id, "hit")
+
+    def _set(self, key: str, response: schemas.BackendResponse) -> None:
+        ttl = self._ttls.get(response.mode, 0)
+        if ttl > 0:
+            self._state.set(key, response.model_dump_json().encode("utf-8"), ttl)
+
+
+def _with_status(response: schemas.BackendResponse, cache_status: str) -> schemas.BackendResponse:
+    return response.model_copy(
+        update={"usage": {**(response.usage or {}), "result_cache": cache_status}}
+    )
+
+
+def for_session(
+    response: schemas.BackendResponse, session_id: str, cache_status: str
+) -> schemas.BackendResponse:
+    alternatives = response.alternatives
+    if alternatives:
+        alternatives = [
+            {**alternative, "result": _resync(alternative.get("result"), session_id)}
+            for alternative in alternatives
+        ]
+    return response.model_copy(
+        update={
+            "result": _resync(response.result, session_id),
+            "session_id": session_id,
+            "usage": {**(response.usage or {}), "result_cache": cache_status},
+            "alternatives": alternatives,
+        }
+    )
+
+
+def _resync(result: Optional[dict], session_id: str) -> Optional[dict]:
+    if not isinstance(result, dict):
+        return result
+    return {**result, "context_sync_key": session_id}
+
+
+_CACHE: Optional[ResultCache] = None
+
+
+def get_result_cache() -> ResultCache:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = ResultCache(get_shared_state(), get_settings().result_cache_ttl_seconds)
+    return _CACHE
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
-
-from ..agent_service_client import AgentServiceClient
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+
+from ..agent_service_client import get_agent_service_client
+from ..analysis import analyze, analyze_events, record_exchange, run_worker
+from ..config import get_settings
+from ..result_cache import cache_key, for_session
 from ..session_store import session_store
 from .. import schemas
 
+logger = logging.getLogger(__name__)
 router = APIRouter(prefix="", tags=["analysis"])
-_agent_client = AgentServiceClient()
 
 
 @router.post("/analyze/document", response_model=schemas.BackendResponse)
@@ -25,57 +35,193 @@ async def analyze_error(payload: schemas.AnalyzeRequest) -> schemas.BackendRespo
     return await _process_request(payload, forced_mode="error")
 
 
+@router.post("/analyze/document/stream")
+async def analyze_document_stream(payload: schemas.AnalyzeRequest) -> StreamingResponse:
+    return await _stream_request(payload, forced_mode="document")
+
+
+@router.post("/analyze/code/stream")
+async def analyze_code_stream(payload: schemas.AnalyzeRequest) -> StreamingResponse:
+    return await _stream_request(payload, forced_mode="code")
+
+
+@router.post("/analyze/error/stream")
+async def analyze_error_stream(payload: schemas.AnalyzeRequest) -> StreamingResponse:
+    return await _stream_request(payload, forced_mode="error")
+
+
+@router.post("/analyze/batch")
+async def analyze_batch(payload: schemas.AnalyzeBatchRequest) -> StreamingResponse:
+    """Analyze many items; NDJSON, one line per item as it finishes, then a summary."""
+
+    settings = get_settings()
+    if len(payload.items) > settings.analyze_batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"at most {settings.analyze_batch_max_items} items per batch",
+        )
+    concurrency = min(
+        payload.concurrency or settings.analyze_batch_concurrency,
+        settings.analyze_batch_concurrency,
+    )
+    return StreamingResponse(
+        _batch_results(payload.items, concurrency), media_type="application/x-ndjson"
+    )
+
+
+@router.post("/analyze/error/upload", response_model=schemas.BackendResponse)
+async def analyze_error_upload(request: Request, session_id: str) -> schemas.BackendResponse:
+    await asyncio.to_thread(session_store.create_session, session_id)
+    master_response = await get_agent_service_client().route_log(session_id, request.stream())
+    response = await run_worker(master_response)
+    await record_exchange(session_id, master_response.raw_input, response.mode, response.result)
+    return response
+
+
 @router.post("/convert/hipify", response_model=schemas.BackendResponse)
 async def convert_hipify(payload: schemas.AnalyzeRequest) -> schemas.BackendResponse:
     return await _process_request(payload, forced_mode="hipify")
 
 
+@router.post("/convert/hipify/stream")
+async def convert_hipify_stream(payload: schemas.AnalyzeRequest) -> StreamingResponse:
+    return await _stream_request(payload, forced_mode="hipify")
+
+
+@router.post("/convert/hipify/batch")
+async def convert_hipify_batch(payload: schemas.HipifyBatchRequest) -> StreamingResponse:
+    await asyncio.to_thread(session_store.create_session, payload.session_id)
+    stream = await get_agent_service_client().stream_hipify_batch(payload)
+    return StreamingResponse(stream, media_type="application/x-ndjson")
+
+
 @router.post("/lookup/api", response_model=schemas.BackendResponse)
 async def lookup_api(payload: schemas.AnalyzeRequest) -> schemas.BackendResponse:
     return await _process_request(payload, forced_mode="api")
 
 
-async def _process_request(
-    payload: schemas.AnalyzeRequest, forced_mode: str
-) -> schemas.BackendResponse:
-    session_store.create_session(payload.session_id)
-
-    master_request = schemas.MasterRouteRequest(
-        text=payload.text,
-        session_id=payload.session_id,
-        explicit_mode=payload.explicit_mode or forced_mode,
-        parallel_modes=payload.parallel_modes or schemas.SUPPORTED_MODES,
-        url=payload.url,
-    )
+@router.post("/lookup/api/stream")
+async def lookup_api_stream(payload: schemas.AnalyzeRequest) -> StreamingResponse:
+    return await _stream_request(payload, forced_mode="api")
+
+
+async def _batch_results(
+    items: List[schemas.AnalyzeBatchItem], concurrency: int
+) -> AsyncIterator[bytes]:
+    # Items that normalise to the same cache key are analyzed once.
+    groups: Dict[str, List[int]] = {}
+    for index, item in enumerate(items):
+        groups.setdefault(cache_key(item, item.explicit_mode), []).append(index)
+
+    slots = asyncio.Semaphore(max(concurrency, 1))
+    tasks = [
+        asyncio.ensure_future(_run_batch_group(items, indices, slots))
+        for indices in groups.values()
+    ]
+    summary: Dict[str, Any] = {
+        "type": "summary",
+        "items": len(items),
+        "unique": len(tasks),
+        "cached": 0,
+        "errors": 0,
+    }
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            for line in await next_done:
+                summary["errors"] += int("error" in line)
+                summary["cached"] += int((line.get("usage") or {}).get("result_cache") == "hit")
+                yield _encode(line)
+    finally:
+        # Stop outstanding work if the client disconnects mid-stream.
+        for task in tasks:
+            task.cancel()
+    yield _encode(summary)
+
+
+async def _run_batch_group(
+    items: List[schemas.AnalyzeBatchItem], indices: List[int], slots: asyncio.Semaphore
+) -> List[Dict[str, Any]]:
+    first = items[indices[0]]
+    async with slots:
+        try:
+            response = await _process_request(first, forced_mode=first.explicit_mode)
+        except HTTPException as exc:
+            error = {"status_code": exc.status_code, "detail": exc.detail}
+            return [_batch_line(index, items[index], error=error) for index in indices]
+        except Exception as exc:
+            logger.exception("Batch item %d failed", indices[0])
+            error = {"status_code": status.HTTP_500_INTERNAL_SERVER_ERROR, "detail": str(exc)}
+            return [_batch_line(index, items[index], error=error) for index in indices]
+
+    lines = [_batch_line(indices[0], first, response=response)]
+    for index in indices[1:]:
+        item = items[index]
+        duplicate = for_session(response, item.session_id, "duplicate")
+        await asyncio.to_thread(session_store.create_session, item.session_id)
+        await record_exchange(item.session_id, item.text, duplicate.mode, duplicate.result)
+        lines.append(_batch_line(index, item, response=duplicate, duplicate_of=indices[0]))
+    return lines
+
+
+def _batch_line(
+    index: int,
+    item: schemas.AnalyzeBatchItem,
+    *,
+    response: Optional[schemas.BackendResponse] = None,
+    error: Optional[Dict[str, Any]] = None,
+    duplicate_of: Optional[int] = None,
+) -> Dict[str, Any]:
+    line: Dict[str, Any] = {"type": "item", "index": index, "id": item.id}
+    if duplicate_of is not None:
+        line["duplicate_of"] = duplicate_of
+    if response is not None:
+        line.update(response.model_dump(exclude_none=True))
+    else:
+        line.update(session_id=item.session_id, error=error)
+    return line
+
+
+def _encode(line: Dict[str, Any]) -> bytes:
+    return (json.dumps(line, ensure_ascii=False) + "\n").encode("utf-8")
 
-    master_response = await _agent_client.route_request(master_request)
 
-    worker_request = schemas.WorkerRequest(
-        mode=master_response.mode,
-        preprocessed=master_response.preprocessed,
-        raw_input=master_response.raw_input,
-        session_id=master_response.session_id,
-    )
-    worker_response = await _agent_client.call_worker(
-        master_response.mode, worker_request
-    )
-
-    user_entry = {
-        "role": "user",
-        "text": payload.text,
-        "mode": master_response.mode,
-    }
-    assistant_entry = {
-        "role": "assistant",
-        "mode": worker_response.mode,
-        "result": worker_response.result,
-    }
-    session_store.append_entry(payload.session_id, user_entry)
-    session_store.append_entry(payload.session_id, assistant_entry)
-
-    return schemas.BackendResponse(
-        mode=worker_response.mode,
-        result=worker_response.result,
-        session_id=worker_response.session_id,
-        usage=worker_response.usage,
-    )
+async def _process_request(
+    payload: schemas.AnalyzeRequest, forced_mode: Optional[str]
+) -> schemas.BackendResponse:
+    return await analyze(payload, payload.explicit_mode or forced_mode)
+
+
+async def _stream_request(
+    payload: schemas.AnalyzeRequest, forced_mode: Optional[str]
+) -> StreamingResponse:
+    """Server-sent events for one analysis, relayed from the agent as they happen.
+
+    ``routed``, ``preprocessed`` and ``token`` events come through unchanged;
+    the final ``result`` carries the same body as the non-streaming route.
+    A cached result is sent as a lone ``result`` event. A failure after the
+    stream has started is sent as an ``error`` event.
+    """
+
+    events = await analyze_events(payload, payload.explicit_mode or forced_mode)
+    return StreamingResponse(_sse_events(events), media_type="text/event-stream")
+
+
+async def _sse_events(events: AsyncIterator[Tuple[str, Any]]) -> AsyncIterator[str]:
+    try:
+        async for event, data in events:
+            if event == "result":
+                data = data.model_dump(exclude_none=True)
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    except HTTPException as exc:
+        yield _error_event(exc.status_code, exc.detail)
+    except httpx.HTTPError as exc:
+        # e.g. the agent stream timing out or breaking off mid-response.
+        yield _error_event(status.HTTP_502_BAD_GATEWAY, str(exc) or type(exc).__name__)
+    except Exception as exc:
+        logger.exception("Analysis stream failed")
+        yield _error_event(status.HTTP_500_INTERNAL_SERVER_ERROR, str(exc))
+
+
+def _error_event(status_code: int, detail: Any) -> str:
+    error = {"status_code": status_code, "detail": detail}
+    return f"event: error\ndata: {json.dumps(error, ensure_ascii=False)}\n\n"
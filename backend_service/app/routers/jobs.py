@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Query, status
+
+from ..config import get_settings
+from ..jobs import Job, get_job_manager
+from .. import schemas
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+_settings = get_settings()
+
+
+@router.post("", response_model=schemas.JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(payload: schemas.AnalyzeRequest) -> schemas.JobResponse:
+    """Queue an analysis; ``explicit_mode`` unset lets the Master Agent route it."""
+
+    return _to_response(get_job_manager().submit(payload), after=0)
+
+
+@router.get("/{job_id}", response_model=schemas.JobResponse)
+async def get_job(
+    job_id: str,
+    after: int = Query(
+        0, ge=0, description="Skip the first ``after`` events (pass the last ``next_after``)"
+    ),
+    wait: float = Query(
+        0.0,
+        ge=0.0,
+        le=_settings.job_long_poll_max_seconds,
+        description="Wait up to this many seconds for an event beyond ``after``",
+    ),
+) -> schemas.JobResponse:
+    manager = get_job_manager()
+    job = manager.get(job_id)
+    if wait:
+        await manager.wait(job, after=after, timeout=wait)
+    return _to_response(job, after=after)
+
+
+@router.post("/{job_id}/cancel", response_model=schemas.JobResponse)
+async def cancel_job(job_id: str) -> schemas.JobResponse:
+    return _to_response(await get_job_manager().cancel(job_id), after=0)
+
+
+def _to_response(job: Job, *, after: int) -> schemas.JobResponse:
+    return schemas.JobResponse(
+        job_id=job.job_id,
+        state=job.state,
+        events=job.events[after:],
+        next_after=len(job.events),
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
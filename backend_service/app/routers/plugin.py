@@ -0,0 +1,213 @@
+"""Persistent WebSocket for the editor plugin.
+
+One connection carries many concurrent requests, each tagged with a client
+``id`` that is echoed on every reply. Client messages are
+``schemas.SocketMessage``:
+
+* ``analyze``: run ``request``; replies with ``result`` or ``error``. With
+  ``stream`` the ``routed``, ``preprocessed`` and ``token`` stages are sent
+  first as ``event`` messages. A request carrying a ``supersedes`` key
+  cancels the in-flight request sent earlier with the same key, so a stale
+  hover lookup stops as soon as the next one arrives.
+* ``cancel``: stop the analysis with this ``id``; replies ``cancelled``.
+* ``append``: add ``entry`` to ``session_id``; replies ``appended``.
+* ``subscribe`` / ``unsubscribe``: push every entry appended to
+  ``session_id`` as an ``entry`` message, after replaying those newer than
+  ``since`` (``truncated`` if some of them are no longer retained).
+
+Analyses run on the agent's streaming pipeline, so cancelling one, or
+closing the socket, also stops the agent and the model call behind it.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+
+from ..analysis import analyze_events
+from ..config import get_settings
+from ..session_store import session_store
+from .. import schemas
+from .session import validate_entry
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="", tags=["plugin"])
+_settings = get_settings()
+
+
+@router.websocket("/ws")
+async def plugin_socket(websocket: WebSocket) -> None:
+    await websocket.accept()
+    await _Connection(websocket).serve()
+
+
+class _Connection:
+    def __init__(self, websocket: WebSocket) -> None:
+        self._websocket = websocket
+        self._outbox: asyncio.Queue = asyncio.Queue(maxsize=max(_settings.socket_send_buffer, 1))
+        self._requests: Dict[str, asyncio.Task] = {}
+        self._superseding: Dict[str, str] = {}
+        self._subscriptions: Dict[str, asyncio.Task] = {}
+
+    async def serve(self) -> None:
+        writer = asyncio.ensure_future(self._write())
+        try:
+            while True:
+                await self._receive(await self._websocket.receive_text())
+        except WebSocketDisconnect:
+            pass
+        finally:
+            # Nobody is left to read the answers: stop the work behind them.
+            tasks = [writer, *self._requests.values(), *self._subscriptions.values()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _receive(self, raw: str) -> None:
+        try:
+            message = schemas.SocketMessage.model_validate_json(raw)
+        except ValidationError as exc:
+            await self._error(
+                _raw_id(raw),
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                exc.errors(include_url=False, include_context=False),
+            )
+            return
+        try:
+            if message.type == "analyze":
+                await self._start(message)
+            elif message.type == "cancel":
+                await self._cancel(_require(message, "id"), "cancelled")
+            elif message.type == "append":
+                entry = _require(message, "entry")
+                validate_entry(entry)
+                stored = await asyncio.to_thread(
+                    session_store.append_entry,
+                    _require(message, "session_id"),
+                    entry.model_dump(exclude_none=True),
+                )
+                await self._send({"type": "appended", "id": message.id, "entry": stored})
+            elif message.type == "subscribe":
+                self._subscribe(_require(message, "session_id"), message.since)
+            else:
+                task = self._subscriptions.pop(_require(message, "session_id"), None)
+                if task is not None:
+                    task.cancel()
+        except HTTPException as exc:
+            await self._error(message.id, exc.status_code, exc.detail)
+
+    async def _start(self, message: schemas.SocketMessage) -> None:
+        request_id = _require(message, "id")
+        payload = _require(message, "request")
+        if request_id in self._requests:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail="request id already in flight"
+            )
+        if message.supersedes is not None:
+            previous = self._superseding.pop(message.supersedes, None)
+            if previous is not None:
+                await self._cancel(previous, "superseded")
+        if len(self._requests) >= _settings.socket_max_inflight:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"at most {_settings.socket_max_inflight} requests in flight",
+            )
+        task = asyncio.ensure_future(self._analyze(request_id, payload, message.stream))
+        self._requests[request_id] = task
+        if message.supersedes is not None:
+            self._superseding[message.supersedes] = request_id
+        task.add_done_callback(lambda _: self._forget(request_id, task))
+
+    async def _analyze(
+        self, request_id: str, payload: schemas.AnalyzeRequest, stream: bool
+    ) -> None:
+        try:
+            async for event, data in await analyze_events(payload, payload.explicit_mode):
+                if event == "result":
+                    await self._send(
+                        {"type": "result", "id": request_id, **data.model_dump(exclude_none=True)}
+                    )
+                elif stream:
+                    await self._send(
+                        {"type": "event", "id": request_id, "event": event, "data": data}
+                    )
+        except HTTPException as exc:
+            await self._error(request_id, exc.status_code, exc.detail)
+        except Exception as exc:
+            logger.exception("Socket request %s failed", request_id)
+            await self._error(request_id, status.HTTP_500_INTERNAL_SERVER_ERROR, str(exc))
+
+    async def _cancel(self, request_id: str, reason: str) -> None:
+        task = self._requests.pop(request_id, None)
+        if task is None or task.done():
+            return
+        task.cancel()
+        await self._send({"type": "cancelled", "id": request_id, "reason": reason})
+
+    def _forget(self, request_id: str, task: asyncio.Task) -> None:
+        if self._requests.get(request_id) is task:
+            del self._requests[request_id]
+        if request_id not in self._requests:
+            for key, superseding_id in list(self._superseding.items()):
+                if superseding_id == request_id:
+                    del self._superseding[key]
+
+    def _subscribe(self, session_id: str, since: Optional[int]) -> None:
+        previous = self._subscriptions.pop(session_id, None)
+        if previous is not None:
+            previous.cancel()
+        self._subscriptions[session_id] = asyncio.ensure_future(
+            self._push_entries(session_id, -1 if since is None else since)
+        )
+
+    async def _push_entries(self, session_id: str, since: int) -> None:
+        while True:
+            page = await asyncio.to_thread(
+                session_store.get_since, session_id, since=since, limit=_settings.session_page_max
+            )
+            if page.truncated:
+                await self._send({"type": "truncated", "session_id": session_id, "since": since})
+            for entry in page.entries:
+                await self._send({"type": "entry", "session_id": session_id, "entry": entry})
+            if page.entries:
+                since = page.entries[-1]["seq"]
+                continue
+            if page.truncated:
+                since = page.total - 1
+            await session_store.wait_for_entries(
+                session_id, since=since, timeout=_settings.session_keepalive_seconds
+            )
+
+    async def _error(self, request_id: Optional[str], status_code: int, detail: Any) -> None:
+        await self._send(
+            {"type": "error", "id": request_id, "status_code": status_code, "detail": detail}
+        )
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        await self._outbox.put(message)
+
+    async def _write(self) -> None:
+        while True:
+            message = await self._outbox.get()
+            await self._websocket.send_text(json.dumps(message, ensure_ascii=False, default=str))
+
+
+def _require(message: schemas.SocketMessage, field: str) -> Any:
+    value = getattr(message, field)
+    if value is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"{message.type} requires {field}"
+        )
+    return value
+
+
+def _raw_id(raw: str) -> Optional[str]:
+    try:
+        request_id = json.loads(raw).get("id")
+    except (ValueError, AttributeError):
+        return None
+    return request_id if isinstance(request_id, str) else None
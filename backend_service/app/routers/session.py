@@ -1,35 +1,128 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+import json
+from typing import AsyncIterator, Optional
 
-from ..session_store import session_store
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from ..config import get_settings
+from ..session_store import HistoryPage, session_store
 from .. import schemas
 
 router = APIRouter(prefix="", tags=["session"])
+_settings = get_settings()
 
 
 @router.post("/session/create", response_model=schemas.SessionHistoryResponse)
 def create_session(payload: schemas.SessionCreateRequest) -> schemas.SessionHistoryResponse:
     session_store.create_session(payload.session_id)
-    return schemas.SessionHistoryResponse(
-        session_id=payload.session_id, history=session_store.get_history(payload.session_id)
-    )
+    return _history_page(payload.session_id, _settings.session_page_size, None)
 
 
 @router.post("/session/append", response_model=schemas.SessionHistoryResponse)
 def append_session(payload: schemas.SessionAppendRequest) -> schemas.SessionHistoryResponse:
-    if payload.entry.role == "assistant" and payload.entry.result is None:
+    validate_entry(payload.entry)
+    session_store.append_entry(payload.session_id, payload.entry.model_dump(exclude_none=True))
+    return _history_page(payload.session_id, _settings.session_page_size, None)
+
+
+@router.get("/session/history", response_model=schemas.SessionHistoryResponse)
+async def get_history(
+    session_id: str = Query(..., description="Session identifier"),
+    limit: int = Query(
+        _settings.session_page_size,
+        ge=1,
+        le=_settings.session_page_max,
+        description="Maximum number of entries to return",
+    ),
+    before: Optional[int] = Query(
+        None, ge=0, description="Only return entries older than this seq"
+    ),
+    since: Optional[int] = Query(
+        None, ge=-1, description="Only return entries newer than this seq (-1 = from the start)"
+    ),
+    wait: float = Query(
+        0.0,
+        ge=0.0,
+        le=_settings.session_long_poll_max_seconds,
+        description="With since, wait up to this many seconds for a new entry",
+    ),
+) -> schemas.SessionHistoryResponse:
+    if since is None:
+        if wait:
+            raise HTTPException(status_code=400, detail="wait requires since")
+        return await asyncio.to_thread(_history_page, session_id, limit, before)
+    if before is not None:
+        raise HTTPException(status_code=400, detail="before and since are mutually exclusive")
+
+    # Backends may read from disk or the network: keep that off the event loop.
+    page = await asyncio.to_thread(session_store.get_since, session_id, since=since, limit=limit)
+    if not page.entries and not page.truncated and wait:
+        await session_store.wait_for_entries(session_id, since=since, timeout=wait)
+        page = await asyncio.to_thread(
+            session_store.get_since, session_id, since=since, limit=limit
+        )
+    return _to_response(session_id, page)
+
+
+@router.get("/session/subscribe")
+async def subscribe(
+    request: Request,
+    session_id: str = Query(..., description="Session identifier"),
+    since: Optional[int] = Query(
+        None, ge=-1, description="Replay entries newer than this seq first"
+    ),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """Server-sent events: one ``entry`` event per appended entry, ``id`` = seq."""
+
+    if since is None:
+        since = int(last_event_id) if last_event_id and last_event_id.isdigit() else -1
+    return StreamingResponse(
+        _entry_events(request, session_id, since), media_type="text/event-stream"
+    )
+
+
+async def _entry_events(request: Request, session_id: str, since: int) -> AsyncIterator[str]:
+    while not await request.is_disconnected():
+        page = await asyncio.to_thread(
+            session_store.get_since, session_id, since=since, limit=_settings.session_page_max
+        )
+        if page.truncated:
+            yield f"event: truncated\ndata: {json.dumps({'since': since})}\n\n"
+        for entry in page.entries:
+            yield f"id: {entry['seq']}\nevent: entry\ndata: {json.dumps(entry, ensure_ascii=False)}\n\n"
+        if page.entries:
+            since = page.entries[-1]["seq"]
+            continue
+        if page.truncated:
+            since = page.total - 1
+        if not await session_store.wait_for_entries(
+            session_id, since=since, timeout=_settings.session_keepalive_seconds
+        ):
+            yield ": keepalive\n\n"
+
+
+def validate_entry(entry: schemas.SessionAppendEntry) -> None:
+    if entry.role == "assistant" and entry.result is None:
         raise HTTPException(status_code=400, detail="assistant entry requires result")
-    if payload.entry.role == "user" and payload.entry.text is None:
+    if entry.role == "user" and entry.text is None:
         raise HTTPException(status_code=400, detail="user entry requires text")
 
-    session_store.append_entry(payload.session_id, payload.entry.model_dump(exclude_none=True))
-    return schemas.SessionHistoryResponse(
-        session_id=payload.session_id, history=session_store.get_history(payload.session_id)
-    )
 
+def _history_page(
+    session_id: str, limit: int, before: Optional[int]
+) -> schemas.SessionHistoryResponse:
+    return _to_response(session_id, session_store.get_page(session_id, limit=limit, before=before))
 
-@router.get("/session/history", response_model=schemas.SessionHistoryResponse)
-def get_history(session_id: str = Query(..., description="Session identifier")) -> schemas.SessionHistoryResponse:
-    history = session_store.get_history(session_id)
-    return schemas.SessionHistoryResponse(session_id=session_id, history=history)
+
+def _to_response(session_id: str, page: HistoryPage) -> schemas.SessionHistoryResponse:
+    return schemas.SessionHistoryResponse(
+        session_id=session_id,
+        history=page.entries,
+        next_before=page.next_before,
+        total=page.total,
+        truncated=page.truncated,
+    )
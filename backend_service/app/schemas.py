@@ -13,6 +13,7 @@ class AnalyzeRequest(BaseModel):
     explicit_mode: Optional[Literal["document", "code", "error", "hipify", "api"]] = None
     parallel_modes: Optional[List[str]] = Field(default_factory=lambda: SUPPORTED_MODES.copy())
     url: Optional[str] = None
+    speculative: bool = False
 
 
 class MasterRouteRequest(BaseModel):
@@ -21,18 +22,21 @@ class MasterRouteRequest(BaseModel):
     explicit_mode: Optional[str] = None
     parallel_modes: List[str] = Field(default_factory=lambda: SUPPORTED_MODES.copy())
     url: Optional[str] = None
+    speculative: bool = False
 
 
 class MasterRouteResponse(BaseModel):
     mode: Literal["document", "code", "error", "hipify", "api"]
-    preprocessed: Dict[str, Any]
+    preprocessed: Dict[str, Any] = Field(default_factory=dict)
+    preprocessed_ref: Optional[str] = None
     raw_input: str
     session_id: str
 
 
 class WorkerRequest(BaseModel):
     mode: str
-    preprocessed: Dict[str, Any]
+    preprocessed: Dict[str, Any] = Field(default_factory=dict)
+    preprocessed_ref: Optional[str] = None
     raw_input: str
     session_id: str
 
@@ -44,11 +48,55 @@ class WorkerResponse(BaseModel):
     usage: Optional[Dict[str, Any]] = None
 
 
+class PipelineResponse(BaseModel):
+    mode: str
+    result: Dict[str, Any]
+    session_id: str
+    usage: Optional[Dict[str, Any]] = None
+    routing: Dict[str, Any] = Field(default_factory=dict)
+    alternatives: Optional[List[Dict[str, Any]]] = None
+
+
 class BackendResponse(BaseModel):
     mode: str
     result: Dict[str, Any]
     session_id: str
     usage: Optional[Dict[str, Any]] = None
+    alternatives: Optional[List[Dict[str, Any]]] = None
+
+
+class HipifyBatchFile(BaseModel):
+    path: str
+    content: str
+
+
+class HipifyBatchRequest(BaseModel):
+    session_id: str
+    files: List[HipifyBatchFile] = Field(default_factory=list)
+    archive_base64: Optional[str] = None
+    review: bool = True
+
+
+class AnalyzeBatchItem(AnalyzeRequest):
+    id: Optional[str] = Field(default=None, description="Client reference echoed in the result")
+
+
+class AnalyzeBatchRequest(BaseModel):
+    items: List[AnalyzeBatchItem]
+    concurrency: Optional[int] = Field(
+        default=None, ge=1, description="Items analyzed at once; capped by the server"
+    )
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    state: Literal["queued", "running", "done", "failed", "cancelled"]
+    events: List[Dict[str, Any]] = Field(default_factory=list)
+    next_after: int = Field(description="Pass as ``after`` to receive only newer events")
+    result: Optional[BackendResponse] = None
+    error: Optional[Dict[str, Any]] = None
+    created_at: float
+    updated_at: float
 
 
 class SessionCreateRequest(BaseModel):
@@ -70,3 +118,34 @@ class SessionAppendRequest(BaseModel):
 class SessionHistoryResponse(BaseModel):
     session_id: str
     history: List[Dict[str, Any]]
+    next_before: Optional[int] = Field(
+        default=None, description="Pass as before= to fetch the previous page"
+    )
+    total: int = Field(default=0, description="Entries ever appended to the session")
+    truncated: bool = Field(
+        default=False, description="Entries after since were dropped before they could be read"
+    )
+
+
+class SocketMessage(BaseModel):
+    """One client message on the ``/ws`` plugin socket."""
+
+    type: Literal["analyze", "cancel", "append", "subscribe", "unsubscribe"]
+    id: Optional[str] = Field(
+        default=None, description="Client request id, echoed on every reply to this message"
+    )
+    request: Optional[AnalyzeRequest] = Field(default=None, description="analyze: the request")
+    stream: bool = Field(
+        default=False, description="analyze: also send routed, preprocessed and token events"
+    )
+    supersedes: Optional[str] = Field(
+        default=None,
+        description="analyze: cancel the in-flight request sent with the same key, e.g. hover",
+    )
+    session_id: Optional[str] = Field(
+        default=None, description="append, subscribe, unsubscribe: the session"
+    )
+    entry: Optional[SessionAppendEntry] = Field(default=None, description="append: the entry")
+    since: Optional[int] = Field(
+        default=None, ge=-1, description="subscribe: replay entries newer than this seq first"
+    )
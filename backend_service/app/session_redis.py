@@ -0,0 +1,209 @@
+"""Redis-protocol session backend for running several backend replicas.
+
+The server holds each session as a counter (the next seq) and a sorted set
+of encoded entries scored by seq, trimmed to ``max_entries``. One Lua
+script assigns the seq, stores and trims, refreshes expiry and publishes
+the append, so replicas never hand out the same seq.
+
+The in-memory rings of ``SessionStore`` act as a local read-through cache.
+Only sessions this replica owns on the hash ring are cached. Hot sessions
+are then served from memory, and each replica's cache holds its own share
+of them. Reads of other sessions fetch only what they need: the counter
+for ``_count`` and the entries after ``since`` for ``get_since``.
+Appends made on other replicas arrive on a pub/sub channel. They
+drop the stale local copy and wake long-poll and SSE waiters, so a
+subscriber on one replica sees entries appended through any other.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from typing import Optional, Tuple
+
+import redis
+
+from .session_store import HistoryPage, SessionStore, _Session
+from .shared_state import owns_session
+
+logger = logging.getLogger(__name__)
+
+# KEYS: counter, entries. ARGV: encoded entry up to its seq value, max entries,
+# expiry in ms (0 = none), channel, replica id, session id.
+_APPEND_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1]) - 1
+redis.call('ZADD', KEYS[2], seq, ARGV[1] .. seq .. '}')
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', seq - tonumber(ARGV[2]))
+if tonumber(ARGV[3]) > 0 then
+  redis.call('PEXPIRE', KEYS[1], ARGV[3])
+  redis.call('PEXPIRE', KEYS[2], ARGV[3])
+end
+redis.call('PUBLISH', ARGV[4], ARGV[5] .. ' ' .. seq .. ' ' .. ARGV[6])
+return seq
+"""
+
+
+class RedisSessionStore(SessionStore):
+    def __init__(
+        self,
+        client: "redis.Redis",
+        *,
+        prefix: str,
+        replica_id: str,
+        retention_seconds: float = 0.0,
+        **options: int,
+    ) -> None:
+        super().__init__(**options)
+        self._client = client
+        self._prefix = prefix
+        self._replica_id = replica_id
+        self._ttl_ms = int(retention_seconds * 1000)
+        self._channel = f"{prefix}session-events"
+        self._append_script = client.register_script(_APPEND_SCRIPT)
+        self._closed = threading.Event()
+        self._listener = threading.Thread(target=self._listen, name="session-events", daemon=True)
+        self._listener.start()
+
+    def create_session(self, session_id: str) -> None:
+        if self._cacheable(session_id):
+            super().create_session(session_id)
+        else:
+            # Not ours to cache: make sure it exists without reading it back.
+            self._persist_session(session_id)
+
+    def append_entry(self, session_id: str, entry: dict) -> dict:
+        body = {key: value for key, value in entry.items() if key != "seq"}
+        # Everything but the seq value, which the script fills in.
+        head = json.dumps({**body, "seq": 0}, ensure_ascii=False, default=str)[:-2]
+        seq = int(
+            self._append_script(
+                keys=self._keys(session_id),
+                args=[
+                    head,
+                    self._max_entries,
+                    self._ttl_ms,
+                    self._channel,
+                    self._replica_id,
+                    session_id,
+                ],
+            )
+        )
+        entry = {**body, "seq": seq}
+        with self._stripe(session_id):
+            session = self._cached(session_id)
+            if session is not None and session.count == seq:
+                delta = self._append_locked(session, entry, f"{head}{seq}}}")
+            elif session is not None:
+                # Another append got in between; reload on next read.
+                self._drop(session_id)
+                session = None
+        if session is not None:
+            self._account(session_id, session, delta)
+        if self._watchers:
+            self._notify(session_id)
+        return entry
+
+    def get_since(self, session_id: str, *, since: int, limit: int) -> HistoryPage:
+        if self._cacheable(session_id):
+            return super().get_since(session_id, since=since, limit=limit)
+        counter, entries = self._keys(session_id)
+        start = since + 1
+        count, oldest, rows = (
+            self._client.pipeline()
+            .get(counter)
+            .zrange(entries, 0, 0, withscores=True)
+            .zrangebyscore(entries, start, "+inf", start=0, num=max(limit, 0), withscores=True)
+            .execute()
+        )
+        if count is None:
+            return HistoryPage(entries=[], next_before=None, total=0, truncated=since >= 0)
+        count = int(count)
+        first = int(oldest[0][1]) if oldest else count
+        truncated = start < first or start > count
+        if truncated:
+            # Same as the in-memory store: restart at the oldest retained entry.
+            rows = self._client.zrange(entries, 0, limit - 1, withscores=True) if limit > 0 else []
+        return HistoryPage(
+            entries=[json.loads(encoded) for encoded, _ in rows],
+            next_before=None,
+            total=count,
+            truncated=truncated,
+        )
+
+    def close(self) -> None:
+        self._closed.set()
+        self._listener.join(timeout=5)
+
+    def _cacheable(self, session_id: str) -> bool:
+        return owns_session(session_id)
+
+    def _load_session(self, session_id: str) -> Optional[_Session]:
+        counter, entries = self._keys(session_id)
+        pipeline = self._client.pipeline()
+        count, rows = pipeline.get(counter).zrange(entries, 0, -1, withscores=True).execute()
+        if count is None:
+            return None
+        return self._restore([(int(seq), encoded.decode("utf-8")) for encoded, seq in rows])
+
+    def _count(self, session_id: str) -> int:
+        session = self._cached(session_id)
+        if session is not None:
+            return session.count
+        counter, _ = self._keys(session_id)
+        count = self._client.get(counter)
+        return int(count) if count is not None else 0
+
+    def _persist_session(self, session_id: str) -> None:
+        counter, _ = self._keys(session_id)
+        self._client.set(counter, 0, nx=True, px=self._ttl_ms or None)
+
+    def _keys(self, session_id: str) -> Tuple[str, str]:
+        # The hash tag keeps both keys of a session on one cluster slot.
+        base = f"{self._prefix}session:{{{session_id}}}"
+        return f"{base}:seq", f"{base}:entries"
+
+    def _cached(self, session_id: str) -> Optional[_Session]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def _drop(self, session_id: str) -> None:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                session.evicted = True
+                self._bytes -= session.accounted
+
+    def _drop_all(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.evicted = True
+            self._sessions.clear()
+            self._bytes = 0
+
+    def _listen(self) -> None:
+        while not self._closed.is_set():
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self._channel)
+                # Appends made while we were not subscribed are unknown.
+                self._drop_all()
+                while not self._closed.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._on_append(message["data"])
+            except redis.RedisError as exc:
+                logger.warning("Session event subscription lost: %s", exc)
+                self._closed.wait(1.0)
+            finally:
+                pubsub.close()
+
+    def _on_append(self, data: bytes) -> None:
+        replica_id, seq, session_id = data.decode("utf-8").split(" ", 2)
+        if replica_id == self._replica_id:
+            return
+        with self._stripe(session_id):
+            session = self._cached(session_id)
+            if session is not None and session.count <= int(seq):
+                self._drop(session_id)
+        if self._watchers:
+            self._notify(session_id)
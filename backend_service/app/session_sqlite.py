@@ -0,0 +1,283 @@
+"""SQLite-backed durable session store.
+
+The in-memory ring buffers of ``SessionStore`` stay the serving layer, and
+SQLite in WAL mode holds the durable copy. Appends are queued to a single
+writer thread. It commits everything queued so far as one transaction
+(group commit), so request handlers never wait on disk. Nothing is loaded at
+startup. A session is read back from SQLite the first time it is touched,
+or again after it was evicted from memory. Ids found in neither place are
+remembered (up to ``MAX_UNKNOWN_SESSIONS``), so polling them stays off disk.
+The writer also compacts periodically: it drops rows that have fallen out of
+the ring, drops sessions idle past the retention window, and checkpoints the
+WAL.
+
+Only one process may write a database file. Sharing sessions across
+processes is the job of the shared-state backend.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from .session_store import SessionStore, _Session
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH = 1024
+MAX_UNKNOWN_SESSIONS = 4096
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS sessions (
+        session_id TEXT PRIMARY KEY,
+        updated_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS session_entries (
+        session_id TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        entry TEXT NOT NULL,
+        PRIMARY KEY (session_id, seq)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)",
+)
+
+
+class SqliteSessionStore(SessionStore):
+    def __init__(
+        self,
+        path: str,
+        *,
+        compact_interval_seconds: float = 300.0,
+        retention_seconds: float = 0.0,
+        **options: int,
+    ) -> None:
+        super().__init__(**options)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._path = path
+        self._compact_interval = compact_interval_seconds
+        self._retention = retention_seconds
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._pending: Dict[str, int] = {}
+        self._pending_lock = threading.Lock()
+        # Ids absent from the database, and ids being looked up; pending lock.
+        self._unknown: "OrderedDict[str, None]" = OrderedDict()
+        self._probing: Set[str] = set()
+        self._reader = self._connect()
+        self._reader_lock = threading.Lock()
+        with self._reader:
+            for statement in _SCHEMA:
+                self._reader.execute(statement)
+        self._writer = threading.Thread(target=self._write_loop, name="session-writer", daemon=True)
+        self._writer.start()
+
+    def flush(self) -> None:
+        """Block until everything queued so far is committed."""
+
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        done.wait()
+
+    def compact(self) -> None:
+        """Run a compaction pass now and wait for it."""
+
+        done = threading.Event()
+        self._queue.put(("compact", done))
+        done.wait()
+
+    def close(self) -> None:
+        if not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(("stop", done))
+        done.wait()
+        self._writer.join()
+        with self._reader_lock:
+            self._reader.close()
+
+    def _load_session(self, session_id: str) -> Optional[_Session]:
+        with self._pending_lock:
+            if session_id in self._unknown:
+                self._unknown.move_to_end(session_id)
+                return None
+            pending = self._pending.get(session_id, 0)
+            if not pending:
+                self._probing.add(session_id)
+        if pending:
+            # Evicted from memory with writes still queued: let them land first.
+            self.flush()
+        with self._reader_lock:
+            known = self._reader.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        self._end_probe(session_id, missing=known is None)
+        if known is None:
+            return None
+        with self._reader_lock:
+            rows: List[Tuple[int, str]] = self._reader.execute(
+                "SELECT seq, entry FROM session_entries WHERE session_id = ? "
+                "ORDER BY seq DESC LIMIT ?",
+                (session_id, self._max_entries),
+            ).fetchall()
+        rows.reverse()
+        return self._restore(rows)
+
+    def _end_probe(self, session_id: str, *, missing: bool) -> None:
+        with self._pending_lock:
+            # A write queued during the lookup discarded the probe: the id is not unknown.
+            if session_id not in self._probing:
+                return
+            self._probing.discard(session_id)
+            if not missing:
+                return
+            self._unknown[session_id] = None
+            while len(self._unknown) > MAX_UNKNOWN_SESSIONS:
+                self._unknown.popitem(last=False)
+
+    def _persist_session(self, session_id: str) -> None:
+        self._enqueue(session_id, ("session", session_id, time.time()))
+
+    def _persist_entry(self, session_id: str, seq: int, encoded: str) -> None:
+        self._enqueue(session_id, ("entry", session_id, seq, encoded, time.time()))
+
+    def _enqueue(self, session_id: str, item: tuple) -> None:
+        with self._pending_lock:
+            self._pending[session_id] = self._pending.get(session_id, 0) + 1
+            self._unknown.pop(session_id, None)
+            self._probing.discard(session_id)
+        self._queue.put(item)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL survives process crashes; only an OS crash can lose the last commits.
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        trim: Dict[str, int] = {}
+        next_compaction = time.monotonic() + self._compact_interval
+        stopping: Optional[threading.Event] = None
+        while stopping is None:
+            timeout = None
+            if self._compact_interval > 0:
+                timeout = max(next_compaction - time.monotonic(), 0.0)
+            try:
+                batch = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                batch = []
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            sessions: Dict[str, float] = {}
+            entries: List[Tuple[str, int, str]] = []
+            written: List[str] = []
+            waiters: List[threading.Event] = []
+            compact_now = False
+            for item in batch:
+                kind = item[0]
+                if kind == "entry":
+                    _, session_id, seq, encoded, at = item
+                    entries.append((session_id, seq, encoded))
+                    sessions[session_id] = at
+                    written.append(session_id)
+                    trim[session_id] = max(trim.get(session_id, -1), seq)
+                elif kind == "session":
+                    sessions[item[1]] = item[2]
+                    written.append(item[1])
+                else:
+                    waiters.append(item[1])
+                    compact_now = compact_now or kind == "compact"
+                    if kind == "stop":
+                        stopping = item[1]
+
+            try:
+                if written:
+                    self._commit(connection, sessions, entries)
+            except sqlite3.Error:
+                logger.exception("Failed to persist %d session writes", len(written))
+            finally:
+                with self._pending_lock:
+                    for session_id in written:
+                        self._release_pending(session_id)
+            if compact_now or (self._compact_interval > 0 and time.monotonic() >= next_compaction):
+                try:
+                    self._compact(connection, trim)
+                except sqlite3.Error:
+                    logger.exception("Session store compaction failed")
+                trim = {}
+                next_compaction = time.monotonic() + self._compact_interval
+            for waiter in waiters:
+                waiter.set()
+        connection.close()
+
+    def _commit(
+        self,
+        connection: sqlite3.Connection,
+        sessions: Dict[str, float],
+        entries: List[Tuple[str, int, str]],
+    ) -> None:
+        connection.execute("BEGIN")
+        try:
+            connection.executemany(
+                "INSERT INTO sessions (session_id, updated_at) VALUES (?, ?) "
+                "ON CONFLICT (session_id) DO UPDATE SET updated_at = excluded.updated_at",
+                sessions.items(),
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO session_entries (session_id, seq, entry) VALUES (?, ?, ?)",
+                entries,
+            )
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _release_pending(self, session_id: str) -> None:
+        remaining = self._pending.get(session_id, 0) - 1
+        if remaining > 0:
+            self._pending[session_id] = remaining
+        else:
+            self._pending.pop(session_id, None)
+
+    def _compact(self, connection: sqlite3.Connection, trim: Dict[str, int]) -> None:
+        connection.execute("BEGIN")
+        try:
+            self._delete_expired(connection, trim)
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _delete_expired(self, connection: sqlite3.Connection, trim: Dict[str, int]) -> None:
+        # Rows that fell out of a ring; only sessions written since the last pass can have any.
+        connection.executemany(
+            "DELETE FROM session_entries WHERE session_id = ? AND seq <= ?",
+            [
+                (session_id, last_seq - self._max_entries)
+                for session_id, last_seq in trim.items()
+                if last_seq >= self._max_entries
+            ],
+        )
+        if self._retention > 0:
+            cutoff = time.time() - self._retention
+            connection.execute(
+                "DELETE FROM session_entries WHERE session_id IN "
+                "(SELECT session_id FROM sessions WHERE updated_at < ?)",
+                (cutoff,),
+            )
+            connection.execute("DELETE FROM sessions WHERE updated_at < ?", (cutoff,))
@@ -1,29 +1,327 @@
-"""Simple in-memory session store."""
+"""Bounded in-memory session store.
+
+Each session keeps its newest ``max_entries`` entries in a ring buffer, so a
+long-lived session cannot grow without bound. Entry sizes (their encoded
+JSON length) are summed into a global budget. When the budget is exceeded,
+the least recently used sessions are dropped whole. Per-session work is
+serialised by one of ``lock_stripes`` locks picked by session id. The
+global lock only guards the session map, LRU order and byte total, and is
+never held while copying entries.
+
+Every entry carries ``seq``, its absolute position in the session
+(0, 1, 2, ...). It stays valid after older entries fall out of the ring.
+History reads go backwards (``before``) or forwards (``since``) from a seq
+and cost O(limit) however long the session is. Async callers can wait for
+entries newer than a seq. Appends wake them through their own event loop,
+so sync (threadpool) and async writers both work. Backends may block on
+disk or network, so async callers run reads through ``asyncio.to_thread``.
+"""
 from __future__ import annotations
 
-from threading import RLock
-from typing import Dict, List
+import asyncio
+import json
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 
+from .config import get_settings
 
-class SessionStore:
-    """Thread-safe in-memory store for chat histories."""
+# Rough fixed cost of a session object, so that empty sessions also count.
+SESSION_OVERHEAD_BYTES = 512
+
+
+class HistoryPage(NamedTuple):
+    entries: List[dict]
+    next_before: Optional[int]
+    total: int
+    truncated: bool = False
+
+
+class _Session:
+    __slots__ = ("entries", "sizes", "first", "count", "bytes", "accounted", "evicted")
 
     def __init__(self) -> None:
-        self._sessions: Dict[str, List[dict]] = {}
-        self._lock = RLock()
+        # Grown on demand up to the ring capacity, then overwritten in place;
+        # entry ``seq`` always lives at ``entries[seq % capacity]``.
+        self.entries: List[Optional[dict]] = []
+        self.sizes: List[int] = []
+        self.first = 0  # oldest retained seq
+        self.count = 0  # entries ever appended; the next entry's seq
+        self.bytes = SESSION_OVERHEAD_BYTES
+        self.accounted = SESSION_OVERHEAD_BYTES  # share of the global total; global lock
+        self.evicted = False
+
+
+class SessionStore:
+    """Thread-safe, memory-capped store for chat histories."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 500,
+        memory_budget_bytes: int = 256 * 1024 * 1024,
+        lock_stripes: int = 64,
+    ) -> None:
+        self._max_entries = max(max_entries, 1)
+        self._budget = memory_budget_bytes
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+        self._stripes = [Lock() for _ in range(max(lock_stripes, 1))]
+        self._watchers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+        self._watch_lock = Lock()
 
     def create_session(self, session_id: str) -> None:
+        self._session(session_id, create=True)
+
+    def close(self) -> None:
+        """Release backend resources; the in-memory store has none."""
+
+    def append_entry(self, session_id: str, entry: dict) -> dict:
+        """Store ``entry`` and return it with its ``seq`` filled in."""
+
+        with self._stripe(session_id):
+            session = self._session(session_id, create=True)
+            entry = {**entry, "seq": session.count}
+            encoded = json.dumps(entry, ensure_ascii=False, default=str)
+            delta = self._append_locked(session, entry, encoded)
+            self._persist_entry(session_id, entry["seq"], encoded)
+        self._account(session_id, session, delta)
+        if self._watchers:
+            self._notify(session_id)
+        return entry
+
+    def get_page(
+        self, session_id: str, *, limit: int, before: Optional[int] = None
+    ) -> HistoryPage:
+        """Return up to ``limit`` entries older than position ``before``, oldest first."""
+
+        session = self._session(session_id, create=False)
+        if session is None:
+            return HistoryPage(entries=[], next_before=None, total=0)
+        with self._stripe(session_id):
+            end = session.count if before is None else min(max(before, 0), session.count)
+            start = max(end - max(limit, 0), session.first)
+            entries = self._slice(session, start, end)
+            has_more = start > session.first
+            total = session.count
+        return HistoryPage(entries=entries, next_before=start if has_more else None, total=total)
+
+    def get_since(self, session_id: str, *, since: int, limit: int) -> HistoryPage:
+        """Return up to ``limit`` entries with ``seq > since``, oldest first.
+
+        ``truncated`` is set when entries after ``since`` are no longer
+        retained (overwritten, or the session was evicted and restarted);
+        the page then starts at the oldest retained entry.
+        """
+
+        session = self._session(session_id, create=False)
+        if session is None:
+            return HistoryPage(entries=[], next_before=None, total=0, truncated=since >= 0)
+        with self._stripe(session_id):
+            start = since + 1
+            truncated = start < session.first or start > session.count
+            if truncated:
+                start = session.first
+            end = min(start + max(limit, 0), session.count)
+            entries = self._slice(session, start, end)
+            total = session.count
+        return HistoryPage(entries=entries, next_before=None, total=total, truncated=truncated)
+
+    async def wait_for_entries(self, session_id: str, *, since: int, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for an entry with ``seq > since``.
+
+        Returns True as soon as the session moved past ``since`` (or no
+        longer matches it), False on timeout.
+        """
+
+        watcher = (asyncio.get_running_loop(), asyncio.Event())
+        with self._watch_lock:
+            self._watchers.setdefault(session_id, set()).add(watcher)
+        try:
+            # The count may come from a backend; read it off the event loop.
+            if await asyncio.to_thread(self._count, session_id) != since + 1:
+                return True
+            try:
+                await asyncio.wait_for(watcher[1].wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+            return True
+        finally:
+            with self._watch_lock:
+                watchers = self._watchers.get(session_id)
+                if watchers is not None:
+                    watchers.discard(watcher)
+                    if not watchers:
+                        del self._watchers[session_id]
+
+    def get_history(self, session_id: str) -> List[dict]:
+        """Return every retained entry of a session, oldest first."""
+
+        return self.get_page(session_id, limit=self._max_entries).entries
+
+    def stats(self) -> Dict[str, int]:
         with self._lock:
-            self._sessions.setdefault(session_id, [])
+            return {"sessions": len(self._sessions), "bytes": self._bytes, "budget": self._budget}
 
-    def append_entry(self, session_id: str, entry: dict) -> None:
+    def _session(self, session_id: str, *, create: bool) -> Optional[_Session]:
         with self._lock:
-            history = self._sessions.setdefault(session_id, [])
-            history.append(entry)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                return session
 
-    def get_history(self, session_id: str) -> List[dict]:
+        loaded = self._load_session(session_id)
+        created = False
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                # Another caller brought it in meanwhile.
+                self._sessions.move_to_end(session_id)
+                return session
+            if loaded is None and not create:
+                return None
+            session = loaded or _Session()
+            created = loaded is None
+            if self._cacheable(session_id):
+                self._sessions[session_id] = session
+                self._bytes += session.accounted
+                self._evict_locked(keep=session_id)
+            else:
+                # Served once from the backend, never cached.
+                session.evicted = True
+        if created:
+            self._persist_session(session_id)
+        return session
+
+    def _append_locked(self, session: _Session, entry: dict, encoded: str) -> int:
+        """Put ``entry`` (seq ``session.count``) into the ring; caller holds the stripe.
+
+        Returns the change in the session's byte size.
+        """
+
+        size = len(encoded)
+        if len(session.entries) < self._max_entries:
+            delta = size
+            session.entries.append(entry)
+            session.sizes.append(size)
+        else:
+            slot = session.count % self._max_entries
+            delta = size - session.sizes[slot]
+            session.entries[slot] = entry
+            session.sizes[slot] = size
+        session.count += 1
+        session.first = max(session.first, session.count - self._max_entries)
+        session.bytes += delta
+        return delta
+
+    def _account(self, session_id: str, session: _Session, delta: int) -> None:
         with self._lock:
-            return list(self._sessions.get(session_id, []))
+            if not session.evicted:
+                session.accounted += delta
+                self._bytes += delta
+                self._evict_locked(keep=session_id)
+
+    def _cacheable(self, session_id: str) -> bool:
+        """Whether a session loaded from a backend is kept in memory."""
+
+        return True
+
+    def _load_session(self, session_id: str) -> Optional[_Session]:
+        """Rebuild a session that is not in memory; backends override this."""
+
+        return None
+
+    def _persist_session(self, session_id: str) -> None:
+        """Record a new, empty session; backends override this."""
+
+    def _persist_entry(self, session_id: str, seq: int, encoded: str) -> None:
+        """Record an appended entry; called under the session's stripe lock."""
+
+    def _restore(self, rows: List[Tuple[int, str]]) -> _Session:
+        """Build a session from its newest ``(seq, encoded_entry)`` rows, oldest first."""
+
+        session = _Session()
+        if not rows:
+            return session
+        capacity = self._max_entries
+        session.count = rows[-1][0] + 1
+        session.first = max(rows[-capacity:][0][0], session.count - capacity)
+        # Rows may have gaps (a lost write batch), so place each by its seq. Until
+        # the ring wraps it holds exactly ``count`` slots, as ``_append_locked`` expects.
+        slots = min(session.count, capacity)
+        session.entries = [None] * slots
+        session.sizes = [0] * slots
+        for seq, encoded in rows:
+            if seq >= session.first:
+                session.entries[seq % capacity] = json.loads(encoded)
+                session.sizes[seq % capacity] = len(encoded)
+        session.bytes += sum(session.sizes)
+        session.accounted = session.bytes
+        return session
+
+    def _slice(self, session: _Session, start: int, end: int) -> List[dict]:
+        capacity = self._max_entries
+        entries = [session.entries[index % capacity] for index in range(start, end)]
+        # Holes only exist in sessions restored from a store that lost entries.
+        return [entry for entry in entries if entry is not None]
+
+    def _count(self, session_id: str) -> int:
+        session = self._session(session_id, create=False)
+        return session.count if session is not None else 0
+
+    def _notify(self, session_id: str) -> None:
+        with self._watch_lock:
+            watchers = list(self._watchers.get(session_id, ()))
+        for loop, event in watchers:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The waiting loop has shut down.
+                pass
+
+    def _stripe(self, session_id: str) -> Lock:
+        return self._stripes[hash(session_id) % len(self._stripes)]
+
+    def _evict_locked(self, keep: str) -> None:
+        while self._bytes > self._budget and len(self._sessions) > 1:
+            victim_id = next(iter(self._sessions))
+            if victim_id == keep:
+                self._sessions.move_to_end(victim_id)
+                continue
+            victim = self._sessions.pop(victim_id)
+            victim.evicted = True
+            self._bytes -= victim.accounted
+
+
+def _build_store() -> SessionStore:
+    settings = get_settings()
+    options = dict(
+        max_entries=settings.session_max_entries,
+        memory_budget_bytes=settings.session_memory_budget_bytes,
+        lock_stripes=settings.session_lock_stripes,
+    )
+    if settings.session_backend == "sqlite":
+        from .session_sqlite import SqliteSessionStore
+
+        return SqliteSessionStore(
+            settings.session_db_path,
+            compact_interval_seconds=settings.session_compact_interval_seconds,
+            retention_seconds=settings.session_retention_seconds,
+            **options,
+        )
+    if settings.session_backend == "redis":
+        from .session_redis import RedisSessionStore
+        from .shared_state import get_redis_client
+
+        return RedisSessionStore(
+            get_redis_client(),
+            prefix=settings.shared_state_prefix,
+            replica_id=settings.replica_id,
+            retention_seconds=settings.session_retention_seconds,
+            **options,
+        )
+    return SessionStore(**options)
 
 
-session_store = SessionStore()
+session_store = _build_store()
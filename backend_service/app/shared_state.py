@@ -0,0 +1,181 @@
+"""State shared between backend replicas.
+
+``SharedState`` is the small key/value interface that caches use, so that
+they work the same on one replica or many. ``MemorySharedState`` keeps
+values in-process. ``RedisSharedState`` talks to a Redis-protocol server
+and keeps a local read-through copy of the values it has seen. It is meant
+for write-once values, such as results keyed by a content hash, where a
+local copy can never go stale.
+
+``HashRing`` maps session ids to replicas with consistent hashing. The front
+proxy hashes on the same key, so each session is normally served by one
+replica, which keeps it hot in local memory. Adding or removing a replica
+only moves about 1/N of the sessions.
+"""
+from __future__ import annotations
+
+import bisect
+import hashlib
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from typing import Iterable, List, Optional, Tuple
+
+from .config import get_settings
+
+VIRTUAL_NODES = 128
+
+
+class HashRing:
+    def __init__(self, nodes: Iterable[str], *, virtual_nodes: int = VIRTUAL_NODES) -> None:
+        points: List[Tuple[int, str]] = []
+        for node in nodes:
+            for index in range(virtual_nodes):
+                points.append((_hash(f"{node}#{index}"), node))
+        points.sort()
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._nodes:
+            return None
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[index]
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class SharedState:
+    """Key/value store with per-key expiry; values are bytes."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemorySharedState(SharedState):
+    """In-process LRU bounded by entry count and total value size.
+
+    State is not shared with other replicas.
+    """
+
+    def __init__(self, *, max_entries: int, max_bytes: int) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._values: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._values.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._values[key]
+                self._bytes -= len(value)
+                return None
+            self._values.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        if self._max_entries <= 0 or len(value) > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._values.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[0])
+            self._values[key] = (value, time.monotonic() + ttl_seconds)
+            self._bytes += len(value)
+            while len(self._values) > self._max_entries or self._bytes > self._max_bytes:
+                _, (evicted, _) = self._values.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            previous = self._values.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[0])
+
+
+class RedisSharedState(SharedState):
+    """Redis-protocol backend with a local read-through copy."""
+
+    def __init__(
+        self, client, *, prefix: str, local: MemorySharedState, local_ttl_seconds: float
+    ) -> None:
+        self._client = client
+        self._prefix = prefix
+        self._local = local
+        self._local_ttl = local_ttl_seconds
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self._local.get(key)
+        if value is not None:
+            return value
+        pipeline = self._client.pipeline(transaction=False)
+        value, ttl_ms = pipeline.get(self._prefix + key).pttl(self._prefix + key).execute()
+        if value is None:
+            return None
+        ttl = self._local_ttl
+        if ttl_ms is not None and ttl_ms >= 0:
+            ttl = min(ttl, ttl_ms / 1000)
+        self._local.set(key, value, ttl)
+        return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._client.set(self._prefix + key, value, px=max(int(ttl_seconds * 1000), 1))
+        self._local.set(key, value, min(self._local_ttl, ttl_seconds))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self._prefix + key)
+        self._local.delete(key)
+
+
+@lru_cache(maxsize=1)
+def get_redis_client():
+    """Client for ``shared_state_url``; ``redis`` is only needed when it is set."""
+
+    import redis
+
+    return redis.Redis.from_url(get_settings().shared_state_url, health_check_interval=30)
+
+
+@lru_cache(maxsize=1)
+def get_hash_ring() -> HashRing:
+    return HashRing(get_settings().replicas)
+
+
+def owns_session(session_id: str) -> bool:
+    """True unless replicas are configured and another one owns ``session_id``."""
+
+    settings = get_settings()
+    if not settings.replicas:
+        return True
+    return get_hash_ring().owner(session_id) == settings.replica_id
+
+
+@lru_cache(maxsize=1)
+def get_shared_state() -> SharedState:
+    settings = get_settings()
+    local = MemorySharedState(
+        max_entries=settings.shared_state_local_entries,
+        max_bytes=settings.shared_state_local_bytes,
+    )
+    if not settings.shared_state_url:
+        return local
+    return RedisSharedState(
+        get_redis_client(),
+        prefix=settings.shared_state_prefix + "kv:",
+        local=local,
+        local_ttl_seconds=settings.shared_state_local_ttl_seconds,
+    )
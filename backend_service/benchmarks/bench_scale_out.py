@@ -0,0 +1,171 @@
+"""Multi-replica throughput of the shared session backend.
+
+For each replica count it starts that many backend processes against one
+Redis-protocol server (``SESSION_BACKEND=redis``). It then drives a
+session workload of one append followed by one history read, and reports
+requests/s and latency percentiles. By default requests go to the owner of
+their session on the hash ring, as a consistent-hash proxy would send them.
+``--no-affinity`` spreads them at random instead.
+
+Load is generated by ``--clients`` processes so that the generator is not
+the bottleneck. Give the replicas and clients their own cores. Scaling
+stops being linear once the machine, or the Redis server, runs out of them.
+
+Run from ``backend_service``::
+
+    python -m benchmarks.bench_scale_out --redis-url redis://127.0.0.1:6379/0 --replicas 1 2 4
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+import httpx
+
+from app.shared_state import HashRing
+
+BASE_PORT = 18200
+
+
+def start_replicas(count: int, args: argparse.Namespace, prefix: str) -> List[subprocess.Popen]:
+    names = [f"replica-{index}" for index in range(count)]
+    processes = []
+    for index, name in enumerate(names):
+        env = {
+            **os.environ,
+            "SESSION_BACKEND": "redis",
+            "SHARED_STATE_URL": args.redis_url,
+            "SHARED_STATE_PREFIX": prefix,
+            "REPLICA_ID": name,
+            "BACKEND_REPLICAS": ",".join(names),
+        }
+        processes.append(
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "uvicorn",
+                    "app.main:app",
+                    "--port",
+                    str(BASE_PORT + index),
+                    "--log-level",
+                    "warning",
+                ],
+                env=env,
+            )
+        )
+    deadline = time.monotonic() + 30
+    for index in range(count):
+        url = f"http://127.0.0.1:{BASE_PORT + index}/healthz"
+        while True:
+            try:
+                if httpx.get(url, timeout=1).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                stop_replicas(processes)
+                raise RuntimeError(f"replica {index} did not start")
+            time.sleep(0.1)
+    return processes
+
+
+def stop_replicas(processes: List[subprocess.Popen]) -> None:
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.wait()
+
+
+async def drive(
+    urls: List[str], sessions: List[str], requests: int, concurrency: int, affinity: bool
+) -> List[float]:
+    names = [f"replica-{index}" for index in range(len(urls))]
+    ring = HashRing(names)
+    by_name = dict(zip(names, urls))
+    latencies: List[float] = []
+    remaining = requests
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 2
+            session_id = random.choice(sessions)
+            base = by_name[ring.owner(session_id)] if affinity else random.choice(urls)
+            started = time.perf_counter()
+            response = await client.post(
+                f"{base}/session/append",
+                json={"session_id": session_id, "entry": {"role": "user", "text": "hello"}},
+            )
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            response = await client.get(
+                f"{base}/session/history", params={"session_id": session_id, "limit": 20}
+            )
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return latencies
+
+
+def client_process(job: Tuple[List[str], List[str], int, int, bool]) -> List[float]:
+    return asyncio.run(drive(*job))
+
+
+def run(count: int, args: argparse.Namespace) -> Tuple[float, List[float]]:
+    prefix = f"bench-{os.getpid()}-{count}:"
+    processes = start_replicas(count, args, prefix)
+    try:
+        urls = [f"http://127.0.0.1:{BASE_PORT + index}" for index in range(count)]
+        sessions = [f"bench-session-{index}" for index in range(args.sessions)]
+        per_client = args.requests // args.clients
+        job = (urls, sessions, per_client, args.concurrency, not args.no_affinity)
+        with multiprocessing.Pool(args.clients) as pool:
+            started = time.perf_counter()
+            results = pool.map(client_process, [job] * args.clients)
+            elapsed = time.perf_counter() - started
+    finally:
+        stop_replicas(processes)
+    latencies = [latency for result in results for latency in result]
+    return len(latencies) / elapsed, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--redis-url", required=True)
+    parser.add_argument("--replicas", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--clients", type=int, default=4, help="load generator processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="connections per client")
+    parser.add_argument("--no-affinity", action="store_true")
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"{'replicas':>8} {'req/s':>10} {'per-rep':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for count in args.replicas:
+        throughput, latencies = run(count, args)
+        baseline = baseline or throughput / count
+        latencies.sort()
+        p50 = statistics.median(latencies) * 1000
+        p99 = latencies[int(len(latencies) * 0.99)] * 1000
+        print(
+            f"{count:>8} {throughput:>10.0f} {throughput / baseline / count:>8.2f} "
+            f"{p50:>8.2f} {p99:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
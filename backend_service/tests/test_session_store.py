@@ -0,0 +1,42 @@
+import json
+from typing import List, Optional, Tuple
+
+from app.session_store import SessionStore, _Session
+
+
+class RestoringStore(SessionStore):
+    """Serves every session from fixed ``(seq, encoded_entry)`` rows."""
+
+    def __init__(self, rows: List[Tuple[int, str]], **options: int) -> None:
+        super().__init__(**options)
+        self._rows = rows
+
+    def _load_session(self, session_id: str) -> Optional[_Session]:
+        return self._restore(self._rows)
+
+
+def rows(*seqs: int) -> List[Tuple[int, str]]:
+    return [(seq, json.dumps({"role": "user", "text": str(seq), "seq": seq})) for seq in seqs]
+
+
+def seqs(entries: List[dict]) -> List[int]:
+    return [entry["seq"] for entry in entries]
+
+
+def test_restore_with_gap_keeps_seq_positions():
+    store = RestoringStore(rows(0, 2), max_entries=5)
+
+    assert seqs(store.get_page("s", limit=10).entries) == [0, 2]
+    assert store.append_entry("s", {"role": "user", "text": "3"})["seq"] == 3
+    assert seqs(store.get_page("s", limit=10).entries) == [0, 2, 3]
+    assert seqs(store.get_since("s", since=1, limit=10).entries) == [2, 3]
+
+
+def test_restore_with_gap_past_capacity_wraps():
+    store = RestoringStore(rows(0, 5), max_entries=3)
+
+    page = store.get_page("s", limit=10)
+    assert seqs(page.entries) == [5]
+    assert page.total == 6
+    store.append_entry("s", {"role": "user", "text": "6"})
+    assert seqs(store.get_page("s", limit=10).entries) == [5, 6]
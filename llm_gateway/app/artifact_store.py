@@ -0,0 +1,108 @@
+"""Resolve preprocessed payloads passed by artifact reference.
+
+References look like ``sha256:<hex>`` and are minted by agent_service.
+Lookup goes through a small in-process LRU, then the shared ``ARTIFACT_DIR``
+(when mounted), then agent_service's ``GET /artifacts/{ref}``. Fetched
+bodies are checked against their hash before they are cached.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+from .config import get_settings
+
+REF_PREFIX = "sha256:"
+
+
+class ArtifactResolver:
+    def __init__(
+        self, *, agent_service_url: str, disk_dir: str, ttl_seconds: float, max_bytes: int
+    ) -> None:
+        self._agent_service_url = agent_service_url.rstrip("/")
+        self._disk_dir = disk_dir
+        self._ttl = ttl_seconds
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], int, float]]" = OrderedDict()
+        self._bytes = 0
+
+    async def resolve(self, ref: str) -> Dict[str, Any]:
+        entry = self._entries.get(ref)
+        if entry is not None and entry[2] > time.monotonic():
+            self._entries.move_to_end(ref)
+            return entry[0]
+
+        digest = _digest_of(ref)
+        if digest is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="malformed artifact ref")
+        body = self._read_disk(digest) or await self._fetch(ref)
+        if body is None or hashlib.sha256(body).hexdigest() != digest:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE, detail=f"artifact {ref} expired or unknown"
+            )
+        payload = json.loads(body)
+        self._remember(ref, payload, len(body))
+        return payload
+
+    def _read_disk(self, digest: str) -> Optional[bytes]:
+        if not self._disk_dir:
+            return None
+        path = os.path.join(self._disk_dir, f"{digest}.json")
+        try:
+            if time.time() - os.path.getmtime(path) > self._ttl:
+                return None
+            with open(path, "rb") as handle:
+                return handle.read()
+        except OSError:
+            return None
+
+    async def _fetch(self, ref: str) -> Optional[bytes]:
+        try:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.get(f"{self._agent_service_url}/artifacts/{ref}")
+        except httpx.RequestError:
+            return None
+        return response.content if response.status_code == 200 else None
+
+    def _remember(self, ref: str, payload: Dict[str, Any], size: int) -> None:
+        if size > self._max_bytes:
+            return
+        if ref in self._entries:
+            self._bytes -= self._entries.pop(ref)[1]
+        self._entries[ref] = (payload, size, time.monotonic() + self._ttl)
+        self._bytes += size
+        while self._bytes > self._max_bytes:
+            _, (_, evicted, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+
+def _digest_of(ref: str) -> Optional[str]:
+    digest = ref[len(REF_PREFIX):] if ref.startswith(REF_PREFIX) else ""
+    if len(digest) != 64 or not all(char in "0123456789abcdef" for char in digest):
+        return None
+    return digest
+
+
+_settings = get_settings()
+_RESOLVER = ArtifactResolver(
+    agent_service_url=_settings.agent_service_url,
+    disk_dir=_settings.artifact_dir,
+    ttl_seconds=_settings.artifact_ttl_seconds,
+    max_bytes=_settings.artifact_cache_bytes,
+)
+
+
+async def resolve_preprocessed(model: BaseModel) -> Dict[str, Any]:
+    """Return the preprocessed payload carried inline or by reference."""
+
+    if model.preprocessed or not model.preprocessed_ref:
+        return model.preprocessed
+    return await _RESOLVER.resolve(model.preprocessed_ref)
@@ -1,5 +1,6 @@
 from functools import lru_cache
 import os
+from pathlib import Path
 from pydantic import BaseModel, Field
 
 
@@ -19,6 +20,52 @@ class GatewaySettings(BaseModel):
     vllm_api_key: str = Field(
         default="dummy-key", description="API key for vLLM (use dummy if not required)"
     )
+    artifact_dir: str = Field(
+        default="", description="Shared artifact directory written by agent service"
+    )
+    artifact_ttl_seconds: float = Field(
+        default=900.0, description="Lifetime of resolved artifacts in the local cache"
+    )
+    artifact_cache_bytes: int = Field(
+        default=64 * 1024 * 1024, description="Local artifact cache size cap"
+    )
+    prompts_dir: str = Field(
+        default=str(Path(__file__).resolve().parents[2] / "agents"),
+        description="Directory holding agents/<mode>_worker/prompts/system.md",
+    )
+    worker_concurrency: int = Field(
+        default=16, description="Concurrent worker completions sent to vLLM"
+    )
+    worker_timeout_seconds: float = Field(
+        default=60.0, description="Timeout for one worker completion"
+    )
+    worker_max_tokens: int = Field(
+        default=1500, description="Completion token cap for worker calls"
+    )
+    worker_temperature: float = Field(
+        default=0.2, description="Sampling temperature for worker calls"
+    )
+    worker_input_chars: int = Field(
+        default=12000, description="User input beyond this many chars is truncated"
+    )
+    worker_cache_entries: int = Field(
+        default=512, description="Worker results cached by prompt hash (0 = off)"
+    )
+    worker_cache_ttl_seconds: float = Field(
+        default=600.0, description="Lifetime of cached worker results"
+    )
+    trace_export_path: str = Field(
+        default="", description="JSONL file receiving OTLP/JSON trace spans; empty disables tracing"
+    )
+    trace_sample_rate: float = Field(
+        default=1.0, description="Fraction of new traces recorded; requests with a traceparent follow it"
+    )
+    admin_token: str = Field(
+        default="", description="Token for /debug profiling endpoints (empty = profiling disabled)"
+    )
+    profile_max_seconds: float = Field(
+        default=60.0, description="Longest sampling window accepted by /debug/profile"
+    )
 
     class Config:
         frozen = True
@@ -32,4 +79,21 @@ def get_settings() -> GatewaySettings:
         vllm_base_url=os.getenv("VLLM_BASE_URL", "http://210.61.209.139:45014/v1/"),
         vllm_model_id=os.getenv("VLLM_MODEL_ID", "openai/gpt-oss-120b"),
         vllm_api_key=os.getenv("VLLM_API_KEY", "dummy-key"),
+        artifact_dir=os.getenv("ARTIFACT_DIR", ""),
+        artifact_ttl_seconds=float(os.getenv("ARTIFACT_TTL_SECONDS", "900")),
+        artifact_cache_bytes=int(os.getenv("ARTIFACT_CACHE_BYTES", str(64 * 1024 * 1024))),
+        prompts_dir=os.getenv(
+            "WORKER_PROMPTS_DIR", str(Path(__file__).resolve().parents[2] / "agents")
+        ),
+        worker_concurrency=int(os.getenv("WORKER_CONCURRENCY", "16")),
+        worker_timeout_seconds=float(os.getenv("WORKER_TIMEOUT_SECONDS", "60")),
+        worker_max_tokens=int(os.getenv("WORKER_MAX_TOKENS", "1500")),
+        worker_temperature=float(os.getenv("WORKER_TEMPERATURE", "0.2")),
+        worker_input_chars=int(os.getenv("WORKER_INPUT_CHARS", "12000")),
+        worker_cache_entries=int(os.getenv("WORKER_CACHE_ENTRIES", "512")),
+        worker_cache_ttl_seconds=float(os.getenv("WORKER_CACHE_TTL_SECONDS", "600")),
+        trace_export_path=os.getenv("TRACE_EXPORT_PATH", ""),
+        trace_sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "1.0")),
+        admin_token=os.getenv("ADMIN_TOKEN", ""),
+        profile_max_seconds=float(os.getenv("PROFILE_MAX_SECONDS", "60")),
     )
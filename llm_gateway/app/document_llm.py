@@ -4,16 +4,19 @@ from __future__ import annotations
 import asyncio
 import json
 import unicodedata
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List
 
 import logging
-from openai import OpenAI
 
 from .config import get_settings
+from .tracing import span
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 _SETTINGS = get_settings()
-_CLIENT = OpenAI(base_url=_SETTINGS.vllm_base_url, api_key=_SETTINGS.vllm_api_key)
 
 RESPONSE_INSTRUCTIONS = """
 Write a concise response using exactly these section headers:
@@ -29,6 +32,15 @@ Formatting rules:
 """
 
 
+@lru_cache(maxsize=1)
+def get_client() -> OpenAI:
+    """Create the vLLM client on first use; mock mode never imports ``openai``."""
+
+    from openai import OpenAI
+
+    return OpenAI(base_url=_SETTINGS.vllm_base_url, api_key=_SETTINGS.vllm_api_key)
+
+
 async def generate_document_summary(request: Dict[str, Any]) -> Dict[str, Any]:
     return await asyncio.to_thread(_generate_sync, request)
 
@@ -56,7 +68,8 @@ def _generate_sync(request: Dict[str, Any]) -> Dict[str, Any]:
     ]
 
     content = _call_chat(primary_messages)
-    parsed = _parse_structured_text(content)
+    with span("document.parse_output", attempt="primary"):
+        parsed = _parse_structured_text(content)
     if parsed:
         parsed["context_sync_key"] = request.get("session_id", "")
         return parsed
@@ -73,7 +86,8 @@ def _generate_sync(request: Dict[str, Any]) -> Dict[str, Any]:
         {"role": "user", "content": simplified_prompt},
     ]
     content = _call_chat(simplified_messages)
-    parsed = _parse_structured_text(content)
+    with span("document.parse_output", attempt="simplified"):
+        parsed = _parse_structured_text(content)
     if parsed:
         parsed["context_sync_key"] = request.get("session_id", "")
         return parsed
@@ -82,12 +96,18 @@ def _generate_sync(request: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def _call_chat(messages: List[Dict[str, str]]) -> str:
-    response = _CLIENT.chat.completions.create(
-        model=_SETTINGS.vllm_model_id,
-        messages=messages,
-        temperature=0.2,
-        max_tokens=800,
-    )
+    with span("vllm.completion", model=_SETTINGS.vllm_model_id) as current:
+        response = get_client().chat.completions.create(
+            model=_SETTINGS.vllm_model_id,
+            messages=messages,
+            temperature=0.2,
+            max_tokens=800,
+        )
+        if current is not None:
+            current.set(
+                prompt_tokens=getattr(response.usage, "prompt_tokens", None),
+                completion_tokens=getattr(response.usage, "completion_tokens", None),
+            )
     content = response.choices[0].message.content or ""
     print("[document_llm] raw response:", content)
     return content
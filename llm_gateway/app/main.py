@@ -1,22 +1,50 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException, status
+import json
+from typing import Any, AsyncIterator, Dict
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from .config import get_settings
 from . import mock_logic, schemas
+from .artifact_store import resolve_preprocessed
 from .document_llm import generate_document_summary
+from .readiness import get_readiness, warmup_steps
+from .profiling import ProfilingMiddleware, router as debug_router
+from .tracing import TracingMiddleware
+from .worker_engine import get_spec, get_worker_engine
+
+MOCK_TOKEN_WORDS = 4
 
 app = FastAPI(title="LLM Gateway")
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(TracingMiddleware)
+app.include_router(debug_router)
 _settings = get_settings()
 
 
+@app.on_event("startup")
+async def start_warmup() -> None:
+    get_readiness().start(warmup_steps())
+
+
 @app.get("/healthz")
 async def healthcheck() -> dict[str, str]:
     return {"status": "ok", "mode": _settings.mode}
 
 
+@app.get("/readyz")
+async def readiness() -> JSONResponse:
+    """200 once warmup has finished; 503 with per-step progress until then."""
+
+    state = get_readiness()
+    return JSONResponse(state.status(), status_code=200 if state.ready else 503)
+
+
 @app.post("/worker/{mode}", response_model=schemas.WorkerResponse)
 async def worker_request(mode: str, payload: schemas.WorkerRequest) -> schemas.WorkerResponse:
+    payload = payload.model_copy(update={"preprocessed": await resolve_preprocessed(payload)})
     if _settings.mode == "mock":
         result = mock_logic.build_worker_result(mode, payload)
         return schemas.WorkerResponse(
@@ -26,11 +54,52 @@ async def worker_request(mode: str, payload: schemas.WorkerRequest) -> schemas.W
             usage={"mock_tokens": 0},
         )
 
-    raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="LLM real mode not implemented yet")
+    return await get_worker_engine().run(mode, payload)
+
+
+@app.post("/worker/{mode}/stream")
+async def worker_stream(mode: str, payload: schemas.WorkerRequest) -> StreamingResponse:
+    """Server-sent events: ``token`` per chunk of model output, then ``result``.
+
+    ``result`` carries the same body as ``/worker/{mode}``. A failure after
+    the stream has started is reported as an ``error`` event.
+    """
+
+    get_spec(mode)
+    payload = payload.model_copy(update={"preprocessed": await resolve_preprocessed(payload)})
+    if _settings.mode == "mock":
+        events = _mock_worker_events(mode, payload)
+    else:
+        events = get_worker_engine().stream(mode, payload)
+    return StreamingResponse(_sse_events(events), media_type="text/event-stream")
+
+
+async def _mock_worker_events(
+    mode: str, payload: schemas.WorkerRequest
+) -> AsyncIterator[tuple[str, Dict[str, Any]]]:
+    result = mock_logic.build_worker_result(mode, payload)
+    words = str(result.get(get_spec(mode).text_field, "")).split(" ")
+    for start in range(0, len(words), MOCK_TOKEN_WORDS):
+        text = " ".join(words[start : start + MOCK_TOKEN_WORDS])
+        yield "token", {"text": text if start == 0 else " " + text}
+    response = schemas.WorkerResponse(
+        mode=mode, result=result, session_id=payload.session_id, usage={"mock_tokens": 0}
+    )
+    yield "result", response.model_dump()
+
+
+async def _sse_events(events: AsyncIterator[tuple[str, Dict[str, Any]]]) -> AsyncIterator[str]:
+    try:
+        async for event, data in events:
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    except HTTPException as exc:
+        error = {"status_code": exc.status_code, "detail": exc.detail}
+        yield f"event: error\ndata: {json.dumps(error, ensure_ascii=False)}\n\n"
 
 
 @app.post("/llm/document")
 async def document_llm(payload: schemas.DocumentLLMRequest) -> dict:
+    payload = payload.model_copy(update={"preprocessed": await resolve_preprocessed(payload)})
     if _settings.mode == "mock":
         return mock_logic.build_document_llm_output(payload)
     result = await generate_document_summary(payload.model_dump())
@@ -24,7 +24,8 @@ class MasterRouteResponse(BaseModel):
 
 class WorkerRequest(BaseModel):
     mode: str
-    preprocessed: Dict[str, Any]
+    preprocessed: Dict[str, Any] = Field(default_factory=dict)
+    preprocessed_ref: Optional[str] = None
     raw_input: str
     session_id: str
 
@@ -38,5 +39,6 @@ class WorkerResponse(BaseModel):
 
 class DocumentLLMRequest(BaseModel):
     session_id: str
-    preprocessed: Dict[str, Any]
+    preprocessed: Dict[str, Any] = Field(default_factory=dict)
+    preprocessed_ref: Optional[str] = None
     raw_input: str
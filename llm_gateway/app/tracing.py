@@ -0,0 +1,266 @@
+"""Request tracing across backend, agent service and gateway.
+
+Spans follow W3C Trace Context: calls between the services carry a
+``traceparent`` header (``00-<trace id>-<span id>-<flags>``). Each service
+opens a server span for an incoming request and child spans around its
+own stages, so one trace shows where a slow request spent its time.
+
+Finished spans are appended to ``trace_export_path`` by a background
+thread, one OTLP/JSON ``ExportTraceServiceRequest`` per line. That is the
+format of the collector's ``otlpjsonfile`` receiver, and the format read
+by ``agent_service/benchmarks/trace_report.py``. With no export path set,
+``span`` only checks one cached setting and does no other work.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Mapping, MutableMapping, Optional, Tuple
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "llm_gateway"
+TRACEPARENT_HEADER = "traceparent"
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+EXPORT_BATCH = 512
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+_CURRENT: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    kind: str = "internal"
+    sampled: bool = True
+    start_ns: int = field(default_factory=time.time_ns)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+class JsonlExporter:
+    """Appends finished spans to a file from a background thread."""
+
+    def __init__(self, path: str, service: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._path = path
+        self._resource = {"attributes": [_attribute("service.name", service)]}
+        self._queue: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write, name="trace-export", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span, end_ns: int) -> None:
+        self._queue.put(_to_otlp(span, end_ns))
+
+    def _write(self) -> None:
+        with open(self._path, "a", encoding="utf-8") as handle:
+            while True:
+                spans = [self._queue.get()]
+                while len(spans) < EXPORT_BATCH:
+                    try:
+                        spans.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                request = {
+                    "resourceSpans": [
+                        {
+                            "resource": self._resource,
+                            "scopeSpans": [{"scope": {"name": "amdlingo"}, "spans": spans}],
+                        }
+                    ]
+                }
+                try:
+                    handle.write(json.dumps(request, ensure_ascii=False, default=str) + "\n")
+                    handle.flush()
+                except OSError:
+                    logger.exception("Failed to export %d spans", len(spans))
+
+
+@lru_cache(maxsize=1)
+def get_exporter() -> Optional[JsonlExporter]:
+    path = get_settings().trace_export_path
+    return JsonlExporter(path, SERVICE_NAME) if path else None
+
+
+@contextmanager
+def span(
+    name: str,
+    *,
+    kind: str = "internal",
+    parent: Optional[Tuple[str, str, bool]] = None,
+    **attributes: Any,
+) -> Iterator[Optional[Span]]:
+    """Time the enclosed block as a child of the current span.
+
+    Without a current span (or ``parent`` from ``extract``) a new trace is
+    started, sampled at ``trace_sample_rate``. Yields None when tracing is
+    off. Exceptions are recorded on the span and re-raised.
+    """
+
+    exporter = get_exporter()
+    if exporter is None:
+        yield None
+        return
+    current = _start(name, kind, parent, attributes)
+    token = _CURRENT.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        _CURRENT.reset(token)
+        if current.sampled:
+            exporter.export(current, time.time_ns())
+
+
+def record_span(name: str, start_ns: int, end_ns: int, **attributes: Any) -> None:
+    """Export an already-timed child of the current span, e.g. inside a generator."""
+
+    exporter = get_exporter()
+    parent = _CURRENT.get()
+    if exporter is None or parent is None or not parent.sampled:
+        return
+    child = _start(name, "internal", None, attributes)
+    child.start_ns = start_ns
+    exporter.export(child, end_ns)
+
+
+def current_span() -> Optional[Span]:
+    return _CURRENT.get()
+
+
+def inject(headers: Optional[MutableMapping[str, str]] = None) -> Dict[str, str]:
+    """Return ``headers`` with the current ``traceparent`` added, if any."""
+
+    headers = dict(headers or {})
+    current = _CURRENT.get()
+    if current is not None:
+        headers[TRACEPARENT_HEADER] = current.traceparent
+    return headers
+
+
+def extract(headers: Mapping[str, str]) -> Optional[Tuple[str, str, bool]]:
+    """Parse an incoming ``traceparent`` into ``(trace id, span id, sampled)``."""
+
+    match = TRACEPARENT_PATTERN.match(headers.get(TRACEPARENT_HEADER, "").strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id, flags = match.groups()
+    return trace_id, span_id, bool(int(flags, 16) & 1)
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span per HTTP request.
+
+    The span covers the whole response, including streamed bodies, and is
+    named after the matched route once routing has happened.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or get_exporter() is None:
+            await self.app(scope, receive, send)
+            return
+        headers = {
+            key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]
+        }
+        method = scope["method"]
+        with span(f"{method} {scope['path']}", kind="server", parent=extract(headers)) as current:
+
+            async def send_traced(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    current.set(**{"http.status_code": message["status"]})
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_traced)
+            finally:
+                route = scope.get("route")
+                if route is not None and hasattr(route, "path"):
+                    current.name = f"{method} {route.path}"
+
+
+def _start(
+    name: str,
+    kind: str,
+    parent: Optional[Tuple[str, str, bool]],
+    attributes: Dict[str, Any],
+) -> Span:
+    if parent is None:
+        current = _CURRENT.get()
+        if current is not None:
+            parent = (current.trace_id, current.span_id, current.sampled)
+    if parent is None:
+        trace_id, parent_id = _random_hex(16), None
+        sampled = random.random() < get_settings().trace_sample_rate
+    else:
+        trace_id, parent_id, sampled = parent
+    return Span(
+        trace_id=trace_id,
+        span_id=_random_hex(8),
+        parent_id=parent_id,
+        name=name,
+        kind=kind,
+        sampled=sampled,
+        attributes=attributes,
+    )
+
+
+def _random_hex(size: int) -> str:
+    return os.urandom(size).hex()
+
+
+def _to_otlp(span: Span, end_ns: int) -> Dict[str, Any]:
+    record: Dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": SPAN_KINDS.get(span.kind, 1),
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(end_ns),
+        "attributes": [
+            _attribute(key, value) for key, value in span.attributes.items() if value is not None
+        ],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        record["parentSpanId"] = span.parent_id
+    return record
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        encoded: Dict[str, Any] = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
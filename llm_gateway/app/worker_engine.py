@@ -0,0 +1,397 @@
+"""Common real-mode execution path for every worker mode.
+
+Each call renders the mode's prompt from its ``WorkerSpec`` and runs one
+chat completion on the shared async client. The reply is parsed and
+normalised to the mode's output schema. Identical in-flight calls share one
+completion. Completed results are cached by prompt hash, and a
+process-wide semaphore caps concurrent completions against vLLM. Every
+response reports token usage, latency and cache status.
+
+``stream`` is the same path for ``/worker/{mode}/stream``: the reply text
+is yielded as the model writes it, followed by the parsed result. A cache
+hit or a shared in-flight call yields only the result.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from .config import GatewaySettings, get_settings
+from .schemas import WorkerRequest, WorkerResponse
+from .tracing import record_span, span
+from .worker_specs import WORKER_SPECS, WorkerSpec
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+MAX_CONTEXT_VALUE_CHARS = 4000
+
+
+class WorkerEngine:
+    def __init__(self, settings: GatewaySettings) -> None:
+        self._settings = settings
+        self._slots = asyncio.Semaphore(max(settings.worker_concurrency, 1))
+        self._cache: "OrderedDict[str, Tuple[Dict[str, Any], Dict[str, Any], float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._prompts: Dict[str, str] = {}
+        self._client: Optional[AsyncOpenAI] = None
+
+    async def run(self, mode: str, request: WorkerRequest) -> WorkerResponse:
+        spec = get_spec(mode)
+        messages = self._build_messages(spec, request)
+        key = self._key(messages)
+
+        cached = self._cache_get(key)
+        if cached is not None:
+            result, usage = cached
+            usage = {**usage, "cache": "hit", "latency_ms": 0.0}
+        elif key in self._inflight:
+            result, usage = await asyncio.shield(self._inflight[key])
+            usage = {**usage, "cache": "shared"}
+        else:
+            # The completion runs in its own task and every caller, this one
+            # included, shields it: cancelling one must not cancel the others.
+            task = asyncio.ensure_future(self._complete_and_cache(key, spec, request, messages))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+            result, usage = await asyncio.shield(task)
+            usage = {**usage, "cache": "miss"}
+
+        return _response(mode, request, result, usage)
+
+    async def stream(
+        self, mode: str, request: WorkerRequest
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Yield ``("token", {"text": ...})`` events, then ``("result", response)``."""
+
+        spec = get_spec(mode)
+        messages = self._build_messages(spec, request)
+        key = self._key(messages)
+
+        cached = self._cache_get(key)
+        if cached is not None:
+            result, usage = cached
+            usage = {**usage, "cache": "hit", "latency_ms": 0.0}
+        elif key in self._inflight:
+            result, usage = await asyncio.shield(self._inflight[key])
+            usage = {**usage, "cache": "shared"}
+        else:
+            # Not registered as in-flight: a client that disconnects abandons
+            # the completion, and nobody else should be waiting on it.
+            completion = self._complete_stream(spec, request, messages)
+            async for text, done in completion:
+                if done is None:
+                    yield "token", {"text": text}
+                else:
+                    result, usage = done
+            self._cache_put(key, result, usage)
+            usage = {**usage, "cache": "miss"}
+
+        yield "result", _response(mode, request, result, usage).model_dump()
+
+    async def _complete_and_cache(
+        self, key: str, spec: WorkerSpec, request: WorkerRequest, messages: List[Dict[str, str]]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        result, usage = await self._complete(spec, request, messages)
+        self._cache_put(key, result, usage)
+        return result, usage
+
+    def _finish_inflight(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark retrieved so waiter-less failures are not logged as unhandled.
+            task.exception()
+
+    async def _complete(
+        self, spec: WorkerSpec, request: WorkerRequest, messages: List[Dict[str, str]]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        from openai import APIError
+
+        queued = time.perf_counter()
+        queued_ns = time.time_ns()
+        async with self._slots:
+            started = time.perf_counter()
+            record_span("gateway.queue", queued_ns, time.time_ns(), mode=spec.mode)
+            with span("vllm.completion", model=self._settings.vllm_model_id) as current:
+                try:
+                    response = await self._get_client().chat.completions.create(
+                        model=self._settings.vllm_model_id,
+                        messages=messages,
+                        temperature=self._settings.worker_temperature,
+                        max_tokens=self._settings.worker_max_tokens,
+                    )
+                except APIError as exc:
+                    raise HTTPException(
+                        status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)
+                    ) from exc
+                if current is not None:
+                    current.set(
+                        prompt_tokens=getattr(response.usage, "prompt_tokens", None),
+                        completion_tokens=getattr(response.usage, "completion_tokens", None),
+                    )
+            finished = time.perf_counter()
+
+        content = response.choices[0].message.content or ""
+        with span("parse_output", mode=spec.mode):
+            result = parse_output(spec, content)
+        if spec.finalize is not None:
+            spec.finalize(result, request)
+        usage = {
+            "model": self._settings.vllm_model_id,
+            "prompt_tokens": getattr(response.usage, "prompt_tokens", None),
+            "completion_tokens": getattr(response.usage, "completion_tokens", None),
+            "total_tokens": getattr(response.usage, "total_tokens", None),
+            "queue_ms": round((started - queued) * 1000, 2),
+            "latency_ms": round((finished - started) * 1000, 2),
+        }
+        return result, usage
+
+    async def _complete_stream(
+        self, spec: WorkerSpec, request: WorkerRequest, messages: List[Dict[str, str]]
+    ) -> AsyncIterator[Tuple[str, Optional[Tuple[Dict[str, Any], Dict[str, Any]]]]]:
+        """Yield ``(delta, None)`` per content chunk, then ``("", (result, usage))``."""
+
+        from openai import APIError
+
+        queued = time.perf_counter()
+        queued_ns = time.time_ns()
+        parts: List[str] = []
+        token_usage = None
+        first_token = None
+        first_token_ns = None
+        async with self._slots:
+            started = time.perf_counter()
+            started_ns = time.time_ns()
+            record_span("gateway.queue", queued_ns, started_ns, mode=spec.mode)
+            try:
+                stream = await self._get_client().chat.completions.create(
+                    model=self._settings.vllm_model_id,
+                    messages=messages,
+                    temperature=self._settings.worker_temperature,
+                    max_tokens=self._settings.worker_max_tokens,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+                try:
+                    async for chunk in stream:
+                        if chunk.usage is not None:
+                            token_usage = chunk.usage
+                        if not chunk.choices:
+                            continue
+                        text = chunk.choices[0].delta.content
+                        if text:
+                            if first_token is None:
+                                first_token = time.perf_counter()
+                                first_token_ns = time.time_ns()
+                            parts.append(text)
+                            yield text, None
+                finally:
+                    await stream.close()
+            except APIError as exc:
+                raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+            finished = time.perf_counter()
+            finished_ns = time.time_ns()
+
+        # The time to first token is prefill; the rest of the stream is decode.
+        prefill_end_ns = first_token_ns if first_token_ns is not None else finished_ns
+        record_span(
+            "vllm.prefill",
+            started_ns,
+            prefill_end_ns,
+            prompt_tokens=getattr(token_usage, "prompt_tokens", None),
+        )
+        record_span(
+            "vllm.decode",
+            prefill_end_ns,
+            finished_ns,
+            completion_tokens=getattr(token_usage, "completion_tokens", None),
+        )
+        with span("parse_output", mode=spec.mode):
+            result = parse_output(spec, "".join(parts))
+        if spec.finalize is not None:
+            spec.finalize(result, request)
+        usage = {
+            "model": self._settings.vllm_model_id,
+            "prompt_tokens": getattr(token_usage, "prompt_tokens", None),
+            "completion_tokens": getattr(token_usage, "completion_tokens", None),
+            "total_tokens": getattr(token_usage, "total_tokens", None),
+            "queue_ms": round((started - queued) * 1000, 2),
+            "first_token_ms": (
+                round((first_token - started) * 1000, 2) if first_token is not None else None
+            ),
+            "latency_ms": round((finished - started) * 1000, 2),
+        }
+        yield "", (result, usage)
+
+    async def warm_up(self) -> None:
+        """Load every worker prompt and create the vLLM client ahead of traffic."""
+
+        for spec in WORKER_SPECS.values():
+            self._system_prompt(spec)
+        self._get_client()
+
+    async def open_connection(self) -> None:
+        """Open a pooled connection to vLLM with one cheap call."""
+
+        await self._get_client().models.list()
+
+    def _key(self, messages: List[Dict[str, str]]) -> str:
+        return hashlib.sha256(
+            json.dumps([self._settings.vllm_model_id, messages], ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+
+    def _build_messages(self, spec: WorkerSpec, request: WorkerRequest) -> List[Dict[str, str]]:
+        example = json.dumps(spec.output_schema, ensure_ascii=False)
+        system = (
+            f"{self._system_prompt(spec)}\n\n"
+            f"Respond with one JSON object and nothing else, using exactly these keys: {example}"
+        )
+        if spec.guidance:
+            system += f"\n{spec.guidance}"
+
+        context = {
+            key: _clip(request.preprocessed[key])
+            for key in spec.context_keys
+            if request.preprocessed.get(key) not in (None, "", [], {})
+        }
+        limit = self._settings.worker_input_chars
+        raw_input = request.raw_input
+        if len(raw_input) > limit:
+            raw_input = raw_input[:limit] + "\n...[truncated]"
+        user = (
+            "Preprocessed context:\n"
+            f"{json.dumps(context, ensure_ascii=False, indent=1)}\n\n"
+            f"User input:\n{raw_input}"
+        )
+        return [{"role": "system", "content": system}, {"role": "user", "content": user}]
+
+    def _system_prompt(self, spec: WorkerSpec) -> str:
+        prompt = self._prompts.get(spec.prompt_name)
+        if prompt is None:
+            path = os.path.join(self._settings.prompts_dir, spec.prompt_name, "prompts", "system.md")
+            try:
+                with open(path, encoding="utf-8") as handle:
+                    prompt = handle.read().strip()
+            except OSError:
+                logger.warning("Prompt %s not found, using built-in default", path)
+                prompt = f"You are AMDlingo's {spec.mode} worker agent for AMD ROCm/HIP developers."
+            self._prompts[spec.prompt_name] = prompt
+        return prompt
+
+    def _get_client(self) -> AsyncOpenAI:
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(
+                base_url=self._settings.vllm_base_url,
+                api_key=self._settings.vllm_api_key,
+                timeout=self._settings.worker_timeout_seconds,
+            )
+        return self._client
+
+    def _cache_get(self, key: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        result, usage, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return result, usage
+
+    def _cache_put(self, key: str, result: Dict[str, Any], usage: Dict[str, Any]) -> None:
+        if self._settings.worker_cache_entries <= 0:
+            return
+        self._cache[key] = (result, usage, time.monotonic() + self._settings.worker_cache_ttl_seconds)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._settings.worker_cache_entries:
+            self._cache.popitem(last=False)
+
+
+def get_spec(mode: str) -> WorkerSpec:
+    spec = WORKER_SPECS.get(mode)
+    if spec is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"unknown worker mode: {mode}")
+    return spec
+
+
+def _response(
+    mode: str, request: WorkerRequest, result: Dict[str, Any], usage: Dict[str, Any]
+) -> WorkerResponse:
+    return WorkerResponse(
+        mode=mode,
+        result={**result, "context_sync_key": request.session_id},
+        session_id=request.session_id,
+        usage=usage,
+    )
+
+
+def parse_output(spec: WorkerSpec, content: str) -> Dict[str, Any]:
+    """Normalise a model reply to ``spec.output_schema``.
+
+    Missing or mistyped keys fall back to the schema default. A reply with
+    no usable JSON is kept as free text in ``spec.text_field``.
+    """
+
+    data = _extract_json(content)
+    if data is None:
+        result = {key: _fresh(default) for key, default in spec.output_schema.items()}
+        result[spec.text_field] = content.strip()
+        return result
+
+    result = {}
+    for key, default in spec.output_schema.items():
+        value = data.get(key)
+        if value is None:
+            result[key] = _fresh(default)
+        elif isinstance(default, list):
+            result[key] = value if isinstance(value, list) else [value]
+        elif isinstance(default, str) and not isinstance(value, str):
+            result[key] = json.dumps(value, ensure_ascii=False)
+        else:
+            result[key] = value
+    return result
+
+
+def _extract_json(content: str) -> Optional[Dict[str, Any]]:
+    start = content.find("{")
+    end = content.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(content[start : end + 1])
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _fresh(default: Any) -> Any:
+    return list(default) if isinstance(default, list) else default
+
+
+def _clip(value: Any) -> Any:
+    if isinstance(value, str) and len(value) > MAX_CONTEXT_VALUE_CHARS:
+        return value[:MAX_CONTEXT_VALUE_CHARS] + "...[truncated]"
+    return value
+
+
+_ENGINE: Optional[WorkerEngine] = None
+
+
+def get_worker_engine() -> WorkerEngine:
+    global _ENGINE
+    if _ENGINE is None:
+        _ENGINE = WorkerEngine(get_settings())
+    return _ENGINE
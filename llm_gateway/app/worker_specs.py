@@ -0,0 +1,179 @@
+"""Per-mode plug-ins for the worker engine.
+
+A mode is a prompt template (``agents/<mode>_worker/prompts/system.md``),
+the preprocessed fields the model gets to see, and an output schema whose
+keys and defaults are the contract the frontend relies on. Everything else
+(batching of identical calls, caching, limits, usage) lives in
+``worker_engine``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .schemas import WorkerRequest
+
+Finalizer = Callable[[Dict[str, Any], WorkerRequest], None]
+
+
+@dataclass(frozen=True)
+class WorkerSpec:
+    mode: str
+    prompt_name: str
+    output_schema: Dict[str, Any]
+    text_field: str
+    context_keys: Tuple[str, ...]
+    guidance: str = ""
+    finalize: Optional[Finalizer] = field(default=None, compare=False)
+
+
+def _finalize_hipify(result: Dict[str, Any], request: WorkerRequest) -> None:
+    static = request.preprocessed.get("hipified_code_static", "")
+    result["hip_code_static"] = result["hip_code_static"] or static
+    result["hip_code_final"] = result["hip_code_final"] or result["hip_code_static"]
+
+
+def _finalize_api(result: Dict[str, Any], request: WorkerRequest) -> None:
+    # The API name comes from the metadata DB; the model must not rename it.
+    api_name = request.preprocessed.get("api_name")
+    if api_name:
+        result["api_name"] = api_name
+    metadata = request.preprocessed.get("metadata") or {}
+    if not result["parameters"] and metadata.get("parameters"):
+        result["parameters"] = metadata["parameters"]
+
+
+WORKER_SPECS: Dict[str, WorkerSpec] = {}
+
+
+def register_worker(spec: WorkerSpec) -> WorkerSpec:
+    WORKER_SPECS[spec.mode] = spec
+    return spec
+
+
+register_worker(
+    WorkerSpec(
+        mode="code",
+        prompt_name="code_worker",
+        output_schema={
+            "summary": "",
+            "issues": [],
+            "fix_explanation": "",
+            "fixed_code": "",
+            "optimization_suggestions": [],
+            "api_reference": [],
+        },
+        text_field="summary",
+        context_keys=(
+            "language",
+            "api_list",
+            "issues_found",
+            "kernels",
+            "launch_config",
+            "pointer_metadata",
+            "index_patterns",
+        ),
+        guidance=(
+            "Each entry of issues is an object with type, description, location and severity "
+            "(low, medium or high). fixed_code is the complete corrected source."
+        ),
+    )
+)
+
+register_worker(
+    WorkerSpec(
+        mode="error",
+        prompt_name="error_worker",
+        output_schema={
+            "error_summary": "",
+            "root_cause": "",
+            "evidence": [],
+            "fix_steps": [],
+            "fixed_code": "",
+            "risk_analysis": [],
+            "related_api_docs": [],
+        },
+        text_field="error_summary",
+        context_keys=(
+            "error_type",
+            "error_message",
+            "likely_api",
+            "stack_trace",
+            "code_context",
+            "pointer_metadata",
+            "typical_causes",
+            "related_apis",
+            "matched_signatures",
+            "log_digest",
+        ),
+        guidance="Ground root_cause and evidence in the error metadata and log lines provided.",
+    )
+)
+
+register_worker(
+    WorkerSpec(
+        mode="hipify",
+        prompt_name="hipify_worker",
+        output_schema={
+            "hip_code_final": "",
+            "hip_code_static": "",
+            "diff_summary": [],
+            "unconverted_notes": [],
+            "porting_risks": [],
+            "explanation": "",
+        },
+        text_field="explanation",
+        context_keys=(
+            "hipified_code_static",
+            "mapping_report",
+            "unconverted_segments",
+            "needs_review",
+        ),
+        guidance=(
+            "Start from hipified_code_static and only fix what static conversion missed. "
+            "diff_summary entries are objects with type, from, to and reason; "
+            "unconverted_notes entries have segment, status and suggestion."
+        ),
+        finalize=_finalize_hipify,
+    )
+)
+
+register_worker(
+    WorkerSpec(
+        mode="api",
+        prompt_name="api_worker",
+        output_schema={
+            "api_name": "",
+            "description": "",
+            "parameters": [],
+            "return": "",
+            "usage": "",
+            "example_code": "",
+            "pitfalls": [],
+            "related_apis": [],
+            "notes": "",
+        },
+        text_field="description",
+        context_keys=("api_name", "metadata"),
+        guidance="Only describe APIs present in the metadata; never invent parameters or APIs.",
+        finalize=_finalize_api,
+    )
+)
+
+register_worker(
+    WorkerSpec(
+        mode="document",
+        prompt_name="document_worker",
+        output_schema={
+            "summary": "",
+            "api_explanations": [],
+            "key_points": [],
+            "pitfalls": [],
+            "concept_links": [],
+            "example_code": "",
+            "notes": "",
+        },
+        text_field="summary",
+        context_keys=("title", "url", "document_category", "section_headers", "api_list", "raw_text"),
+    )
+)